@@ -1,33 +1,44 @@
 import streamlit as st
-from utils.client_manager import ClientManager
-from utils.components import delete_confirmation, profile_completion_status
+from core.client_manager import ClientManager
+from core.conflicts import ConflictError, field_changes
+from core.save_queue import save_queue
+from utils.components import delete_confirmation, profile_completion_status, profile_history, render_profiler_panel
+from core.profiler import profiled_entry, profiling_enabled, timed
+from config.settings import CLIENTS_PER_PAGE
 import time
 from datetime import datetime
 from pathlib import Path
+import importlib
 import json
 
-# Change from sections to pages
-from sections import (
-    client_information,
-    assets_liabilities,
-    cash_flow,
-    balance_sheet,
-    projections,
-    retirement_scenarios
-)
+# Section module and renderer per workspace tab; a section (and the pandas,
+# plotly or numpy it needs) is only imported when its tab is first opened
+SECTION_RENDERERS = {
+    0: ("sections.client_information", "render_client_information"),
+    1: ("sections.assets_liabilities", "render_assets_liabilities"),
+    2: ("sections.cash_flow", "render_cash_flow"),
+    3: ("sections.balance_sheet", "render_balance_sheet"),
+    4: ("sections.projections", "render_projections"),
+    5: ("sections.retirement_scenarios", "render_retirement_scenarios")
+}
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_clients_dir():
+    """Seed an empty book with the sample client; runs once per server process"""
+    client_manager = ClientManager()
+    if not client_manager.get_all_clients():
+        sample_path = Path("data/sample_client.json")
+        if sample_path.exists():
+            with open(sample_path, 'r') as f:
+                sample_client = json.load(f)
+            client_manager.save_client(sample_client)
+    return True
 
 def init_session_state():
     """Initialize session state variables"""
     if 'client_manager' not in st.session_state:
+        bootstrap_clients_dir()
         st.session_state.client_manager = ClientManager()
-        
-        # Create sample client if no clients exist
-        if not list(Path("data/clients").glob("*.json")):
-            sample_path = Path("data/sample_client.json")
-            if sample_path.exists():
-                with open(sample_path, 'r') as f:
-                    sample_client = json.load(f)
-                st.session_state.client_manager.save_client(sample_client)
     
     if 'selected_client' not in st.session_state:
         st.session_state.selected_client = None
@@ -37,7 +48,13 @@ def init_session_state():
         st.session_state.is_creating_new = False
     if 'previous_client_id' not in st.session_state:
         st.session_state.previous_client_id = None
+    if 'client_page' not in st.session_state:
+        st.session_state.client_page = 0
+    if 'save_guard' not in st.session_state:
+        # Flushes this session's queued saves once the session is dropped
+        st.session_state.save_guard = save_queue.session_guard()
 
+@timed("app.render_new_client_page")
 def render_new_client_page():
     """Render the new client creation page"""
     st.title("Create New Client Profile")
@@ -78,7 +95,7 @@ def render_new_client_page():
                         }
                     }
                     st.session_state.client_manager.save_client(new_client)
-                    st.session_state.selected_client = new_client
+                    st.session_state.selected_client = st.session_state.client_manager.open_client(client_id)
                     st.session_state.is_creating_new = False
                     st.success("Client profile created successfully!")
                     time.sleep(1)
@@ -86,6 +103,7 @@ def render_new_client_page():
             else:
                 st.error("Client ID, First Name, and Last Name are required!")
 
+@timed("app.render_client_workspace")
 def render_client_workspace():
     """Render the main client workspace with navigation"""
     client = st.session_state.selected_client
@@ -93,7 +111,7 @@ def render_client_workspace():
     
     # Show client name and last modified date in header
     client_name = f"{client['personal_info'].get('client_first_name', '')} {client['personal_info'].get('client_last_name', '')}"
-    last_modified = datetime.fromtimestamp(Path(f"data/clients/{client['client_id']}.json").stat().st_mtime)
+    last_modified = client_manager.get_last_modified(client['client_id']) or datetime.now()
     
     # Main header
     col1, col2 = st.columns([3, 1])
@@ -126,87 +144,110 @@ def render_client_workspace():
                 st.rerun()
     
     st.divider()
+    render_save_conflict(client['client_id'])
     
     # Render selected page content
-    if st.session_state.current_tab == 0:
-        client_information.render_client_information(client, client_manager)
-    elif st.session_state.current_tab == 1:
-        assets_liabilities.render_assets_liabilities(client, client_manager)
-    elif st.session_state.current_tab == 2:
-        cash_flow.render_cash_flow(client, client_manager)
-    elif st.session_state.current_tab == 3:
-        balance_sheet.render_balance_sheet(client, client_manager)
-    elif st.session_state.current_tab == 4:
-        projections.render_projections(client, client_manager)
-    elif st.session_state.current_tab == 5:
-        retirement_scenarios.render_retirement_scenarios(client, client_manager)
+    module_name, renderer = SECTION_RENDERERS[st.session_state.current_tab]
+    getattr(importlib.import_module(module_name), renderer)(client, client_manager)
     
     # Profile completion and quick actions in sidebar
     with st.sidebar:
         st.divider()
+        render_save_status(client['client_id'])
         profile_completion_status(client)
         
         st.divider()
         st.subheader("Quick Actions")
         if st.button("📄 Generate Report", key="quick_action_report", use_container_width=True):
-            st.info("Report generation coming soon...")
+            start_report(client['client_id'])
+        if st.session_state.get('report_job'):
+            render_report_status(client['client_id'])
         if st.button("💾 Backup Data", key="quick_action_backup", use_container_width=True):
             with st.spinner("Creating backup..."):
                 client_manager.backup_client_data(client['client_id'])
                 st.success("Backup created successfully!")
+        backups = client_manager.list_backups(client['client_id'])
+        if backups:
+            with st.expander("♻️ Restore Backup"):
+                selected = st.selectbox(
+                    "Version",
+                    backups,
+                    format_func=lambda entry: entry['created'].replace('T', ' '),
+                    key="restore_backup_version"
+                )
+                if st.button("Restore", key="restore_backup", use_container_width=True):
+                    try:
+                        client_manager.restore_backup(client['client_id'], selected['hash'])
+                    except ConflictError as e:
+                        st.session_state.save_conflict = e
+                    st.session_state.selected_client = client_manager.open_client(client['client_id'])
+                    st.rerun()
+
+def render_save_status(client_id):
+    """Background save indicator; only polls while a save is queued"""
+    status = st.session_state.client_manager.save_status(client_id)
+    if status is None:
+        return
+    if status['state'] == 'pending':
+        render_save_progress(client_id)
+    elif status['state'] == 'conflict':
+        st.caption("⚠️ Not saved: this client was changed by someone else")
+    elif status['state'] == 'error':
+        st.caption(f"⚠️ Save failed: {status['error']}")
+    else:
+        st.caption(f"✅ Saved {status['updated'].strftime('%H:%M:%S')}")
+
+@st.fragment(run_every=2)
+def render_save_progress(client_id):
+    """Poll a queued save without redrawing the page; once it is written the page reruns
+    once, showing the outcome (and the merge panel on a conflict) and ending the polling"""
+    status = st.session_state.client_manager.save_status(client_id)
+    if status is None or status['state'] != 'pending':
+        st.rerun()
+    st.caption("⏳ Saving...")
+
+def _conflict_value(value):
+    return value if isinstance(value, str) else json.dumps(value)
+
+@timed("app.render_save_conflict")
+def render_save_conflict(client_id):
+    """Merge panel for a save rejected because someone else changed the same sections"""
+    client_manager = st.session_state.client_manager
+    conflict = client_manager.save_conflict(client_id) or st.session_state.get('save_conflict')
+    if conflict is None or conflict.client_id != client_id:
+        return
+    with st.container(border=True):
+        st.warning("Someone else saved this client while you were editing it. Your other changes are "
+                   "kept; choose which version of each section below to keep.")
+        keep_mine = []
+        for section in conflict.conflicting:
+            st.markdown(f"**{section.replace('_', ' ').title()}**")
+            st.dataframe(
+                [
+                    {'field': path or section, 'yours': _conflict_value(ours), 'theirs': _conflict_value(theirs)}
+                    for path, ours, theirs in field_changes(conflict.ours.get(section), conflict.theirs.get(section))
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+            choice = st.radio("Keep", ["Theirs", "Mine"], key=f"conflict_{client_id}_{section}", horizontal=True)
+            if choice == "Mine":
+                keep_mine.append(section)
+        if st.button("Save merged version", type="primary", key="resolve_conflict"):
+            st.session_state.pop('save_conflict', None)
+            try:
+                client_manager.resolve_conflict(conflict, keep_mine)
+            except ConflictError as e:
+                st.session_state.save_conflict = e
+            st.session_state.selected_client = client_manager.open_client(client_id)
+            st.rerun()
 
+@timed("app.render_sidebar")
 def render_sidebar():
     """Render the client management sidebar"""
     with st.sidebar:
         st.title("Client Management")
-        
-        # Add a search box for clients
-        st.text_input("🔍 Search Clients", key="client_search")
-        
-        # New Client Button at the top
-        if st.button("➕ Create New Client", type="primary", use_container_width=True):
-            st.session_state.is_creating_new = True
-            st.session_state.selected_client = None
-            st.rerun()
-        
-        st.divider()
-        
-        # All Clients Section
-        st.markdown("### 📋 All Clients")
-        clients = st.session_state.client_manager.get_all_clients()
-        search_term = st.session_state.get("client_search", "").lower()
-        
-        # Filter clients based on search
-        if search_term:
-            clients = [c for c in clients if search_term in c['name'].lower()]
-        
-        if not clients:
-            st.info("No clients found")
-        
-        for client in clients:
-            col1, col2 = st.columns([5, 1])
-            with col1:
-                if st.button(
-                    f"📁 {client['name']}",
-                    key=f"client_{client['client_id']}",
-                    help=f"Last modified: {client['last_modified']}",
-                    use_container_width=True
-                ):
-                    st.session_state.is_creating_new = False
-                    st.session_state.selected_client = st.session_state.client_manager.get_client(client['client_id'])
-                    st.rerun()
-            with col2:
-                if st.button("🗑️", key=f"delete_{client['client_id']}"):
-                    confirm, cancel = delete_confirmation(f"delete_{client['client_id']}")
-                    if confirm:
-                        with st.spinner("Deleting client..."):
-                            if st.session_state.selected_client and \
-                               st.session_state.selected_client['client_id'] == client['client_id']:
-                                st.session_state.selected_client = None
-                            st.session_state.client_manager.delete_client(client['client_id'])
-                            st.success("Client deleted successfully!")
-                            time.sleep(1)
-                            st.rerun()
+        render_client_list()
         
         # Generate Report Button (only show when client is selected)
         if st.session_state.selected_client and not st.session_state.is_creating_new:
@@ -215,8 +256,125 @@ def render_sidebar():
                                key="sidebar_generate_report", 
                                type="secondary", 
                                use_container_width=True):
-                st.sidebar.info("Report generation coming soon...")
+                start_report(st.session_state.selected_client['client_id'])
+
+def start_report(client_id):
+    """Queue a report in the background; render_report_status follows its progress"""
+    # Reports pull in Jinja2 and the simulation; most sessions never need them
+    from utils.reports import report_jobs
+    st.session_state.report_job = report_jobs.submit(st.session_state.client_manager, client_id)
+
+def render_report_status(client_id):
+    """Progress of the session's report job, then a download button once it is written"""
+    from utils.reports import report_jobs
+    job = report_jobs.status(st.session_state.report_job)
+    if job is None or job['client_id'] != client_id:
+        return
+    if job['state'] in ('queued', 'running'):
+        render_report_progress(job['job_id'])
+    elif job['state'] == 'error':
+        st.caption(f"⚠️ Report failed: {job['error']}")
+    else:
+        path = Path(job['path'])
+        st.download_button(
+            "⬇️ Download Report",
+            # Read only when the button is clicked, not on every rerun
+            data=path.read_bytes,
+            file_name=path.name,
+            mime="application/pdf" if path.suffix == ".pdf" else "text/html",
+            key="download_report",
+            use_container_width=True
+        )
+
+@st.fragment(run_every=1)
+def render_report_progress(job_id):
+    """Poll a running report job; once it finishes the page reruns once to show the outcome, which stops the polling"""
+    from utils.reports import report_jobs
+    job = report_jobs.status(job_id)
+    if job is None or job['state'] not in ('queued', 'running'):
+        st.rerun()
+    st.progress(job['progress'], text=f"📄 {job['stage']}...")
+
+@st.fragment
+@profiled_entry("app.render_client_list", profile_history)
+def render_client_list():
+    """Search, page through and pick clients; searching and paging only rerun this list"""
+    # Add a search box for clients
+    st.text_input("🔍 Search Clients", key="client_search")
+    
+    # New Client Button at the top
+    if st.button("➕ Create New Client", type="primary", use_container_width=True):
+        st.session_state.is_creating_new = True
+        st.session_state.selected_client = None
+        st.rerun()
+    
+    st.divider()
+    
+    # All Clients Section
+    st.markdown("### 📋 All Clients")
+    search_term = st.session_state.get("client_search", "")
+    if st.session_state.get('client_search_term') != search_term:
+        st.session_state.client_search_term = search_term
+        st.session_state.client_page = 0
+    
+    clients, total = st.session_state.client_manager.search_clients(
+        search_term,
+        page=st.session_state.client_page,
+        page_size=CLIENTS_PER_PAGE
+    )
+    if not clients and total:
+        # The book shrank under the current page; show the last page instead
+        st.session_state.client_page = (total - 1) // CLIENTS_PER_PAGE
+        clients, total = st.session_state.client_manager.search_clients(
+            search_term,
+            page=st.session_state.client_page,
+            page_size=CLIENTS_PER_PAGE
+        )
+
+    if not clients:
+        st.info("No clients found")
+    
+    for client in clients:
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            if st.button(
+                f"📁 {client['name']}",
+                key=f"client_{client['client_id']}",
+                help=f"Last modified: {client['last_modified']}",
+                use_container_width=True
+            ):
+                st.session_state.is_creating_new = False
+                st.session_state.selected_client = st.session_state.client_manager.open_client(client['client_id'])
+                st.rerun()
+        with col2:
+            if st.button("🗑️", key=f"delete_{client['client_id']}"):
+                confirm, cancel = delete_confirmation(f"delete_{client['client_id']}")
+                if confirm:
+                    with st.spinner("Deleting client..."):
+                        if st.session_state.selected_client and \
+                           st.session_state.selected_client['client_id'] == client['client_id']:
+                            st.session_state.selected_client = None
+                        st.session_state.client_manager.delete_client(client['client_id'])
+                        st.success("Client deleted successfully!")
+                        time.sleep(1)
+                        st.rerun()
+    
+    # Only the current page of clients is rendered
+    page_count = max(1, -(-total // CLIENTS_PER_PAGE))
+    if page_count > 1:
+        prev_col, page_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("◀", key="client_page_prev", disabled=st.session_state.client_page == 0):
+                st.session_state.client_page -= 1
+                st.rerun(scope="fragment")
+        with page_col:
+            st.caption(f"Page {st.session_state.client_page + 1} of {page_count} ({total} clients)")
+        with next_col:
+            if st.button("▶", key="client_page_next", disabled=st.session_state.client_page >= page_count - 1):
+                st.session_state.client_page += 1
+                st.rerun(scope="fragment")
 
+@profiled_entry("app.main", profile_history)
 def main():
     """Main application entry point"""
     st.set_page_config(
@@ -227,6 +385,8 @@ def main():
     
     init_session_state()
     render_sidebar()
+    if profiling_enabled():
+        render_profiler_panel()
     
     # Main content area
     if st.session_state.is_creating_new:
@@ -0,0 +1,53 @@
+"""Nightly backup of every client in the book.
+
+Usage (from the repository root):
+    python backup_clients.py [--no-prune]
+
+Unchanged clients add nothing; changed clients store only the sections
+that differ from their previous backup. Retention thinning and garbage
+collection of unreferenced versions run afterwards.
+"""
+import argparse
+import time
+
+from core.client_manager import ClientManager
+
+def backup_book(clients_dir="data/clients", backend=None, prune=True):
+    """Back up every client, then apply the retention policy"""
+    client_manager = ClientManager(clients_dir, backend)
+    backups = client_manager.backups
+
+    start = time.perf_counter()
+    stats = {'total': 0, 'changed': 0, 'unchanged': 0, 'stored_bytes': 0, 'pruned': 0, 'freed_bytes': 0}
+    for summary in client_manager.get_all_clients():
+        client_data = client_manager.get_client(summary['client_id'])
+        if client_data is None:
+            continue
+        entry, is_new = backups.backup(summary['client_id'], client_data)
+        stats['total'] += 1
+        if is_new:
+            stats['changed'] += 1
+            stats['stored_bytes'] += entry['stored_bytes']
+        else:
+            stats['unchanged'] += 1
+        if prune:
+            stats['pruned'] += backups.prune(summary['client_id'])
+    if prune:
+        stats['freed_bytes'] = backups.collect_garbage()
+    stats['elapsed'] = time.perf_counter() - start
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up every client in the book")
+    parser.add_argument("--clients-dir", default="data/clients")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default=None, help="Storage backend (default: settings)")
+    parser.add_argument("--no-prune", action="store_true", help="Skip retention thinning and garbage collection")
+    args = parser.parse_args()
+
+    stats = backup_book(args.clients_dir, args.backend, not args.no_prune)
+    print(f"Clients: {stats['total']}  changed: {stats['changed']}  unchanged: {stats['unchanged']}")
+    print(f"Stored: {stats['stored_bytes'] / 1024:,.1f} KiB  pruned versions: {stats['pruned']}  "
+          f"freed: {stats['freed_bytes'] / 1024:,.1f} KiB  elapsed: {stats['elapsed']:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Headless nightly projection run over every client in the book.
+
+Usage (from the repository root):
+    python batch_projections.py [--workers N] [--force]
+
+Clients whose content hash matches the previous run are skipped and
+keep their earlier results.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from core.client_manager import ClientManager
+from core.monte_carlo import simulation_inputs_from_client, run_simulation
+from core.projection_engine import project_scenarios, solve_max_spending
+
+DEFAULT_OUTPUT = Path("data/batch/projection_results.json")
+MONTE_CARLO_PATHS = 2000
+MONTE_CARLO_SEED = 42
+
+_worker_manager = None
+
+def _init_worker(clients_dir, backend):
+    """Create one ClientManager per worker process"""
+    global _worker_manager
+    _worker_manager = ClientManager(clients_dir, backend)
+
+def score_client(client, monte_carlo_paths=MONTE_CARLO_PATHS):
+    """Run the deterministic projection, max spending and Monte Carlo for one client"""
+    inputs = simulation_inputs_from_client(client)
+    scenario = {
+        'starting_balance': inputs['starting_balance'],
+        'current_age': inputs['current_age'],
+        'retirement_age': inputs['retirement_age'],
+        'final_age': inputs['life_expectancy'],
+        'annual_contribution': 0,
+        'growth_rate': inputs['investment_return'],
+        'inflation_rate': inputs['inflation_rate'],
+        'retirement_spending': inputs['annual_spending']
+    }
+    projection = project_scenarios([scenario])[0]
+    result = {
+        'nest_egg': inputs['starting_balance'],
+        'final_balance': projection['final_balance'],
+        'max_spending': float(solve_max_spending([scenario])[0]),
+        'success_probability': None
+    }
+    if inputs['life_expectancy'] > inputs['current_age']:
+        simulation = run_simulation(inputs, num_paths=monte_carlo_paths, seed=MONTE_CARLO_SEED)
+        result['success_probability'] = simulation['success_probability']
+    return result
+
+def _score_client_job(job):
+    client_id, content_hash, monte_carlo_paths = job
+    try:
+        client = _worker_manager.get_client(client_id)
+        if client is None:
+            return client_id, content_hash, None, "Client file not found"
+        return client_id, content_hash, score_client(client, monte_carlo_paths), None
+    except Exception as e:
+        return client_id, content_hash, None, f"{type(e).__name__}: {e}"
+
+def load_previous_results(output_path):
+    """Load the previous run's results, or an empty result set"""
+    try:
+        with open(output_path, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return {'clients': {}}
+
+def run_batch(clients_dir="data/clients", output_path=DEFAULT_OUTPUT, workers=None,
+              force=False, monte_carlo_paths=MONTE_CARLO_PATHS, backend=None):
+    """Score every changed client across a process pool and write one results file"""
+    client_manager = ClientManager(clients_dir, backend)
+    output_path = Path(output_path)
+    previous = load_previous_results(output_path)['clients']
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    results = {}
+    jobs = []
+    for client_id, content_hash in client_manager.storage.fingerprints().items():
+        earlier = previous.get(client_id)
+        if not force and earlier and earlier.get('content_hash') == content_hash and not earlier.get('error'):
+            results[client_id] = earlier
+        else:
+            jobs.append((client_id, content_hash, monte_carlo_paths))
+
+    failures = 0
+    if jobs:
+        chunksize = max(1, len(jobs) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(client_manager.clients_dir), backend)) as executor:
+            for client_id, content_hash, result, error in executor.map(_score_client_job, jobs, chunksize=chunksize):
+                entry = {
+                    'content_hash': content_hash,
+                    'computed_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }
+                if error:
+                    entry['error'] = error
+                    failures += 1
+                else:
+                    entry.update(result)
+                results[client_id] = entry
+    elapsed = time.perf_counter() - start
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(temp_path, 'w') as f:
+        json.dump({
+            'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'workers': workers,
+            'clients': results
+        }, f)
+    os.replace(temp_path, output_path)
+
+    return {
+        'total': len(results),
+        'scored': len(jobs),
+        'skipped': len(results) - len(jobs),
+        'failed': failures,
+        'workers': workers,
+        'elapsed': elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score every client projection in the book")
+    parser.add_argument("--clients-dir", default="data/clients")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-score clients even if unchanged")
+    parser.add_argument("--mc-paths", type=int, default=MONTE_CARLO_PATHS, help="Monte Carlo paths per client")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default=None, help="Storage backend (default: settings)")
+    args = parser.parse_args()
+
+    stats = run_batch(args.clients_dir, args.output, args.workers, args.force, args.mc_paths, args.backend)
+    rate = stats['scored'] / stats['elapsed'] if stats['elapsed'] else 0
+    print(f"Clients: {stats['total']}  scored: {stats['scored']}  skipped: {stats['skipped']}  "
+          f"failed: {stats['failed']}")
+    print(f"Workers: {stats['workers']}  elapsed: {stats['elapsed']:.2f}s  ({rate:,.1f} clients/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Figure payload and server build time: one go.Scatter point per value vs. the chart layer.
+
+Run from the repository root:
+    python -m benchmarks.bench_charts
+
+"Build" is what Streamlit does per chart on a rerun: build the figure and
+serialize it to JSON. The payload is the JSON the browser has to parse and
+draw, and is capped by decimation no matter how dense the series are.
+"""
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+from config.settings import CHART_SETTINGS
+from utils.charts import cached_figure, fan_chart, payload_size, scenario_chart
+from core.compute_cache import compute_cache
+
+def legacy_fan_chart(ages, bands):
+    """Original chart code: one list-valued Scatter trace per band edge"""
+    fig = go.Figure()
+    for low, high in ((5, 95), (25, 75)):
+        fig.add_trace(go.Scatter(x=list(ages), y=list(bands[high]), line=dict(width=0)))
+        fig.add_trace(go.Scatter(x=list(ages), y=list(bands[low]), fill="tonexty", line=dict(width=0)))
+    fig.add_trace(go.Scatter(x=list(ages), y=list(bands[50])))
+    return fig
+
+def legacy_scenario_chart(projections):
+    fig = go.Figure()
+    for projection in projections:
+        fig.add_trace(go.Scatter(x=list(projection['years']), y=list(projection['balances'])))
+    return fig
+
+def synthetic_bands(points, seed=0):
+    rng = np.random.default_rng(seed)
+    ages = np.linspace(40, 100, points)
+    paths = np.cumsum(rng.normal(0.005, 0.05, size=(500, points)), axis=1)
+    balances = 1_000_000 * np.exp(paths)
+    return ages, {p: np.percentile(balances, p, axis=0) for p in (5, 25, 50, 75, 95)}
+
+def synthetic_projections(count, points, seed=0):
+    rng = np.random.default_rng(seed)
+    ages = np.linspace(40, 100, points)
+    return [
+        {'years': ages, 'balances': 1_000_000 * np.exp(np.cumsum(rng.normal(0.005, 0.02, points)))}
+        for _ in range(count)
+    ]
+
+def _measure(build, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fig = build()
+        size = payload_size(fig)
+    return (time.perf_counter() - start) / repeat, size
+
+def main():
+    cases = []
+    for label, points in (("annual fan", 61), ("monthly fan", 721), ("weekly fan", 3131)):
+        ages, bands = synthetic_bands(points)
+        cases.append((label,
+                      lambda ages=ages, bands=bands: legacy_fan_chart(ages, bands),
+                      lambda ages=ages, bands=bands: fan_chart(ages, bands, 65),
+                      ('fan', ages, bands)))
+    for count in (3, 20):
+        projections = synthetic_projections(count, 721)
+        scenarios = [{'name': f"Scenario {i}", 'growth_rate': 6.0, 'color': "#0066cc"} for i in range(count)]
+        cases.append((f"{count} monthly scenarios",
+                      lambda projections=projections: legacy_scenario_chart(projections),
+                      lambda scenarios=scenarios, projections=projections: scenario_chart(scenarios, projections, 65),
+                      ('scenarios', scenarios, projections)))
+
+    print(f"max_points={CHART_SETTINGS['max_points']}  webgl_threshold={CHART_SETTINGS['webgl_threshold']}")
+    print(f"{'chart':<22}{'legacy KiB':>12}{'legacy ms':>11}{'layer KiB':>11}{'layer ms':>10}{'cached ms':>11}")
+    for label, legacy, layer, key in cases:
+        legacy_time, legacy_size = _measure(legacy)
+        layer_time, layer_size = _measure(layer)
+        compute_cache.clear()
+        cached_figure(key[0], key[1:], layer)
+        start = time.perf_counter()
+        fig = cached_figure(key[0], key[1:], layer)
+        fig.to_json()
+        cached_time = time.perf_counter() - start
+        print(f"{label:<22}{legacy_size / 1024:>12,.1f}{legacy_time * 1000:>11.1f}"
+              f"{layer_size / 1024:>11,.1f}{layer_time * 1000:>10.1f}{cached_time * 1000:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Sessions viewing the same large household: private parsed copies vs. the shared client cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_client_cache [--sessions 10] [--assets 5000]
+
+Each simulated session opens the client and reads every section, as a
+sidebar click followed by a pass over the tabs would. "Private" parses a
+copy per session, as before the shared cache; "shared" reads through it.
+Memory is what the sessions' client objects (and the cache) keep alive,
+from tracemalloc.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic_book import generate_book
+from core.client_cache import client_cache
+from core.client_manager import ClientManager
+from core.lazy_client import edit_section
+
+CLIENT_ID = "client_000000"
+
+def _open_sessions(open_client, sessions):
+    clients = []
+    for _ in range(sessions):
+        client = open_client()
+        for section in list(client):
+            client[section]
+        clients.append(client)
+    return clients
+
+def _measure(open_client, sessions, reset):
+    """(seconds per session, bytes retained by the sessions' clients and any cache)"""
+    reset()
+    start = time.perf_counter()
+    _open_sessions(open_client, sessions)
+    seconds = (time.perf_counter() - start) / sessions
+    reset()
+    tracemalloc.start()
+    clients = _open_sessions(open_client, sessions)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del clients
+    return seconds, retained
+
+def run(sessions, assets):
+    workdir = Path(tempfile.mkdtemp(prefix="bench_client_cache_"))
+    try:
+        generate_book(workdir, 1, min_assets=assets, max_assets=assets)
+        manager = ClientManager(workdir, backend="json")
+        manager.get_all_clients()
+
+        private = _measure(lambda: manager.storage.load(CLIENT_ID), sessions, lambda: None)
+        shared = _measure(lambda: manager.open_client(CLIENT_ID), sessions, client_cache.clear)
+
+        client = manager.open_client(CLIENT_ID)
+        client['assets']
+        start = time.perf_counter()
+        edit_section(client, 'assets')
+        edit_seconds = time.perf_counter() - start
+        return private, shared, edit_seconds, client_cache.stats()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-session client copies with the shared client cache")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--assets", type=int, default=5000, help="Assets in the household")
+    args = parser.parse_args()
+
+    private, shared, edit_seconds, stats = run(args.sessions, args.assets)
+    print(f"{args.sessions} sessions, one household with {args.assets:,} assets")
+    print(f"{'':<10}{'ms/session':>12}{'retained MiB':>14}")
+    for label, (seconds, retained) in (("private", private), ("shared", shared)):
+        print(f"{label:<10}{seconds * 1000:>12.2f}{retained / 2**20:>14.2f}")
+    print(f"First edit (copy of the assets section): {edit_seconds * 1000:.2f} ms")
+    print(f"Client cache: {stats['bytes'] / 2**20:.2f} MiB estimated, hit rate {stats['hit_rate']:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare the max-spending solver against the original $100 bisection.
+
+Run from the repository root:
+    python -m benchmarks.bench_max_spending
+"""
+import random
+import time
+from typing import Dict
+
+from core.projection_engine import solve_max_spending
+
+def legacy_project_scenario(scenario: Dict, retirement_spending: float) -> Dict:
+    """Original year-by-year projection loop, kept as the reference implementation"""
+    years = list(range(scenario['current_age'], scenario['final_age'] + 1))
+    balances = [scenario['starting_balance']]
+
+    for year in range(len(years) - 1):
+        balance_after_growth = balances[-1] * (1 + scenario['growth_rate'] / 100)
+        if year < scenario['retirement_age'] - scenario['current_age']:
+            balances.append(balance_after_growth + scenario['annual_contribution'])
+        else:
+            inflation_adjusted_spending = retirement_spending * (1 + scenario['inflation_rate'] / 100) ** year
+            balances.append(balance_after_growth - inflation_adjusted_spending)
+
+    return {'years': years, 'balances': balances, 'final_balance': balances[-1]}
+
+def legacy_max_spending(scenario: Dict) -> float:
+    """Original bisection with a $100 tolerance"""
+    min_spend = 0
+    max_spend = scenario['starting_balance']
+    while (max_spend - min_spend) > 100:
+        current_spend = (max_spend + min_spend) / 2
+        if legacy_project_scenario(scenario, current_spend)['final_balance'] > 0:
+            min_spend = current_spend
+        else:
+            max_spend = current_spend
+    return min_spend
+
+def random_scenarios(count: int, seed: int = 42):
+    """Generate scenarios spanning the ranges the UI allows"""
+    rng = random.Random(seed)
+    scenarios = []
+    for _ in range(count):
+        current_age = rng.randint(25, 75)
+        scenarios.append({
+            'current_age': current_age,
+            'final_age': rng.randint(max(current_age + 1, 80), 105),
+            'retirement_age': rng.randint(50, 80),
+            'annual_contribution': rng.choice([0, 0, 5000, 20000]),
+            'growth_rate': round(rng.uniform(0, 15), 1),
+            'inflation_rate': round(rng.uniform(0, 10), 1),
+            'starting_balance': rng.uniform(0, 5_000_000),
+        })
+    return scenarios
+
+def main(count: int = 1000):
+    scenarios = random_scenarios(count)
+
+    start = time.perf_counter()
+    legacy = [legacy_max_spending(s) for s in scenarios]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solved = solve_max_spending(scenarios)
+    solver_time = time.perf_counter() - start
+
+    max_error = max(abs(a - b) for a, b in zip(legacy, solved))
+    print(f"Scenarios:            {count}")
+    print(f"Legacy bisection:     {legacy_time * 1000:10.2f} ms ({legacy_time / count * 1e6:8.1f} us/scenario)")
+    print(f"Closed-form solver:   {solver_time * 1000:10.2f} ms ({solver_time / count * 1e6:8.1f} us/scenario)")
+    print(f"Speedup:              {legacy_time / solver_time:10.1f}x")
+    print(f"Max abs difference:   ${max_error:,.2f} (legacy tolerance is $100)")
+
+if __name__ == "__main__":
+    main()
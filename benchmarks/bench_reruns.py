@@ -0,0 +1,98 @@
+"""Server time per interaction: full-app rerun vs. the fragment the interaction now reruns.
+
+Run from the repository root:
+    python -m benchmarks.bench_reruns --clients 2000 --assets 500
+
+Before the workspace was split into fragments every interaction re-executed
+the whole app, so the full rerun time is the "before" figure; the fragment
+time is what a search keystroke, an asset card edit or a scenario input
+change costs now.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic_book import generate_book, load_template, synthetic_client
+from core.client_manager import ClientManager
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+LARGE_CLIENT_ID = "large_client"
+
+def _client_list_fragment():
+    import streamlit as st
+    from app import render_client_list
+    with st.sidebar:
+        render_client_list()
+
+def _asset_card_fragment():
+    import streamlit as st
+    from sections.assets_liabilities import render_asset_category
+    client = st.session_state.selected_client
+    category = max(client['asset_categories'], key=lambda c: len(client['assets'].get(c, [])))
+    render_asset_category(category, client, st.session_state.client_manager)
+
+def _scenario_column_fragment():
+    from sections.retirement_scenarios import render_scenario_column
+    render_scenario_column('moderate', "Traditional")
+
+FRAGMENTS = {
+    'sidebar search': (1, _client_list_fragment),
+    'asset card': (1, _asset_card_fragment),
+    'scenario column': (5, _scenario_column_fragment)
+}
+
+def _time_runs(app_test, repeat):
+    app_test.run()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        app_test.run()
+    return (time.perf_counter() - start) / repeat
+
+def _copy_state(source, target, keys):
+    for key in keys:
+        if key in source.session_state:
+            target.session_state[key] = source.session_state[key]
+
+def run(num_clients, num_assets, repeat=5, seed=0):
+    import random
+    workdir = Path(tempfile.mkdtemp(prefix="bench_reruns_"))
+    cwd = os.getcwd()
+    try:
+        clients_dir = generate_book(workdir / "data" / "clients", num_clients, seed)
+        large = synthetic_client(load_template(), 0, random.Random(seed), num_assets, num_assets)
+        large['client_id'] = LARGE_CLIENT_ID
+        ClientManager(clients_dir).save_client(large)
+        os.chdir(workdir)
+
+        print(f"{num_clients} clients, large client with {num_assets} assets")
+        print(f"{'interaction':<18}{'full rerun':>14}{'fragment':>14}")
+        for name, (tab, fragment) in FRAGMENTS.items():
+            full = AppTest.from_file(str(APP_PATH), default_timeout=300)
+            full.run()
+            full.session_state.selected_client = full.session_state.client_manager.open_client(LARGE_CLIENT_ID)
+            full.session_state.current_tab = tab
+            full_time = _time_runs(full, repeat)
+
+            partial = AppTest.from_function(fragment, default_timeout=300)
+            _copy_state(full, partial, ['client_manager', 'selected_client', 'retirement_scenarios', 'client_page'])
+            fragment_time = _time_runs(partial, repeat)
+            print(f"{name:<18}{full_time * 1000:>11.1f} ms{fragment_time * 1000:>11.1f} ms")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-interaction server time")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.clients, args.assets, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Cold-start cost of the app: module import time and time to first paint.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [--runs 5] [--check]
+
+Each measurement runs in a fresh interpreter. Import time is reported on
+top of importing Streamlit itself, which the app cannot avoid. First paint
+is the first AppTest run of app.py (welcome screen and sidebar). Core import
+is what a worker or CLI pays for storage and totals, which must not pull
+in Streamlit. With --check the run exits non-zero if a budget is exceeded,
+if the core imports Streamlit, or if importing the app loads a module that
+should wait until its tab is opened.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Budgets, in milliseconds (medians over --runs fresh interpreters)
+IMPORT_BUDGET_MS = 150
+FIRST_PAINT_BUDGET_MS = 600
+CORE_IMPORT_BUDGET_MS = 60
+
+# Must not be imported by `import app`; sections load them on first use. A
+# package name also covers its submodules, counting only what the app loads
+# on top of Streamlit (which itself imports parts of plotly)
+DEFERRED_MODULES = [
+    "pandas",
+    "numpy",
+    "plotly",
+    "jinja2",
+    "reportlab",
+    "core.projection_engine",
+    "core.monte_carlo",
+    "utils.charts",
+    "utils.reports",
+    "utils.report_charts",
+    "sections.client_information",
+    "sections.assets_liabilities",
+    "sections.cash_flow",
+    "sections.balance_sheet",
+    "sections.projections",
+    "sections.retirement_scenarios"
+]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import streamlit
+streamlit_seconds = time.perf_counter() - start
+before = set(sys.modules)
+import app
+total_seconds = time.perf_counter() - start
+print(json.dumps({
+    'streamlit': streamlit_seconds,
+    'app': total_seconds - streamlit_seconds,
+    'loaded': sorted({m for m in %r for name in set(sys.modules) - before if name == m or name.startswith(m + ".")})
+}))
+""" % (DEFERRED_MODULES,)
+
+CORE_MODULES = ["core.client_manager", "core.financial_summary", "core.storage", "core.backups"]
+
+CORE_IMPORT_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in %r:
+    importlib.import_module(name)
+print(json.dumps({'core': time.perf_counter() - start, 'streamlit': 'streamlit' in sys.modules}))
+""" % (CORE_MODULES,)
+
+FIRST_PAINT_SCRIPT = """
+import json, time
+from streamlit.testing.v1 import AppTest
+app_test = AppTest.from_file("app.py", default_timeout=60)
+start = time.perf_counter()
+app_test.run()
+print(json.dumps({'first_paint': time.perf_counter() - start, 'exceptions': len(app_test.exception)}))
+"""
+
+def _run_fresh(script):
+    completed = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def measure(runs=5):
+    """Median import and first-paint times over fresh interpreters, in seconds"""
+    imports = [_run_fresh(IMPORT_SCRIPT) for _ in range(runs)]
+    paints = [_run_fresh(FIRST_PAINT_SCRIPT) for _ in range(runs)]
+    cores = [_run_fresh(CORE_IMPORT_SCRIPT) for _ in range(runs)]
+    return {
+        'core_import': statistics.median(r['core'] for r in cores),
+        'core_imports_streamlit': any(r['streamlit'] for r in cores),
+        'streamlit_import': statistics.median(r['streamlit'] for r in imports),
+        'app_import': statistics.median(r['app'] for r in imports),
+        'first_paint': statistics.median(r['first_paint'] for r in paints),
+        'eagerly_loaded': sorted(set().union(*(r['loaded'] for r in imports))),
+        'exceptions': max(r['exceptions'] for r in paints)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app import time and time to first paint")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if a budget is exceeded")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    print(f"streamlit import:   {result['streamlit_import'] * 1000:8.0f} ms")
+    print(f"app import:         {result['app_import'] * 1000:8.0f} ms  (budget {IMPORT_BUDGET_MS} ms)")
+    print(f"first paint:        {result['first_paint'] * 1000:8.0f} ms  (budget {FIRST_PAINT_BUDGET_MS} ms)")
+    print(f"core import:        {result['core_import'] * 1000:8.0f} ms  (budget {CORE_IMPORT_BUDGET_MS} ms)")
+    print(f"eagerly loaded:     {', '.join(result['eagerly_loaded']) or 'none of the deferred modules'}")
+
+    failures = []
+    if result['app_import'] * 1000 > IMPORT_BUDGET_MS:
+        failures.append("app import over budget")
+    if result['first_paint'] * 1000 > FIRST_PAINT_BUDGET_MS:
+        failures.append("first paint over budget")
+    if result['core_import'] * 1000 > CORE_IMPORT_BUDGET_MS:
+        failures.append("core import over budget")
+    if result['core_imports_streamlit']:
+        failures.append("core imports streamlit")
+    if result['eagerly_loaded']:
+        failures.append("deferred modules imported at startup")
+    if result['exceptions']:
+        failures.append("first run raised an exception")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if args.check and failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare the JSON-file and SQLite storage backends.
+
+Run from the repository root:
+    python -m benchmarks.bench_storage --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_book import generate_book, synthetic_clients
+from core.client_manager import ClientManager
+
+SAMPLE_OPERATIONS = 200
+
+def _timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+def bench_backend(manager, client_ids, rng):
+    """Time listing, loading and saving on one ClientManager"""
+    results = {'list_cold': _timed(manager.get_all_clients)}
+    results['list_warm'] = _timed(manager.get_all_clients, repeat=20)
+
+    sample = rng.sample(client_ids, min(SAMPLE_OPERATIONS, len(client_ids)))
+    loaded = []
+    results['load'] = _timed(lambda: loaded.extend(manager.get_client(c) for c in sample)) / len(sample)
+    results['save'] = _timed(lambda: [manager.save_client(c) for c in loaded]) / len(loaded)
+    return results
+
+def run(sizes, seed=0):
+    rng = random.Random(seed)
+    for size in sizes:
+        workdir = Path(tempfile.mkdtemp(prefix=f"bench_storage_{size}_"))
+        try:
+            json_dir = generate_book(workdir / "json", size, seed)
+            client_ids = [f"client_{i:06d}" for i in range(size)]
+
+            sqlite_dir = workdir / "sqlite"
+            sqlite_manager = ClientManager(sqlite_dir, backend="sqlite")
+            import_time = _timed(lambda: sqlite_manager.storage.import_clients(
+                (c['client_id'], c) for c in synthetic_clients(size, seed)))
+
+            results = {
+                'json': bench_backend(ClientManager(json_dir, backend="json"), client_ids, rng),
+                'sqlite': bench_backend(sqlite_manager, client_ids, rng)
+            }
+            print(f"\n{size:,} clients (SQLite bulk import: {import_time:.2f}s)")
+            print(f"{'':10}{'list cold':>12}{'list warm':>12}{'load':>12}{'save':>12}")
+            for backend, r in results.items():
+                print(f"{backend:10}" + "".join(
+                    f"{r[k] * 1000:10.3f}ms" for k in ('list_cold', 'list_warm', 'load', 'save')))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the client storage backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+    run(args.sizes)
+
+if __name__ == "__main__":
+    main()
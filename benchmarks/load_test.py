@@ -0,0 +1,361 @@
+"""Interleaved-session load test: many headless sessions taking turns through app.py.
+
+Run from the repository root:
+    python -m benchmarks.load_test --clients 500 --sessions 1 5 10 25 50
+
+Each simulated session is an AppTest with its own session state (and so its
+own ClientManager, as in the real app). A session picks a client from the
+sidebar, pages through every workspace tab, saves an asset edit and clicks
+Calculate Maximum Spending, for --rounds rounds. All sessions at a level
+live in threads of one process and share its caches, like sessions on one
+Streamlit server, but AppTest runs only one rerun at a time (see
+_script_lock). The figures are therefore sequential throughput with that
+many sessions' state resident, not parallel contention: latencies include
+the wait for other sessions' reruns, and lock or cache contention between
+simultaneous reruns never happens. --writers measures real concurrency.
+
+For each level it reports reruns per second, p50/p95/p99 rerun latency
+(queueing included), read/write syscalls
+and bytes from /proc/self/io, the peak RSS sampled during the level, and
+the shared client cache's hit rate and size at the end of it.
+The data editor cannot be driven headlessly, so the asset edit applies the
+same change set the grid would submit and queues the save the same way.
+
+With --writers, it instead measures save throughput under concurrent
+writers:
+    python -m benchmarks.load_test --writers 1 2 4 8 [--hot 3] [--backend sqlite]
+
+Each writer is a separate process with its own ClientManager, saving
+small edits to the --hot clients as fast as it can. It keeps a client open
+across --reopen-every saves while the other writers save to it, so it
+edits from stale sections the way a long-open session does. A save that
+conflicts is redone on the freshly stored client. Every save appends to
+the writer's own list in the section, and afterwards every appended entry
+is checked against storage, so a lost update is counted rather than
+missed.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from streamlit import config, logger
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic_book import generate_book, synthetic_clients
+from core.client_cache import client_cache
+from core.client_manager import ClientManager
+from core.conflicts import ConflictError
+from core.lazy_client import edit_section
+from sections.assets_liabilities import apply_asset_edits, ensure_asset_ids
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+TAB_LABELS = [
+    "📋 Client Information",
+    "💰 Assets & Liabilities",
+    "💵 Cash Flow",
+    "📊 Balance Sheet",
+    "📈 Projections",
+    "🎯 Retirement Analysis"
+]
+DEFAULT_LEVELS = [1, 5, 10, 25, 50]
+# Sections concurrent writers edit; two writers saving the same one conflict
+WRITER_SECTIONS = ['personal_info', 'income', 'expenses', 'projections']
+# Saves a writer makes through one opened client before reopening it
+REOPEN_EVERY = 5
+RSS_SAMPLE_SECONDS = 0.05
+
+# AppTest swaps process-wide Streamlit state (the runtime, config) for the
+# length of each run, so two runs cannot overlap. Sessions queue for it, the
+# queueing is part of the latency recorded, and no two reruns ever contend
+# for a lock or cache at the same moment.
+_script_lock = threading.Lock()
+
+def _proc_io():
+    """Process-wide I/O counters, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/io", 'r') as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except OSError:
+        return None
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+class RSSSampler(threading.Thread):
+    """Track peak resident memory while a level runs"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = _rss_bytes()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(RSS_SAMPLE_SECONDS):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return self.peak
+
+def _timed_run(latencies, action):
+    start = time.perf_counter()
+    with _script_lock:
+        app_test = action()
+    latencies.append(time.perf_counter() - start)
+    if app_test.exception:
+        raise RuntimeError(app_test.exception[0].message)
+
+def _click(app_test, label):
+    return next(b for b in app_test.button if b.label == label).click().run()
+
+def _edit_asset(app_test, rng):
+    """Change one asset value and queue the save, as submitting the asset grid does"""
+    client = app_test.session_state.selected_client
+    category = rng.choice([c for c in client['assets'] if client['assets'][c]] or [None])
+    if category is None:
+        return app_test.run()
+    assets = edit_section(client, 'assets')[category]
+    ensure_asset_ids(assets)
+    row = rng.randrange(len(assets))
+    apply_asset_edits(assets, {
+        'edited_rows': {row: {'value': round(rng.uniform(1000, 500000), 2)}},
+        'added_rows': [],
+        'deleted_rows': []
+    })
+    app_test.session_state.client_manager.queue_save(client)
+    return app_test.run()
+
+def simulate_session(rounds, seed, latencies, errors):
+    """One advisor: pick a client, page through the tabs, edit an asset, solve max spending"""
+    rng = random.Random(seed)
+    try:
+        app_test = AppTest.from_file(str(APP_PATH), default_timeout=600)
+        _timed_run(latencies, app_test.run)
+        for _ in range(rounds):
+            client_buttons = [b for b in app_test.button if b.key and b.key.startswith("client_")
+                              and not b.key.startswith("client_page")]
+            choice = rng.choice(client_buttons)
+            _timed_run(latencies, lambda: choice.click().run())
+            for label in TAB_LABELS:
+                _timed_run(latencies, lambda: _click(app_test, label))
+                if label == TAB_LABELS[1]:
+                    _timed_run(latencies, lambda: _edit_asset(app_test, rng))
+            _timed_run(latencies, lambda: app_test.radio[0].set_value("Maximum Spending").run())
+            _timed_run(latencies, lambda: app_test.button(key="calc_moderate").click().run())
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+
+def run_level(sessions, rounds, seed=0):
+    """Interleave `sessions` sessions and summarize their rerun throughput and latencies"""
+    latencies = []
+    errors = []
+    io_before = _proc_io()
+    cache_before = client_cache.stats()
+    sampler = RSSSampler()
+    sampler.start()
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=simulate_session, args=(rounds, seed + i, latencies, errors))
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    peak_rss = sampler.stop()
+    io_after = _proc_io()
+    cache_after = client_cache.stats()
+    lookups = (cache_after['hits'] + cache_after['misses']) - (cache_before['hits'] + cache_before['misses'])
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    result = {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'errors': errors,
+        'elapsed': elapsed,
+        'reruns_per_second': len(latencies) / elapsed,
+        'p50': quantiles[49],
+        'p95': quantiles[94],
+        'p99': quantiles[98],
+        'peak_rss': peak_rss,
+        'cache_hit_rate': (cache_after['hits'] - cache_before['hits']) / lookups if lookups else 0.0,
+        'cache_bytes': cache_after['bytes']
+    }
+    if io_before and io_after:
+        for key in ('syscr', 'syscw', 'rchar', 'wchar'):
+            result[key] = io_after[key] - io_before[key]
+    return result
+
+def run(num_clients, levels, rounds, seed=0):
+    config.set_option("logger.level", "error")
+    logger.set_log_level("error")
+    workdir = Path(tempfile.mkdtemp(prefix="load_test_"))
+    cwd = os.getcwd()
+    try:
+        generate_book(workdir / "data" / "clients", num_clients, seed)
+        os.chdir(workdir)
+        print(f"{num_clients} clients, {rounds} round(s) per session; "
+              f"reruns run one at a time, so these are sequential figures")
+        print(f"{'sessions':>8}{'reruns':>8}{'rerun/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}"
+              f"{'reads':>10}{'writes':>9}{'read MiB':>10}{'peak RSS':>11}{'cache hit':>11}{'cache':>9}")
+        results = []
+        for sessions in levels:
+            result = run_level(sessions, rounds, seed)
+            results.append(result)
+            print(f"{sessions:>8}{result['reruns']:>8}{result['reruns_per_second']:>9.1f}"
+                  f"{result['p50'] * 1000:>8.0f}ms{result['p95'] * 1000:>8.0f}ms{result['p99'] * 1000:>8.0f}ms"
+                  f"{result.get('syscr', 0):>10,}{result.get('syscw', 0):>9,}"
+                  f"{result.get('rchar', 0) / 2**20:>10.1f}{result['peak_rss'] / 2**20:>8.0f}MiB"
+                  f"{result['cache_hit_rate']:>11.0%}{result['cache_bytes'] / 2**20:>6.2f}MiB")
+            for error in result['errors'][:3]:
+                print(f"    error: {error}")
+        return results
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def run_writer(clients_dir, backend, writer, client_ids, saves, seed, barrier, results, reopen_every):
+    """One writer process: save `saves` edits to the hot clients, redoing any that conflict.
+
+    Like an advisor with a client open in a tab, a writer keeps each client
+    open across `reopen_every` saves while the others write to it, so its
+    loaded sections go stale; only a conflict or the count makes it reopen.
+    """
+    rng = random.Random(seed + writer)
+    manager = ClientManager(clients_dir, backend=backend)
+    opened = {}
+    latencies = []
+    conflicts = 0
+    saved = {}
+    barrier.wait()
+    start = time.perf_counter()
+    try:
+        for n in range(saves):
+            client_id = rng.choice(client_ids)
+            section = rng.choice(WRITER_SECTIONS)
+            save_start = time.perf_counter()
+            while True:
+                client, uses = opened.get(client_id) or (manager.open_client(client_id), 0)
+                opened[client_id] = (client, uses + 1) if uses + 1 < reopen_every else None
+                edit_section(client, section).setdefault(f"load_test_writer_{writer}", []).append(n)
+                try:
+                    manager.save_client(client)
+                    break
+                except ConflictError:
+                    conflicts += 1
+                    opened[client_id] = None
+            latencies.append(time.perf_counter() - save_start)
+            saved.setdefault((client_id, section), []).append(n)
+    except Exception as e:
+        results.put({'writer': writer, 'error': f"{type(e).__name__}: {e}"})
+        return
+    results.put({
+        'writer': writer,
+        'elapsed': time.perf_counter() - start,
+        'latencies': latencies,
+        'conflicts': conflicts,
+        'saved': saved
+    })
+
+def run_writers(writers, saves, clients_dir, backend, client_ids, seed=0, reopen_every=REOPEN_EVERY):
+    """Run `writers` concurrent writer processes and check that none of their saves was lost"""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(writers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_writer,
+                        args=(str(clients_dir), backend, writer, client_ids, saves, seed, barrier, results,
+                              reopen_every))
+        for writer in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    errors = [outcome['error'] for outcome in outcomes if 'error' in outcome]
+    if errors:
+        raise RuntimeError(f"writer failed: {errors[0]}")
+
+    stored = ClientManager(clients_dir, backend=backend)
+    clients = {client_id: stored.get_client(client_id) for client_id in client_ids}
+    # Each save appended to the writer's list in the section, so a save from a stale
+    # copy of the section that overwrote another writer's saves shows up as missing entries
+    lost = sum(
+        len(set(values) - set(clients[client_id][section].get(f"load_test_writer_{outcome['writer']}", [])))
+        for outcome in outcomes
+        for (client_id, section), values in outcome['saved'].items()
+    )
+    latencies = [latency for outcome in outcomes for latency in outcome['latencies']]
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'writers': writers,
+        'saves': len(latencies),
+        'saves_per_second': len(latencies) / max(outcome['elapsed'] for outcome in outcomes),
+        'conflicts': sum(outcome['conflicts'] for outcome in outcomes),
+        'lost': lost,
+        'p50': quantiles[49],
+        'p95': quantiles[94]
+    }
+
+def run_write_load(levels, saves, hot, backend, seed=0, reopen_every=REOPEN_EVERY):
+    workdir = Path(tempfile.mkdtemp(prefix="load_test_writers_"))
+    try:
+        clients_dir = workdir / "clients"
+        manager = ClientManager(clients_dir, backend=backend)
+        if backend == "sqlite":
+            manager.storage.import_clients((c['client_id'], c) for c in synthetic_clients(hot, seed))
+        else:
+            generate_book(clients_dir, hot, seed)
+        # Let the backend build its index before the writers race for it
+        client_ids = [client['client_id'] for client in manager.get_all_clients()]
+        print(f"{backend} storage, {hot} hot client(s), {saves} saves per writer, reopened every {reopen_every}")
+        print(f"{'writers':>8}{'saves':>8}{'saves/s':>10}{'conflicts':>11}{'lost':>6}{'p50':>10}{'p95':>10}")
+        results = []
+        for writers in levels:
+            result = run_writers(writers, saves, clients_dir, backend, client_ids, seed, reopen_every)
+            results.append(result)
+            print(f"{writers:>8}{result['saves']:>8}{result['saves_per_second']:>10.0f}"
+                  f"{result['conflicts']:>11}{result['lost']:>6}"
+                  f"{result['p50'] * 1000:>8.1f}ms{result['p95'] * 1000:>8.1f}ms")
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive interleaved headless sessions through the app")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_LEVELS,
+                        help="Numbers of interleaved sessions to run, in order")
+    parser.add_argument("--rounds", type=int, default=2, help="Client visits per session")
+    parser.add_argument("--writers", type=int, nargs="+",
+                        help="Measure concurrent writer processes at these levels instead of sessions")
+    parser.add_argument("--saves", type=int, default=200, help="Saves per writer")
+    parser.add_argument("--hot", type=int, default=3, help="Clients the writers contend for")
+    parser.add_argument("--reopen-every", type=int, default=REOPEN_EVERY,
+                        help="Saves a writer makes before reopening a client")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    args = parser.parse_args()
+    if args.writers:
+        run_write_load(args.writers, args.saves, args.hot, args.backend, reopen_every=args.reopen_every)
+    else:
+        run(args.clients, args.sessions, args.rounds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Benchmark suite for the core hot paths, with JSON results and regression flags.
+
+Run from the repository root:
+    python -m benchmarks.suite --sizes 100 1000 10000 100000
+
+Computations (scenario projection, max spending, asset and balance-sheet
+totals) are timed per call on synthetic clients; storage operations
+(listing, loading, saving) are timed against a generated book of each size.
+Results are written to benchmarks/results/ and compared with the previous
+run (or --baseline); anything slower by more than --threshold is flagged
+and the run exits non-zero.
+"""
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.bench_max_spending import random_scenarios
+from benchmarks.synthetic_book import generate_book, synthetic_clients
+from core.client_cache import client_cache
+from core.client_manager import ClientManager
+from core.financial_summary import compute_financial_summary
+from core.projection_engine import project_scenarios, solve_max_spending
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+SAMPLE_OPERATIONS = 200
+REPEAT = 5
+# Differences smaller than this are timer noise, whatever the ratio
+NOISE_FLOOR_SECONDS = 1e-6
+
+def _per_call(func, calls, repeat=REPEAT):
+    """Median seconds per call over repeat timings of func, which makes `calls` calls"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) / calls)
+    return statistics.median(timings)
+
+def bench_compute(seed=0):
+    """Per-client computations; these do not depend on the size of the book"""
+    scenarios = random_scenarios(SAMPLE_OPERATIONS, seed)
+    clients = list(synthetic_clients(SAMPLE_OPERATIONS, seed))
+    return {
+        'compute.project_scenario': _per_call(
+            lambda: [project_scenarios([s], [20000.0]) for s in scenarios], len(scenarios)),
+        'compute.project_scenarios_batch': _per_call(
+            lambda: project_scenarios(scenarios, [20000.0] * len(scenarios)), len(scenarios)),
+        'compute.max_spending': _per_call(
+            lambda: [solve_max_spending([s]) for s in scenarios], len(scenarios)),
+        'compute.financial_summary': _per_call(
+            lambda: [compute_financial_summary(c) for c in clients], len(clients))
+    }
+
+def bench_storage(book_dir, size, backend=None, seed=0):
+    """Listing, loading and saving against a book of `size` clients"""
+    rng = random.Random(seed)
+    client_ids = [f"client_{i:06d}" for i in range(size)]
+    sample = rng.sample(client_ids, min(SAMPLE_OPERATIONS, size))
+
+    start = time.perf_counter()
+    manager = ClientManager(book_dir, backend)
+    manager.get_all_clients()
+    results = {f'storage.get_all_clients_cold[{size}]': time.perf_counter() - start}
+    results[f'storage.get_all_clients[{size}]'] = _per_call(
+        lambda: [manager.get_all_clients() for _ in range(100)], 100)
+
+    loaded = {}
+    def load():
+        # Time parsing from storage, not hits in the shared client cache
+        client_cache.clear()
+        for client_id in sample:
+            loaded[client_id] = manager.get_client(client_id)
+    results[f'storage.get_client[{size}]'] = _per_call(load, len(sample))
+    results[f'storage.save_client[{size}]'] = _per_call(
+        lambda: [manager.save_client(c) for c in loaded.values()], len(sample), repeat=1)
+    return results
+
+def build_book(books_dir, size, seed=0):
+    """Generate a book once; reused across runs when --books-dir is kept"""
+    book_dir = Path(books_dir) / f"book_{size}_{seed}"
+    if not (book_dir / f"client_{size - 1:06d}.json").exists():
+        shutil.rmtree(book_dir, ignore_errors=True)
+        generate_book(book_dir, size, seed)
+    return book_dir
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, threshold):
+    """Benchmarks slower than the baseline by more than threshold, as (name, old, new, ratio)"""
+    regressions = []
+    for name, seconds in results.items():
+        previous = baseline.get(name)
+        if previous and seconds / previous > 1 + threshold and seconds - previous > NOISE_FLOOR_SECONDS:
+            regressions.append((name, previous, seconds, seconds / previous))
+    return regressions
+
+def latest_results(results_dir, exclude=None):
+    """Most recent timestamped results file in results_dir, or None"""
+    files = sorted(p for p in Path(results_dir).glob("[0-9]*-[0-9]*.json") if p != exclude)
+    return files[-1] if files else None
+
+def run(sizes, books_dir=None, backend=None, seed=0):
+    keep_books = books_dir is not None
+    books_dir = Path(books_dir or tempfile.mkdtemp(prefix="bench_suite_"))
+    results = bench_compute(seed)
+    try:
+        for size in sizes:
+            print(f"  {size:,} clients...", flush=True)
+            results.update(bench_storage(build_book(books_dir, size, seed), size, backend, seed))
+    finally:
+        if not keep_books:
+            shutil.rmtree(books_dir, ignore_errors=True)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the core hot paths and flag regressions")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--books-dir", default=None, help="Keep generated books here and reuse them")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default=None, help="Storage backend (default: settings)")
+    parser.add_argument("--output", default=None, help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="Results file to compare against (default: previous run)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Flag benchmarks slower by more than this fraction")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.books_dir, args.backend)
+    output = Path(args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    baseline_path = Path(args.baseline) if args.baseline else latest_results(output.parent, exclude=output)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'sizes': args.sizes,
+            'results': results
+        }, f, indent=2)
+
+    baseline = {}
+    if baseline_path is not None:
+        with open(baseline_path, 'r') as f:
+            baseline = json.load(f)['results']
+    regressions = {name: ratio for name, _, _, ratio in compare(results, baseline, args.threshold)}
+
+    print(f"{'benchmark':<44}{'time':>14}{'baseline':>14}")
+    for name, seconds in results.items():
+        previous = baseline.get(name)
+        flag = f"  REGRESSION x{regressions[name]:.2f}" if name in regressions else ""
+        previous_text = f"{previous * 1000:11.3f} ms" if previous else f"{'-':>14}"
+        print(f"{name:<44}{seconds * 1000:11.3f} ms{previous_text}{flag}")
+    print(f"Results: {output}" + (f"  (compared with {baseline_path})" if baseline_path else ""))
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
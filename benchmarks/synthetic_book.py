@@ -0,0 +1,92 @@
+"""Generate synthetic client books from data/sample_client.json.
+
+Run from the repository root:
+    python -m benchmarks.synthetic_book OUTPUT_DIR --clients 10000
+"""
+import argparse
+import copy
+import json
+import random
+from pathlib import Path
+
+TEMPLATE_PATH = Path("data/sample_client.json")
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+               "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+               "Thomas", "Sarah", "Charles", "Karen", "Daniel", "Nancy", "Matthew", "Lisa"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+              "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White"]
+ACCOUNT_NAMES = {
+    "taxable": ["Brokerage Account", "Savings Account", "Money Market", "Joint Account", "CD Ladder"],
+    "tax_deferred": ["Traditional 401(k)", "Traditional IRA", "403(b)", "Rollover IRA", "SEP IRA"],
+    "tax_free": ["Roth IRA", "Roth 401(k)", "HSA", "529 Plan"],
+    "personal_property": ["Primary Residence", "Vehicles", "Vacation Home", "Collectibles"]
+}
+
+def load_template():
+    with open(TEMPLATE_PATH, 'r') as f:
+        return json.load(f)
+
+def synthetic_client(template, index, rng, min_assets=5, max_assets=40):
+    """One realistic client built from the template"""
+    client = copy.deepcopy(template)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    client_id = f"client_{index:06d}"
+    client['client_id'] = client_id
+
+    info = client['personal_info']
+    info['client_first_name'] = first
+    info['client_last_name'] = f"{last}{index}"
+    info['email'] = f"{first.lower()}.{last.lower()}{index}@example.com"
+    info['phone'] = f"555-{rng.randint(0, 9999):04d}"
+    info['client_dob'] = f"{rng.randint(1940, 1995)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    info['retirement_age'] = rng.choice([60, 62, 65, 67, 70])
+
+    assets = {category: [] for category in ACCOUNT_NAMES}
+    for _ in range(rng.randint(min_assets, max_assets)):
+        category = rng.choice(list(ACCOUNT_NAMES))
+        assets[category].append({
+            "name": f"{rng.choice(ACCOUNT_NAMES[category])} {len(assets[category]) + 1}",
+            "value": round(rng.lognormvariate(11.5, 1.2), 2),
+            "is_managed": rng.random() < 0.6,
+            "include_in_nest_egg": category != "personal_property"
+        })
+    client['assets'] = assets
+    client['asset_categories'] = list(ACCOUNT_NAMES)
+
+    client['projections'] = {
+        "inflation_rate": round(rng.uniform(2.0, 4.0), 1),
+        "investment_return": round(rng.uniform(4.0, 9.0), 1),
+        "retirement_expenses": float(rng.randrange(3000, 15000, 100)),
+        "life_expectancy": rng.randint(85, 100)
+    }
+    return client
+
+def synthetic_clients(count, seed=0, **kwargs):
+    """Yield count synthetic clients, reproducibly for a given seed"""
+    template = load_template()
+    rng = random.Random(seed)
+    for index in range(count):
+        yield synthetic_client(template, index, rng, **kwargs)
+
+def generate_book(output_dir, count, seed=0, **kwargs):
+    """Write a synthetic book as one JSON file per client, formatted like the app saves them"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for client in synthetic_clients(count, seed, **kwargs):
+        with open(output_dir / f"{client['client_id']}.json", 'w') as f:
+            json.dump(client, f, indent=4)
+    return output_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic client book")
+    parser.add_argument("output_dir")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate_book(args.output_dir, args.clients, args.seed)
+    print(f"Wrote {args.clients} clients to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Quarter-end report run over the book, fanned out across worker processes.
+
+Usage (from the repository root):
+    python bulk_reports.py [--filter PATTERN] [--workers N] [--force]
+
+Each worker compiles the report template once and shares rendered charts
+through the chart asset directory. Reports are written to the output
+directory as they finish; clients whose report is newer than their data
+are skipped, so an interrupted run can simply be started again. A manifest
+of successes and failures is written next to the reports.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import REPORT_SETTINGS
+from core.client_files import write_atomic
+from core.client_manager import ClientManager
+from utils.reports import get_report_template, render_report, report_path
+
+MANIFEST_NAME = "manifest.json"
+
+_worker_manager = None
+
+def _init_worker(clients_dir, backend):
+    """Create one ClientManager per worker process and compile the template up front"""
+    global _worker_manager
+    _worker_manager = ClientManager(clients_dir, backend)
+    get_report_template()
+
+def _render_client_job(job):
+    client_id, output_dir, asset_dir = job
+    start = time.perf_counter()
+    try:
+        client = _worker_manager.get_client(client_id)
+        if client is None:
+            return client_id, None, "Client file not found", time.perf_counter() - start
+        path = render_report(client, output_dir, asset_dir)
+        return client_id, str(path), None, time.perf_counter() - start
+    except Exception as e:
+        return client_id, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+def select_clients(client_manager, pattern=None):
+    """Client ids whose id or name matches a shell-style pattern (all clients if none)"""
+    selected = []
+    for summary in client_manager.get_all_clients():
+        if pattern is None or any(
+            fnmatch.fnmatch(value.lower(), pattern.lower())
+            for value in (summary['client_id'], summary.get('name', ''))
+        ):
+            selected.append(summary['client_id'])
+    return selected
+
+def report_is_current(client_manager, output_dir, client_id):
+    """True if the client's report was written after its data was last saved"""
+    try:
+        report_mtime = report_path(output_dir, client_id).stat().st_mtime
+    except FileNotFoundError:
+        return False
+    last_modified = client_manager.get_last_modified(client_id)
+    if last_modified is None:
+        return False
+    # last_modified has whole-second resolution; the save may be up to a second later
+    return report_mtime >= last_modified.timestamp() + 1
+
+def run_bulk_reports(clients_dir="data/clients", output_dir=None, pattern=None, workers=None,
+                     force=False, backend=None, on_result=None):
+    """Render a report for every selected client across a process pool and write a manifest"""
+    client_manager = ClientManager(clients_dir, backend)
+    output_dir = Path(output_dir or REPORT_SETTINGS['output_dir'])
+    asset_dir = REPORT_SETTINGS['asset_dir']
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    entries = {}
+    jobs = []
+    for client_id in select_clients(client_manager, pattern):
+        if not force and report_is_current(client_manager, output_dir, client_id):
+            entries[client_id] = {'status': 'skipped', 'path': str(report_path(output_dir, client_id))}
+        else:
+            jobs.append((client_id, str(output_dir), asset_dir))
+
+    failures = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(client_manager.clients_dir), backend)) as executor:
+            futures = [executor.submit(_render_client_job, job) for job in jobs]
+            for future in as_completed(futures):
+                client_id, path, error, seconds = future.result()
+                entry = {
+                    'status': 'failed' if error else 'rendered',
+                    'seconds': round(seconds, 3),
+                    'rendered_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }
+                if error:
+                    entry['error'] = error
+                    failures += 1
+                else:
+                    entry['path'] = path
+                entries[client_id] = entry
+                if on_result:
+                    on_result(client_id, entry)
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        'total': len(entries),
+        'rendered': len(jobs) - failures,
+        'skipped': len(entries) - len(jobs),
+        'failed': failures,
+        'workers': workers,
+        'elapsed': elapsed,
+        'reports_per_minute': (len(jobs) - failures) / elapsed * 60 if elapsed else 0.0
+    }
+    manifest = {
+        'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'filter': pattern,
+        **stats,
+        'clients': dict(sorted(entries.items()))
+    }
+    write_atomic(output_dir / MANIFEST_NAME, json.dumps(manifest, indent=2).encode())
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a report for every client in the book")
+    parser.add_argument("--clients-dir", default="data/clients")
+    parser.add_argument("--output", default=REPORT_SETTINGS['output_dir'])
+    parser.add_argument("--filter", default=None, help="Shell-style pattern matched against client id or name")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render reports that are already current")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default=None, help="Storage backend (default: settings)")
+    args = parser.parse_args()
+
+    def print_failure(client_id, entry):
+        if entry['status'] == 'failed':
+            print(f"  {client_id}: {entry['error']}")
+
+    stats = run_bulk_reports(args.clients_dir, args.output, args.filter, args.workers,
+                             args.force, args.backend, print_failure)
+    print(f"Clients: {stats['total']}  rendered: {stats['rendered']}  skipped: {stats['skipped']}  "
+          f"failed: {stats['failed']}")
+    print(f"Workers: {stats['workers']}  elapsed: {stats['elapsed']:.2f}s  "
+          f"({stats['reports_per_minute']:,.1f} reports/min)")
+    print(f"Manifest: {Path(args.output) / MANIFEST_NAME}")
+
+if __name__ == "__main__":
+    main()
@@ -51,3 +51,68 @@ DEFAULT_ASSET_CATEGORIES = {
     "tax_free": "Tax-Free Accounts",
     "personal_property": "Personal Property"
 }
+
+# Monte Carlo simulation defaults
+MONTE_CARLO_SETTINGS = {
+    "return_volatility": 12.0,   # annual standard deviation of returns (%)
+    "num_simulations": 10000,
+    "chunk_size": 10000,         # paths simulated per array batch
+    "percentiles": [5, 25, 50, 75, 95],
+    "histogram_bins": 4096,      # log-spaced balance bins per year
+    "seed": 42                   # fixed so charts don't jitter between reruns
+}
+
+# Sidebar client list
+CLIENTS_PER_PAGE = 25
+
+# Client storage backend: "json" (one file per client) or "sqlite"
+STORAGE_BACKEND = "json"
+
+# Client backups: each version is stored once (gzip, content-addressed),
+# as a delta against the previous version for up to max_delta_chain links
+BACKUP_SETTINGS = {
+    "max_delta_chain": 10,
+    "retention": {
+        "keep_last": 5,     # most recent versions, whatever their age
+        "hourly": 24,       # newest version in each of the last N hours
+        "daily": 14,
+        "weekly": 8,
+        "monthly": 12
+    }
+}
+
+# Process-wide cache of derived results (projections, simulations), shared by all sessions
+COMPUTE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Process-wide cache of parsed client sections; sessions read them through
+# read-only views and copy a section only when they edit it
+CLIENT_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Client reports: rendered in background threads; charts are cached as SVG
+# files under asset_dir so separate processes can reuse them. A finished
+# job's status is kept for job_ttl_seconds, long enough to download it
+REPORT_SETTINGS = {
+    "output_dir": "reports/generated_reports",
+    "asset_dir": "reports/.chart_cache",
+    "workers": 2,
+    "job_ttl_seconds": 3600
+}
+
+# Interactive charts: traces are decimated to about max_points (roughly one
+# point per screen pixel) and drawn with WebGL once a figure holds more than
+# webgl_threshold points
+CHART_SETTINGS = {
+    "max_points": 1500,
+    "webgl_threshold": 5000
+}
+
+# Rerun profiler: off unless enabled here or with EFIP_PROFILE=1. When on,
+# the sidebar shows the last `history` reruns and every rerun is appended
+# to a size-rotated JSON-lines log
+PROFILER_SETTINGS = {
+    "enabled": False,
+    "history": 20,
+    "log_path": "logs/profile.jsonl",
+    "log_max_bytes": 5 * 1024 * 1024,
+    "log_backups": 3
+}
@@ -0,0 +1,218 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from config.settings import BACKUP_SETTINGS
+from core.client_files import client_lock, write_atomic
+
+# backups/<client_id>/manifest.jsonl lists a client's versions (oldest first);
+# backups/.objects/<xx>/<hash>.json.gz holds each unique version exactly once
+OBJECTS_DIR = ".objects"
+MANIFEST_FILE = "manifest.jsonl"
+# Objects younger than this are never garbage-collected, so a backup that has
+# written its object but not yet its manifest entry is safe
+GC_GRACE_SECONDS = 3600
+
+RETENTION_PERIODS = {
+    'hourly': '%Y-%m-%d %H',
+    'daily': '%Y-%m-%d',
+    'weekly': '%G-W%V',
+    'monthly': '%Y-%m'
+}
+
+def content_hash(client_data):
+    """Hash of the canonical JSON form; equal documents share one backup object"""
+    canonical = json.dumps(client_data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def apply_retention(entries, retention, now=None):
+    """Return the manifest entries a grandfather-father-son policy keeps, oldest first"""
+    now = now or datetime.now()
+    newest_first = list(reversed(entries))
+    keep = {id(entry) for entry in newest_first[:retention.get('keep_last', 0)]}
+    for period, fmt in RETENTION_PERIODS.items():
+        limit = retention.get(period, 0)
+        seen = set()
+        for entry in newest_first:
+            if len(seen) >= limit:
+                break
+            created = datetime.fromisoformat(entry['created'])
+            if created > now:
+                continue
+            bucket = created.strftime(fmt)
+            if bucket not in seen:
+                seen.add(bucket)
+                keep.add(id(entry))
+    return [entry for entry in entries if id(entry) in keep]
+
+class BackupStore:
+    """Content-addressed, compressed client backups with a per-client manifest.
+
+    A backup identical to the client's latest version adds nothing; a new
+    version is stored as the sections that changed since the previous one,
+    with a full copy every max_delta_chain versions to bound restore cost.
+    Changes to a client's manifest hold its lock in backups/.locks, so
+    sessions and processes backing up or pruning it don't drop each other's
+    entries; garbage collection excludes backups for its whole pass.
+    """
+
+    def __init__(self, backup_dir, settings=None):
+        settings = settings or BACKUP_SETTINGS
+        self.backup_dir = Path(backup_dir)
+        self.objects_dir = self.backup_dir / OBJECTS_DIR
+        self.max_delta_chain = settings['max_delta_chain']
+        self.retention = settings['retention']
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest}.json.gz"
+
+    def _manifest_path(self, client_id):
+        return self.backup_dir / client_id / MANIFEST_FILE
+
+    def _manifest_lock(self, client_id):
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        return client_lock(self.backup_dir / client_id)
+
+    def _objects_lock(self, shared):
+        """Held shared while a backup stores or reuses objects, and exclusively for a whole
+        garbage collection pass, so an object can't be collected as a new entry starts using it"""
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        return client_lock(self.objects_dir, shared)
+
+    def _read_object(self, digest):
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return json.loads(f.read())
+
+    def _write_object(self, digest, payload):
+        path = self._object_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # mtime=0 keeps the compressed bytes a pure function of the content
+        data = gzip.compress(json.dumps(payload, separators=(',', ':')).encode(), mtime=0)
+        write_atomic(path, data)
+        return len(data)
+
+    def history(self, client_id):
+        """Manifest entries for a client, oldest first"""
+        try:
+            with open(self._manifest_path(client_id), 'r') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries
+
+    def load_version(self, digest):
+        """Rebuild a backed-up document by replaying its delta chain"""
+        chain = []
+        payload = self._read_object(digest)
+        while payload['type'] == 'delta':
+            chain.append(payload)
+            payload = self._read_object(payload['base'])
+        client_data = payload['document']
+        for delta in reversed(chain):
+            for section in delta['deleted']:
+                client_data.pop(section, None)
+            client_data.update(delta['sections'])
+        return client_data
+
+    def _store_version(self, digest, client_data, latest):
+        """Write the object for a new version; returns (depth, bytes written)"""
+        if self._object_path(digest).exists():
+            return self._read_object(digest).get('depth', 0), 0
+        payload = {'type': 'full', 'depth': 0, 'document': client_data}
+        if latest and latest.get('depth', 0) < self.max_delta_chain \
+                and self._object_path(latest['hash']).exists():
+            previous = self.load_version(latest['hash'])
+            delta = {
+                'type': 'delta',
+                'depth': latest.get('depth', 0) + 1,
+                'base': latest['hash'],
+                'sections': {k: v for k, v in client_data.items() if previous.get(k) != v},
+                'deleted': [k for k in previous if k not in client_data]
+            }
+            if len(json.dumps(delta)) < len(json.dumps(payload)):
+                payload = delta
+        return payload['depth'], self._write_object(digest, payload)
+
+    def backup(self, client_id, client_data, now=None):
+        """Record a version of a client; returns its manifest entry and whether it was new"""
+        now = now or datetime.now()
+        digest = content_hash(client_data)
+        with self._manifest_lock(client_id), self._objects_lock(shared=True):
+            entries = self.history(client_id)
+            latest = entries[-1] if entries else None
+            if latest and latest['hash'] == digest:
+                return latest, False
+            depth, stored_bytes = self._store_version(digest, client_data, latest)
+            entry = {
+                'hash': digest,
+                'created': now.isoformat(timespec='seconds'),
+                'depth': depth,
+                'stored_bytes': stored_bytes
+            }
+            manifest = self._manifest_path(client_id)
+            manifest.parent.mkdir(parents=True, exist_ok=True)
+            with open(manifest, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            return entry, True
+
+    def prune(self, client_id, now=None):
+        """Thin a client's manifest to the retention policy; returns entries removed.
+
+        Objects are left in place; collect_garbage() removes the unreferenced ones.
+        """
+        with self._manifest_lock(client_id):
+            entries = self.history(client_id)
+            kept = apply_retention(entries, self.retention, now)
+            if len(kept) < len(entries):
+                write_atomic(self._manifest_path(client_id),
+                             "".join(json.dumps(entry) + "\n" for entry in kept).encode())
+            return len(entries) - len(kept)
+
+    def discard(self, client_id):
+        """Forget a client's backup history; its objects go at the next collect_garbage()"""
+        with self._manifest_lock(client_id):
+            try:
+                os.remove(self._manifest_path(client_id))
+            except FileNotFoundError:
+                pass
+
+    def collect_garbage(self):
+        """Delete objects no manifest reaches, directly or as a delta base; returns bytes freed"""
+        if True:
+            return self._sweep(self._live_objects())
+
+    def _live_objects(self):
+        live = set()
+        for manifest in self.backup_dir.glob(f"*/{MANIFEST_FILE}"):
+            for entry in self.history(manifest.parent.name):
+                digest = entry['hash']
+                while digest not in live and self._object_path(digest).exists():
+                    live.add(digest)
+                    payload = self._read_object(digest)
+                    if payload['type'] != 'delta':
+                        break
+                    digest = payload['base']
+        return live
+
+    def _sweep(self, live):
+        cutoff = time.time() - GC_GRACE_SECONDS
+        freed = 0
+        for path in self.objects_dir.glob("*/*.json.gz"):
+            st = path.stat()
+            if path.name[:-len(".json.gz")] not in live and st.st_mtime < cutoff:
+                path.unlink()
+                freed += st.st_size
+        return freed
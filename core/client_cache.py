@@ -0,0 +1,216 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from config.settings import CLIENT_CACHE_MAX_BYTES
+
+# Measured average footprint of one parsed JSON value (key, object and container
+# slot); sizing every node with sys.getsizeof would cost more than the parse
+BYTES_PER_ITEM = 120
+
+READ_ONLY_MESSAGE = "Client sections are shared between sessions; use edit_section() for a private copy"
+
+def _read_only(*args, **kwargs):
+    raise TypeError(READ_ONLY_MESSAGE)
+
+class SharedDict(dict):
+    """Read-only dict held in the client cache; copying it yields a plain, editable dict"""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (thaw(self),))
+
+class SharedList(list):
+    """Read-only list held in the client cache; copying it yields a plain, editable list"""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (thaw(self),))
+
+def _share(value, counter):
+    if type(value) is dict:
+        counter[0] += len(value)
+        return SharedDict({k: _share(v, counter) for k, v in value.items()})
+    if type(value) is list:
+        counter[0] += len(value)
+        return SharedList([_share(v, counter) for v in value])
+    return value
+
+def share(value):
+    """(read-only deep copy of a parsed section, approximate bytes it holds)"""
+    counter = [1]
+    shared = _share(value, counter)
+    return shared, counter[0] * BYTES_PER_ITEM
+
+def thaw(value):
+    """Plain, editable deep copy of a shared section"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+def is_shared(value):
+    return isinstance(value, (SharedDict, SharedList))
+
+def content_digest(value):
+    """Hex digest of a section's content; a shared section can't change, so its digest is kept on it"""
+    digest = getattr(value, '_content_digest', None)
+    if digest is None:
+        digest = hashlib.sha256(json.dumps(value, separators=(',', ':'), sort_keys=True).encode()).hexdigest()
+        if is_shared(value):
+            value._content_digest = digest
+    return digest
+
+class ClientCache:
+    """Process-wide LRU of parsed client sections, bounded by an estimated memory size.
+
+    Every session reads the same read-only copy of a section instead of
+    parsing its own; sessions copy a section only when they edit it. Entries
+    are dropped by ClientManager when a client is saved or deleted.
+    """
+
+    def __init__(self, max_bytes=CLIENT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        # (storage, client_id) -> {'sections': {name: value}, 'sizes': {name: bytes}, 'complete': bool}
+        self._entries = OrderedDict()
+        # Bumped on every invalidation, so a load that raced a save is not cached
+        self._generations = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, storage, client_id):
+        return (id(storage), client_id)
+
+    def _store(self, key, generation, sections, sizes, complete):
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                return
+            entry = self._entries.pop(key, None)
+            if entry is not None and complete:
+                # A whole document replaces what was cached, keeping its section order
+                self._bytes -= sum(entry['sizes'].values())
+                entry = None
+            if entry is None:
+                entry = {'sections': {}, 'sizes': {}, 'complete': complete}
+            for name, value in sections.items():
+                self._bytes += sizes[name] - entry['sizes'].get(name, 0)
+                entry['sections'][name] = value
+                entry['sizes'][name] = sizes[name]
+            if sum(entry['sizes'].values()) > self.max_bytes:
+                self._bytes -= sum(entry['sizes'].values())
+                return
+            self._entries[key] = entry
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sum(evicted['sizes'].values())
+                self.evictions += 1
+
+    def sections(self, storage, client_id, names):
+        """Shared copies of the named sections, parsing only those not cached yet"""
+        key = self._key(storage, client_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            cached = entry['sections'] if entry else {}
+            found = {name: cached[name] for name in names if name in cached}
+            missing = [name for name in names if name not in cached]
+            if entry:
+                self._entries.move_to_end(key)
+            if missing:
+                self.misses += 1
+            else:
+                self.hits += 1
+            generation = self._generations.get(key, 0)
+        if missing:
+            loaded, sizes = {}, {}
+            for name, value in storage.load_sections(client_id, missing).items():
+                loaded[name], sizes[name] = share(value)
+            self._store(key, generation, loaded, sizes, complete=False)
+            found.update(loaded)
+        return found
+
+    def document(self, storage, client_id):
+        """Whole client as a plain dict of shared sections, or None if it doesn't exist"""
+        key = self._key(storage, client_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['complete']:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry['sections'])
+            self.misses += 1
+            generation = self._generations.get(key, 0)
+        client_data = storage.load(client_id)
+        if client_data is None:
+            return None
+        loaded, sizes = {}, {}
+        for name, value in client_data.items():
+            loaded[name], sizes[name] = share(value)
+        self._store(key, generation, loaded, sizes, complete=True)
+        return loaded
+
+    def validate(self, storage, client_id, revision):
+        """Forget a client's cached sections unless they were read at this stored revision,
+        e.g. because another process saved the client since"""
+        with self._lock:
+            entry = self._entries.get(self._key(storage, client_id))
+            if entry is None or entry['sections'].get('revision') == revision:
+                return
+        self.invalidate(storage, client_id)
+
+    def invalidate(self, storage, client_id, sections=None):
+        """Forget a client's cached sections (all of them if sections is None)"""
+        key = self._key(storage, client_id)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if sections is None:
+                del self._entries[key]
+                self._bytes -= sum(entry['sizes'].values())
+                return
+            for name in sections:
+                entry['sections'].pop(name, None)
+                self._bytes -= entry['sizes'].pop(name, 0)
+            # A section may have been added, so the entry no longer holds the whole client
+            entry['complete'] = False
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'clients': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+client_cache = ClientCache()
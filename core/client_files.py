@@ -0,0 +1,243 @@
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks (Windows): writers are only serialized within a process
+    fcntl = None
+
+# Section updates are appended to <client_id>.journal next to the base
+# <client_id>.json and folded back into the base file once the journal grows
+JOURNAL_SUFFIX = ".journal"
+COMPACT_MIN_BYTES = 64 * 1024
+# Per-client lock files live here; they are never deleted, so every process locks the same inode
+LOCK_DIR = ".locks"
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+# Every journal record starts with its section name, as append_sections writes it
+_record_section = re.compile(rb'\{"section": ?("(?:[^"\\]|\\.)*")')
+
+def journal_path(path):
+    return Path(path).with_suffix(JOURNAL_SUFFIX)
+
+@contextmanager
+def client_lock(path, shared=False):
+    """Cross-process advisory lock on a client file: shared for reads, exclusive for writes"""
+    if fcntl is None:
+        yield
+        return
+    path = Path(path)
+    lock_path = path.parent / LOCK_DIR / (path.stem + ".lock")
+    try:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    except FileNotFoundError:
+        lock_path.parent.mkdir(exist_ok=True)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+def write_atomic(path, data: bytes):
+    """Write a file via temp file + fsync + rename, so readers never see a partial file"""
+    path = Path(path)
+    # A unique temp name, so processes writing the same file never share one
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{os.urandom(8).hex()}.tmp")
+    try:
+        with open(temp_path, 'xb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(path.parent)
+
+def _fsync_directory(directory):
+    """Persist a rename; not supported on every platform"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def read_journal(path):
+    """Return the journal records for a client file, dropping a torn final line"""
+    try:
+        with open(journal_path(path), 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    records = []
+    for line in lines:
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            # A torn append from a crash; each append starts on a fresh line
+            continue
+    return records
+
+def read_journal_sections(path):
+    """Latest journal entry of each section, {section: data or None if deleted}, in journal order.
+
+    Only the newest record of a section is parsed; older ones are skipped
+    by their section name, so reads don't slow down as the journal grows.
+    """
+    try:
+        with open(journal_path(path), 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return {}
+    # Names stay raw JSON strings until a record is actually parsed
+    names = [match.group(1) if match else None for match in map(_record_section.match, lines)]
+    latest = {}
+    seen = set()
+    for line, name in zip(reversed(lines), reversed(names)):
+        if not line or name in seen:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A torn append from a crash; an older record of the section still counts
+            continue
+        if name is not None:
+            seen.add(name)
+        if record['section'] not in latest:
+            latest[record['section']] = None if record.get('deleted') else record['data']
+    order = [json.loads(name) for name in dict.fromkeys(names) if name is not None]
+    return {section: latest[section] for section in [*order, *latest] if section in latest}
+
+def apply_journal(client_data, records):
+    for record in records:
+        if record.get('deleted'):
+            client_data.pop(record['section'], None)
+        else:
+            client_data[record['section']] = record['data']
+    return client_data
+
+def read_document(path):
+    """Load a client document: the base file with its journal replayed on top"""
+    try:
+        with open(path, 'r') as f:
+            client_data = json.load(f)
+    except FileNotFoundError:
+        return None
+    return apply_journal(client_data, read_journal(path))
+
+def encode_document(client_data):
+    """Serialize exactly like json.dumps(indent=4), recording each section's byte span.
+
+    Returns (bytes, outline) where outline maps section -> [start, end, filled].
+    """
+    parts = ["{"]
+    outline = {}
+    position = 1
+    for i, (section, value) in enumerate(client_data.items()):
+        prefix = ("," if i else "") + "\n    " + json.dumps(section) + ": "
+        # Nested lines gain one indent level; JSON strings never hold raw newlines
+        body = json.dumps(value, indent=4).replace("\n", "\n    ")
+        position += len(prefix)
+        outline[section] = [position, position + len(body), bool(value)]
+        position += len(body)
+        parts += [prefix, body]
+    parts.append("\n}" if client_data else "}")
+    # ensure_ascii output, so character offsets are byte offsets
+    return "".join(parts).encode(), outline
+
+def scan_document(raw: bytes):
+    """Parse a client file of any formatting into (client_data, outline)"""
+    text = raw.decode('utf-8')
+    ascii_only = len(text) == len(raw)
+
+    def byte_offset(index):
+        return index if ascii_only else len(text[:index].encode())
+
+    def skip(index):
+        return _whitespace.match(text, index).end()
+
+    client_data = {}
+    outline = {}
+    index = skip(0)
+    if text[index:index + 1] != "{":
+        raise json.JSONDecodeError("Expecting '{'", text, index)
+    index = skip(index + 1)
+    if text[index:index + 1] == "}":
+        return client_data, outline
+    while True:
+        section, index = _decoder.raw_decode(text, index)
+        index = skip(index)
+        if text[index:index + 1] != ":":
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, index)
+        start = skip(index + 1)
+        value, index = _decoder.raw_decode(text, start)
+        client_data[section] = value
+        outline[section] = [byte_offset(start), byte_offset(index), bool(value)]
+        index = skip(index)
+        if text[index:index + 1] == "}":
+            return client_data, outline
+        if text[index:index + 1] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+        index = skip(index + 1)
+
+def write_document(path, client_data):
+    """Replace the whole document atomically and drop its journal; returns its outline"""
+    data, outline = encode_document(client_data)
+    write_atomic(path, data)
+    try:
+        os.remove(journal_path(path))
+    except FileNotFoundError:
+        pass
+    return outline
+
+def append_sections(path, sections, deleted=()):
+    """Durably append section replacements (and deletions) to the client's journal"""
+    lines = [json.dumps({'section': name, 'data': data}, separators=(',', ':')) for name, data in sections.items()]
+    lines += [json.dumps({'section': name, 'deleted': True}) for name in deleted]
+    with open(journal_path(path), 'ab') as f:
+        # Leading newline isolates this append from a torn previous one
+        f.write(("\n" + "\n".join(lines) + "\n").encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+def needs_compaction(path):
+    """True once the journal is past the minimum size and outweighs the base file"""
+    try:
+        journal_size = journal_path(path).stat().st_size
+    except FileNotFoundError:
+        return False
+    return journal_size >= COMPACT_MIN_BYTES and journal_size > Path(path).stat().st_size
+
+def compact(path):
+    """Fold the journal into the base file; returns the new outline"""
+    client_data = read_document(path)
+    if client_data is not None:
+        return write_document(path, client_data)
+    return None
+
+def document_stats(path):
+    """(mtime_ns, size) of the base file and its journal; a change to either means new content"""
+    stats = []
+    for p in (Path(path), journal_path(path)):
+        try:
+            st = p.stat()
+            stats.extend([st.st_mtime_ns, st.st_size])
+        except FileNotFoundError:
+            stats.extend([0, 0])
+    return tuple(stats)
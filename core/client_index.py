@@ -0,0 +1,218 @@
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from core.client_files import JOURNAL_SUFFIX, apply_journal, document_stats, read_journal, scan_document
+
+INDEX_FILE = ".client_index"
+INDEX_VERSION = 3
+# The on-disk index is only a cache validated by (mtime, size), so it is
+# written at most this often rather than on every save
+FLUSH_INTERVAL_SECONDS = 5
+# Files edited in place outside the app don't touch the directory mtime, so
+# every file is re-stat'ed at most this often; adds/removes are seen at once
+RESCAN_INTERVAL_SECONDS = 2
+
+SUMMARY_FIELDS = ('name', 'email', 'phone')
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_client_index(clients_dir):
+    """Return the process-wide index for a clients directory"""
+    key = str(Path(clients_dir).resolve())
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = ClientIndex(clients_dir)
+        return _indexes[key]
+
+def client_summary(client_data):
+    """Sidebar fields extracted from a full client document"""
+    personal_info = client_data.get('personal_info', {})
+    name = f"{personal_info.get('client_first_name', '')} {personal_info.get('client_last_name', '')}"
+    return {
+        'name': name.strip() or 'Unknown',
+        'email': personal_info.get('email', '') or '',
+        'phone': personal_info.get('phone', '') or ''
+    }
+
+class ClientIndex:
+    """Summary index of a clients directory, keyed by each file's (path, mtime, size).
+
+    The key covers both a client's base file and its section journal. The
+    in-memory copy is shared by every session in the process and backed by
+    a compact index file, so only files changed outside the app are re-read.
+    """
+
+    def __init__(self, clients_dir):
+        self.clients_dir = Path(clients_dir)
+        self.index_path = self.clients_dir / INDEX_FILE
+        self._lock = threading.RLock()
+        self._entries = self._load()
+        self._sorted = None
+        self._dirty = False
+        self._last_flush = 0.0
+        self._last_scan = None
+        self.revision = 0
+        # Bumped only when a searchable summary field changes, not on every save
+        self.summary_revision = 0
+        atexit.register(self.flush)
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                return index['entries']
+        except (json.JSONDecodeError, FileNotFoundError, KeyError):
+            pass
+        return {}
+
+    def _changed(self):
+        self._sorted = None
+        self._dirty = True
+        self.revision += 1
+
+    def _set_entry(self, client_id, entry):
+        previous = self._entries.get(client_id)
+        if previous is None or any(previous.get(k) != entry[k] for k in SUMMARY_FIELDS):
+            self.summary_revision += 1
+        self._entries[client_id] = entry
+        self._changed()
+
+    def _drop_entry(self, client_id):
+        if self._entries.pop(client_id, None) is not None:
+            self.summary_revision += 1
+            self._changed()
+
+    def _entry(self, client_id, path, stats, summary, outline):
+        modified_ns = max(stats[0], stats[2])
+        entry = {
+            'client_id': client_id,
+            **summary,
+            'last_modified': datetime.fromtimestamp(modified_ns / 1e9).strftime('%Y-%m-%d %H:%M:%S'),
+            'path': Path(path).name,
+            'stats': list(stats)
+        }
+        if outline is not None:
+            # Byte span of each section in the base file, valid while its (mtime, size) holds
+            entry['outline'] = outline
+            entry['outline_stats'] = list(stats[:2])
+        else:
+            previous = self._entries.get(client_id)
+            if previous and previous.get('outline_stats') == list(stats[:2]):
+                entry['outline'] = previous['outline']
+                entry['outline_stats'] = previous['outline_stats']
+        return entry
+
+    def refresh(self, force=False):
+        """Re-stat the directory and re-read only clients whose base file or journal changed"""
+        with self._lock:
+            dir_mtime = self.clients_dir.stat().st_mtime_ns
+            if (not force and self._last_scan is not None
+                    and self._last_scan[0] == dir_mtime
+                    and time.monotonic() - self._last_scan[1] < RESCAN_INTERVAL_SECONDS):
+                return
+            self._last_scan = (dir_mtime, time.monotonic())
+
+            files = {}
+            journals = {}
+            for dir_entry in os.scandir(self.clients_dir):
+                name = dir_entry.name
+                if name.endswith('.json') and dir_entry.is_file():
+                    files[name[:-len('.json')]] = dir_entry
+                elif name.endswith(JOURNAL_SUFFIX) and dir_entry.is_file():
+                    journals[name[:-len(JOURNAL_SUFFIX)]] = dir_entry
+
+            for client_id, dir_entry in files.items():
+                stat = dir_entry.stat()
+                journal = journals.get(client_id)
+                journal_stat = journal.stat() if journal else None
+                stats = [
+                    stat.st_mtime_ns, stat.st_size,
+                    journal_stat.st_mtime_ns if journal_stat else 0,
+                    journal_stat.st_size if journal_stat else 0
+                ]
+                cached = self._entries.get(client_id)
+                if cached and cached['stats'] == stats:
+                    continue
+                try:
+                    with open(dir_entry.path, 'rb') as f:
+                        client_data, outline = scan_document(f.read())
+                except (FileNotFoundError, UnicodeDecodeError, ValueError):
+                    self._drop_entry(client_id)
+                    continue
+                apply_journal(client_data, read_journal(dir_entry.path))
+                self._set_entry(client_id, self._entry(client_id, dir_entry.path, stats, client_summary(client_data), outline))
+
+            for client_id in set(self._entries) - set(files):
+                self._drop_entry(client_id)
+            self._maybe_flush()
+
+    def update(self, client_id, path, summary=None, outline=None):
+        """Record a client the app just wrote; summary=None keeps the previous name/email/phone"""
+        with self._lock:
+            if summary is None:
+                previous = self._entries.get(client_id, {})
+                summary = {k: previous.get(k, '') for k in SUMMARY_FIELDS}
+            self._set_entry(client_id, self._entry(client_id, path, document_stats(path), summary, outline))
+            self._maybe_flush()
+
+    def set_outline(self, client_id, base_stats, outline):
+        """Remember section spans found by scanning a base file with these (mtime, size)"""
+        with self._lock:
+            entry = self._entries.get(client_id)
+            if entry is not None:
+                entry['outline'] = outline
+                entry['outline_stats'] = list(base_stats)
+                self._dirty = True
+                self._maybe_flush()
+
+    def outline(self, client_id, base_stats):
+        """Section spans of a client's base file, if known for these (mtime, size)"""
+        entry = self._entries.get(client_id)
+        if entry and entry.get('outline_stats') == list(base_stats):
+            return entry['outline']
+        return None
+
+    def remove(self, client_id):
+        """Drop a deleted client"""
+        with self._lock:
+            self._drop_entry(client_id)
+            self._maybe_flush()
+
+    def get(self, client_id):
+        """Summary of one client, or None"""
+        return self._entries.get(client_id)
+
+    def summaries(self):
+        """All client summaries sorted by name"""
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self._entries.values(), key=lambda x: x['name'].lower())
+            return self._sorted
+
+    def _maybe_flush(self):
+        if self._dirty and time.monotonic() - self._last_flush >= FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """Write the index file atomically if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            temp_path = self.index_path.with_name(INDEX_FILE + ".tmp")
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump({'version': INDEX_VERSION, 'entries': self._entries}, f, separators=(',', ':'))
+                os.replace(temp_path, self.index_path)
+            except OSError:
+                return
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            if self._last_scan is not None:
+                # Our own index write bumps the directory mtime; don't rescan for it
+                self._last_scan = (self.clients_dir.stat().st_mtime_ns, self._last_scan[1])
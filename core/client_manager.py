@@ -0,0 +1,281 @@
+from pathlib import Path
+from datetime import datetime
+from config.settings import STORAGE_BACKEND
+from core.backups import BackupStore
+from core.client_cache import client_cache
+from core.client_search import get_search_index
+from core.conflicts import ConflictError
+from core.lazy_client import LazyClient
+from core.profiler import timed
+from core.save_queue import save_queue
+from core.storage import get_storage, section_digests, stored_revision
+
+class ClientManager:
+    """Client storage as seen by one session.
+
+    Every save is a compare-and-swap on the document's revision: it only
+    lands if the stored revision is still the one this manager last read or
+    wrote. A save overtaken by edits to other sections is rebased onto them;
+    one that overlaps raises ConflictError with both sides to merge.
+    """
+
+    def __init__(self, clients_dir="data/clients", backend=None):
+        self.clients_dir = Path(clients_dir)
+        self.clients_dir.mkdir(parents=True, exist_ok=True)
+        self.storage = get_storage(backend or STORAGE_BACKEND, self.clients_dir)
+        self.backups = BackupStore(self.clients_dir / "backups")
+        # client_id -> revision this manager last read or wrote
+        self._revisions = {}
+
+    @timed("ClientManager.get_all_clients")
+    def get_all_clients(self):
+        """Return a list of all clients with their basic info"""
+        return self.storage.list_clients()
+
+    @timed("ClientManager.search_clients")
+    def search_clients(self, query, page=0, page_size=25):
+        """Return (matching clients on the requested page, total matches)"""
+        self.storage.list_clients()
+        return get_search_index(self.storage.index).search(query, page, page_size)
+
+    @timed("ClientManager.get_last_modified")
+    def get_last_modified(self, client_id):
+        """Return when a client was last saved, or None"""
+        summary = self.storage.get_summary(client_id)
+        if summary is None:
+            return None
+        return datetime.strptime(summary['last_modified'], '%Y-%m-%d %H:%M:%S')
+
+    @timed("ClientManager.get_client")
+    def get_client(self, client_id):
+        """Load client data; its sections are shared and read-only (see edit_section)"""
+        # Read-your-writes: a queued save for this client lands before the load
+        if save_queue.is_pending(self, client_id):
+            save_queue.flush(self, client_id)
+        self._revalidate(client_id)
+        client_data = client_cache.document(self.storage, client_id)
+        if client_data is not None:
+            self._revisions[client_id] = stored_revision(client_data.get('revision'))
+        return client_data
+
+    @timed("ClientManager.open_client")
+    def open_client(self, client_id):
+        """Open a client for editing; sections are only read when first accessed"""
+        if save_queue.is_pending(self, client_id):
+            save_queue.flush(self, client_id)
+        outline = self.storage.outline(client_id)
+        if outline is None:
+            return None
+        self._revalidate(client_id)
+        client = LazyClient(self.storage, client_id, outline)
+        self._revisions[client_id] = stored_revision(client.get('revision'))
+        return client
+
+    def _revalidate(self, client_id):
+        """Drop cached sections of a client another process has saved since they were read"""
+        revision = self.storage.load_sections(client_id, ['revision']).get('revision')
+        client_cache.validate(self.storage, client_id, revision)
+
+    def _base_revision(self, client_id):
+        """Revision this manager expects to find stored, reading it if the client hasn't been opened"""
+        if client_id not in self._revisions:
+            revision = client_cache.sections(self.storage, client_id, ['revision']).get('revision')
+            if revision is None and self.storage.outline(client_id) is None:
+                return None
+            self._revisions[client_id] = stored_revision(revision)
+        return self._revisions[client_id]
+
+    @timed("ClientManager.save_client")
+    def save_client(self, client_data):
+        """Save client data to storage; only sections that changed are written"""
+        client_id = client_data.get('client_id')
+        if not client_id:
+            raise ValueError("Client ID is required")
+        
+        if isinstance(client_data, LazyClient):
+            changed, deleted = self._new_revision(client_data)
+            if changed or deleted:
+                if not self.update_client_sections(client_id, changed, deleted, client_data.base_digests(changed, deleted)):
+                    raise ValueError(f"Client {client_id} no longer exists")
+                client_data.mark_saved(changed, deleted)
+            return
+        self._new_revision(client_data)
+        self.write_client(client_data)
+
+    def _new_revision(self, client_data):
+        """Bump the document revision that derived results are cached under.
+
+        It moves past both the client's own revision and the stored one this
+        manager knows of. For a LazyClient, returns its (changed, deleted)
+        sections; it is only bumped if something changed.
+        """
+        if isinstance(client_data, LazyClient):
+            changed, deleted = client_data.changes()
+            if not changed and not deleted:
+                return changed, deleted
+        current = max(stored_revision(client_data.get('revision')), self._revisions.get(client_data['client_id'], 0))
+        client_data['revision'] = current + 1
+        if isinstance(client_data, LazyClient):
+            changed['revision'] = client_data['revision']
+            return changed, deleted
+        return None
+
+    @timed("ClientManager.write_client")
+    def write_client(self, client_data):
+        """Write a whole client whose revision is already set, if nobody else saved it since"""
+        client_id = client_data['client_id']
+        expected = self._revisions.get(client_id)
+        try:
+            self.storage.save(client_id, client_data, expected_revision=expected)
+        except ConflictError as error:
+            client_cache.invalidate(self.storage, client_id)
+            theirs = self.storage.load(client_id) or {}
+            self._describe_conflict(error, client_data, (), theirs, None)
+            if error.conflicting:
+                raise
+            client_data = {**client_data, 'revision': max(stored_revision(client_data.get('revision')), (error.current_revision or 0) + 1)}
+            self.storage.save(client_id, client_data, expected_revision=error.current_revision)
+        client_cache.invalidate(self.storage, client_id)
+        self._revisions[client_id] = stored_revision(client_data.get('revision'))
+
+    def _describe_conflict(self, error, sections, deleted, theirs, base):
+        """Fill in a ConflictError with the sections both sides changed.
+
+        base holds digests of our sections as they were before we edited them;
+        without it, any section whose stored value differs from ours conflicts.
+        """
+        ours = {section: value for section, value in sections.items() if section != 'revision'}
+        stored = section_digests(theirs)
+        conflicting = []
+        for section in [*ours, *deleted]:
+            if section in ours:
+                same = section in theirs and stored[section] == section_digests({section: ours[section]})[section]
+            else:
+                same = section not in theirs
+            # Both sides made the same change, or only we changed the section
+            if same or (base is not None and base.get(section) == stored.get(section)):
+                continue
+            conflicting.append(section)
+        error.ours = ours
+        error.deleted = set(deleted)
+        error.theirs = {section: theirs.get(section) for section in conflicting}
+        error.conflicting = conflicting
+
+    @timed("ClientManager.queue_save")
+    def queue_save(self, client_data):
+        """Save client data in the background; rapid saves of one client are coalesced"""
+        if not client_data.get('client_id'):
+            raise ValueError("Client ID is required")
+        if isinstance(client_data, LazyClient):
+            # Unloaded sections can't have changed, so only edited ones are queued
+            changed, deleted = self._new_revision(client_data)
+            if changed or deleted:
+                # Sections stay dirty until the write lands, so a failed save is retried with the next one
+                digests = section_digests(changed)
+                save_queue.enqueue_sections(self, client_data.client_id, changed, deleted,
+                                            client_data.base_digests(changed, deleted),
+                                            on_saved=lambda: client_data.mark_saved(changed, deleted, digests))
+            return
+        self._new_revision(client_data)
+        save_queue.enqueue_save(self, client_data)
+
+    def queue_section_update(self, client_id, section, data):
+        """Update one section in the background"""
+        save_queue.enqueue_section(self, client_id, section, data)
+
+    def save_status(self, client_id):
+        """Background save state for a client, or None if nothing was queued"""
+        return save_queue.status(self, client_id)
+
+    def save_conflict(self, client_id):
+        """The ConflictError of this manager's last background save of a client, if it was rejected"""
+        status = save_queue.status(self, client_id)
+        return status['conflict'] if status and status['state'] == 'conflict' else None
+
+    @timed("ClientManager.resolve_conflict")
+    def resolve_conflict(self, error, keep_mine=()):
+        """Save a merge: our version of the sections in keep_mine and of every section only we
+        changed, their version of the other conflicting sections"""
+        client_id = error.client_id
+        sections = {s: v for s, v in error.ours.items() if s not in error.conflicting or s in keep_mine}
+        deleted = [s for s in error.deleted if s not in error.conflicting or s in keep_mine]
+        save_queue.clear_status(self, client_id)
+        client_cache.invalidate(self.storage, client_id)
+        self._revisions[client_id] = error.current_revision
+        if error.current_revision is None:
+            # Deleted elsewhere; keeping our version recreates it
+            if keep_mine:
+                self.write_client({**error.ours, 'revision': error.expected_revision + 1})
+            return
+        if sections or deleted:
+            self.update_client_sections(client_id, sections, deleted)
+
+    @timed("ClientManager.delete_client")
+    def delete_client(self, client_id):
+        """Delete client from storage"""
+        save_queue.discard(self, client_id)
+        self._revisions.pop(client_id, None)
+        deleted = self.storage.delete(client_id)
+        client_cache.invalidate(self.storage, client_id)
+        return deleted
+
+    @timed("ClientManager.update_client_section")
+    def update_client_section(self, client_id, section, data):
+        """Update a specific section of client data, writing only that section"""
+        return self.update_client_sections(client_id, {section: data})
+
+    @timed("ClientManager.update_client_sections")
+    def update_client_sections(self, client_id, sections, deleted=(), base=None):
+        """Write several sections (and section deletions) of a client at once, if nobody else
+        saved it since; base holds digests of the sections before they were edited, so a save
+        overtaken only in other sections can be rebased and one of a stale section is refused"""
+        expected = self._base_revision(client_id)
+        if expected is None:
+            return False
+        if 'revision' not in sections:
+            sections = {**sections, 'revision': expected + 1}
+        # Edited sections are checked against their base too: after a rebase the expected
+        # revision is past changes to sections this session loaded before it
+        base = {section: digest for section, digest in (base or {}).items() if section != 'revision'}
+        try:
+            saved = self.storage.save_sections(client_id, sections, deleted, expected_revision=expected, base=base)
+        except ConflictError as error:
+            client_cache.invalidate(self.storage, client_id)
+            names = [section for section in [*sections, *deleted] if section != 'revision']
+            theirs = self.storage.load_sections(client_id, names)
+            self._describe_conflict(error, sections, deleted, theirs, base)
+            if error.conflicting or error.current_revision is None:
+                raise
+            sections = {**sections, 'revision': max(sections['revision'], error.current_revision + 1)}
+            saved = self.storage.save_sections(client_id, sections, deleted, expected_revision=error.current_revision, base=base)
+        client_cache.invalidate(self.storage, client_id, [*sections, *deleted])
+        self._revisions[client_id] = sections['revision']
+        return saved
+
+    @timed("ClientManager.backup_client_data")
+    def backup_client_data(self, client_id: str):
+        """Create a backup of client data"""
+        client_data = self.get_client(client_id)
+        if client_data:
+            self.backups.backup(client_id, client_data)
+            self.backups.prune(client_id)
+            return True
+        return False
+
+    @timed("ClientManager.list_backups")
+    def list_backups(self, client_id):
+        """Backed-up versions of a client, newest first"""
+        return list(reversed(self.backups.history(client_id)))
+
+    @timed("ClientManager.restore_backup")
+    def restore_backup(self, client_id, backup_hash):
+        """Replace a client with one of its backed-up versions"""
+        client_data = self.backups.load_version(backup_hash)
+        if client_data.get('client_id') != client_id:
+            raise ValueError(f"Backup {backup_hash[:12]} does not belong to client {client_id}")
+        # Keep the version being replaced restorable too
+        current = self.get_client(client_id)
+        if current:
+            self.backups.backup(client_id, current)
+        self.save_client(client_data)
+        return client_data
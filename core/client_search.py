@@ -0,0 +1,108 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from itertools import chain
+
+# Minimum share of a query word's trigrams an entry must contain to match fuzzily
+FUZZY_THRESHOLD = 0.5
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+
+_search_indexes = {}
+_search_lock = threading.Lock()
+
+def get_search_index(client_index):
+    """Return a search index for a ClientIndex, rebuilt only when summaries change"""
+    key = id(client_index)
+    with _search_lock:
+        cached = _search_indexes.get(key)
+        if cached is None or cached.revision != client_index.summary_revision:
+            cached = ClientSearchIndex(client_index.summaries(), client_index.summary_revision)
+            _search_indexes[key] = cached
+        return cached
+
+def _words(text):
+    return [w for w in re.split(r"[^a-z0-9@.+_-]+", text.lower()) if w]
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def searchable_tokens(entry):
+    """Tokens a client can be found by: name words, full name, ID, email and phone digits"""
+    name = entry.get('name', '').lower()
+    email = entry.get('email', '').lower()
+    tokens = set(_words(name))
+    tokens.add(name.replace(' ', ''))
+    tokens.add(entry['client_id'].lower())
+    if email:
+        tokens.add(email)
+        tokens.add(email.split('@')[0])
+    digits = re.sub(r"\D", "", entry.get('phone', ''))
+    if digits:
+        tokens.add(digits)
+    tokens.discard('')
+    return tokens
+
+class ClientSearchIndex:
+    """Prefix and trigram index over client name, client_id, email and phone.
+
+    Expects summaries sorted by name, as ClientIndex.summaries() returns them.
+    """
+
+    def __init__(self, summaries, revision=0):
+        self.revision = revision
+        self.entries = list(summaries)
+        self._trigrams = defaultdict(set)
+        prefix = []
+        for idx, entry in enumerate(self.entries):
+            for token in searchable_tokens(entry):
+                prefix.append((token, idx))
+                for trigram in _trigrams(token):
+                    self._trigrams[trigram].add(idx)
+        prefix.sort()
+        self._tokens = [token for token, _ in prefix]
+        self._token_ids = [idx for _, idx in prefix]
+
+    def _match_word(self, word):
+        """Best score per entry for one query word"""
+        lo = bisect_left(self._tokens, word)
+        hi = bisect_left(self._tokens, word + '\uffff', lo)
+        exact_hi = bisect_right(self._tokens, word, lo, hi)
+        scores = dict.fromkeys(self._token_ids[lo:hi], PREFIX_SCORE)
+        scores.update(dict.fromkeys(self._token_ids[lo:exact_hi], EXACT_SCORE))
+
+        if len(word) >= 3:
+            query_trigrams = _trigrams(word)
+            hits = Counter(chain.from_iterable(self._trigrams.get(t, ()) for t in query_trigrams))
+            for idx, count in hits.items():
+                similarity = count / len(query_trigrams)
+                if similarity >= FUZZY_THRESHOLD and similarity > scores.get(idx, 0):
+                    scores[idx] = similarity
+        return scores
+
+    def search(self, query, page=0, page_size=25):
+        """Return (entries on the requested page, total matches), best matches first"""
+        words = _words(query)
+        if not words:
+            matches = self.entries
+        else:
+            combined = None
+            for word in words:
+                # Digits typed with separators should still match the stored phone
+                if re.fullmatch(r"[\d().+-]+", word):
+                    word = re.sub(r"\D", "", word) or word
+                scores = self._match_word(word)
+                if combined is None:
+                    combined = scores
+                else:
+                    combined = {idx: combined[idx] + s for idx, s in scores.items() if idx in combined}
+                if not combined:
+                    break
+            # Entries are already in name order, so the index breaks ties alphabetically
+            ranked = sorted(combined, key=lambda idx: (-combined[idx], idx))
+            matches = [self.entries[idx] for idx in ranked]
+
+        start = page * page_size
+        return matches[start:start + page_size], len(matches)
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+from config.settings import COMPUTE_CACHE_MAX_BYTES
+
+def _numpy():
+    """numpy if anything has imported it yet; until then no value can be a numpy type"""
+    return sys.modules.get('numpy')
+
+def input_key(namespace, inputs):
+    """Canonical hash of a computation's inputs; 6 and 6.0 hash alike"""
+    np = _numpy()
+
+    def normalize(value):
+        if isinstance(value, Mapping):
+            return {str(k): normalize(v) for k, v in value.items()}
+        if np is not None and isinstance(value, np.ndarray):
+            # Hash the raw buffer; encoding large arrays as JSON would cost more than the lookup saves
+            data = np.ascontiguousarray(value, dtype=float)
+            return {'ndarray': hashlib.sha256(data.tobytes()).hexdigest(), 'shape': list(data.shape)}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        if isinstance(value, bool) or (np is not None and isinstance(value, np.bool_)):
+            return bool(value)
+        if isinstance(value, (int, float)) or (np is not None and isinstance(value, (np.integer, np.floating))):
+            return float(value)
+        return value
+    canonical = json.dumps([namespace, normalize(inputs)], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def freeze(value):
+    """Deep read-only copy: dicts become mappingproxies, lists tuples, arrays non-writeable"""
+    np = _numpy()
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if np is not None and isinstance(value, np.ndarray):
+        frozen = value.copy()
+        frozen.flags.writeable = False
+        return frozen
+    return value
+
+def estimate_size(value):
+    """Approximate memory held by a frozen result, in bytes"""
+    np = _numpy()
+    if isinstance(value, MappingProxyType):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if np is not None and isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + value.nbytes
+    return sys.getsizeof(value)
+
+class ComputeCache:
+    """Process-wide LRU of computed results, bounded by an estimated memory size.
+
+    Shared by every session on the server, so identical inputs are computed
+    once; results are frozen before they are stored, so no session can
+    change what another one reads.
+    """
+
+    def __init__(self, max_bytes=COMPUTE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        """Store a result and return its frozen form; size overrides the estimate for opaque objects"""
+        frozen = freeze(value)
+        size = estimate_size(frozen) if size is None else size
+        if size > self.max_bytes:
+            return frozen
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (frozen, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return frozen
+
+    def get_or_compute(self, namespace, inputs, compute, size_of=None):
+        """Return the cached result for these inputs, computing it on a miss"""
+        key = input_key(namespace, inputs)
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            result = self.put(key, result, size_of(result) if size_of else None)
+        return result
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+compute_cache = ComputeCache()
@@ -0,0 +1,33 @@
+class ConflictError(Exception):
+    """A save expected a revision of the client that is no longer the stored one.
+
+    ClientManager fills in the sections both writers changed: ours holds
+    every section the failed save would have written, theirs the stored
+    value of each conflicting one, so the two can be merged and saved again.
+    """
+
+    def __init__(self, client_id, expected_revision, current_revision):
+        super().__init__(
+            f"Client {client_id} was saved elsewhere (revision {current_revision}, expected {expected_revision})"
+        )
+        self.client_id = client_id
+        self.expected_revision = expected_revision
+        self.current_revision = current_revision
+        self.ours = {}
+        self.deleted = set()
+        self.theirs = {}
+        self.conflicting = []
+
+def field_changes(ours, theirs, path=""):
+    """(path, our value, their value) for every leaf where two section values differ"""
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        changes = []
+        for key in list(ours) + [k for k in theirs if k not in ours]:
+            changes += field_changes(ours.get(key), theirs.get(key), f"{path}.{key}" if path else str(key))
+        return changes
+    if isinstance(ours, list) and isinstance(theirs, list) and len(ours) == len(theirs):
+        changes = []
+        for i, (mine, other) in enumerate(zip(ours, theirs)):
+            changes += field_changes(mine, other, f"{path}[{i}]")
+        return changes
+    return [] if ours == theirs else [(path, ours, theirs)]
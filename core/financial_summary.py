@@ -0,0 +1,69 @@
+from core.client_cache import content_digest
+from core.compute_cache import compute_cache
+from core.lazy_client import section_filled
+
+# Sections counted towards profile completion, with their display names
+COMPLETION_SECTIONS = {
+    'Basic Info': 'personal_info',
+    'Assets': 'assets',
+    'Income': 'income',
+    'Expenses': 'expenses',
+    'Projections': 'projections'
+}
+
+def compute_financial_summary(client):
+    """All asset totals, category subtotals, net worth and completion in one pass over the assets"""
+    total_assets = 0.0
+    total_nest_egg = 0.0
+    total_managed = 0.0
+    managed_nest_egg = 0.0
+    categories = {}
+
+    for category, assets in client.get('assets', {}).items():
+        category_total = 0.0
+        category_nest_egg = 0.0
+        for asset in assets:
+            value = float(asset.get('value') or 0)
+            category_total += value
+            in_nest_egg = asset.get('include_in_nest_egg', True)
+            if in_nest_egg:
+                category_nest_egg += value
+            if asset.get('is_managed', False):
+                total_managed += value
+                if in_nest_egg:
+                    managed_nest_egg += value
+        categories[category] = {
+            'total': category_total,
+            'nest_egg': category_nest_egg,
+            'count': len(assets)
+        }
+        total_assets += category_total
+        total_nest_egg += category_nest_egg
+
+    # Liabilities are not tracked yet
+    total_liabilities = 0.0
+    completion = {name: section_filled(client, section) for name, section in COMPLETION_SECTIONS.items()}
+
+    return {
+        'total_assets': total_assets,
+        'total_nest_egg': total_nest_egg,
+        'total_managed': total_managed,
+        'total_unmanaged': total_assets - total_managed,
+        'managed_nest_egg': managed_nest_egg,
+        'unmanaged_nest_egg': total_nest_egg - managed_nest_egg,
+        'categories': categories,
+        'total_liabilities': total_liabilities,
+        'net_worth': total_assets - total_liabilities,
+        'completion': completion,
+        'completion_ratio': sum(completion.values()) / len(completion)
+    }
+
+def get_financial_summary(client):
+    """Read-only summary for a client, computed once per distinct set of assets and completed sections"""
+    # Keyed on content, not client_id and revision: revisions repeat across a deleted and
+    # recreated client, and two sessions can each save their own edits as the same revision
+    key = {
+        'assets': content_digest(client.get('assets', {})),
+        'completion': {name: section_filled(client, section) for name, section in COMPLETION_SECTIONS.items()}
+    }
+    return compute_cache.get_or_compute('financial_summary', key, lambda: compute_financial_summary(client))
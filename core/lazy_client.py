@@ -0,0 +1,143 @@
+import copy
+from collections.abc import MutableMapping
+from core.client_cache import client_cache, is_shared, thaw
+from core.storage import section_digests
+
+def section_filled(client, section):
+    """True if a client section holds data, without loading it for a LazyClient"""
+    if isinstance(client, LazyClient):
+        return client.is_filled(section)
+    return bool(client.get(section))
+
+def edit_section(client, section):
+    """A section this client owns and may modify in place, copied from the shared cache if needed"""
+    if isinstance(client, LazyClient):
+        return client.edit(section)
+    value = client[section]
+    if is_shared(value):
+        value = client[section] = thaw(value)
+    return value
+
+class LazyClient(MutableMapping):
+    """Client document whose top-level sections are read from storage on first access.
+
+    Behaves like the plain dict the section renderers expect, so a tab only
+    parses the sections it actually touches. Loaded sections are the
+    read-only copies in the process-wide client cache, shared with every
+    other session; edit() swaps in a private copy before a section is changed.
+    """
+
+    def __init__(self, storage, client_id, outline):
+        self.storage = storage
+        self.client_id = client_id
+        # section -> whether it holds data, in document order
+        self._outline = dict(outline)
+        self._sections = {}
+        # Digests of sections as loaded (taken when first edited) or last saved, to find the edited ones
+        self._digests = {}
+        self._deleted = set()
+        # Sections this session has replaced or copied for editing
+        self._private = set()
+        if 'client_id' in self._outline:
+            self._sections['client_id'] = client_id
+            self._digests.update(section_digests({'client_id': client_id}))
+
+    def __getitem__(self, section):
+        if section not in self._sections:
+            if section not in self._outline:
+                raise KeyError(section)
+            loaded = client_cache.sections(self.storage, self.client_id, [section])
+            if section not in loaded:
+                raise KeyError(section)
+            self._sections[section] = loaded[section]
+        return self._sections[section]
+
+    def __setitem__(self, section, value):
+        self._remember_loaded(section)
+        self._sections[section] = value
+        self._outline[section] = bool(value)
+        self._deleted.discard(section)
+        self._private.add(section)
+
+    def __delitem__(self, section):
+        if section not in self._outline:
+            raise KeyError(section)
+        del self._outline[section]
+        self._sections.pop(section, None)
+        self._digests.pop(section, None)
+        self._deleted.add(section)
+        self._private.discard(section)
+
+    def __contains__(self, section):
+        return section in self._outline
+
+    def __iter__(self):
+        return iter(self._outline)
+
+    def __len__(self):
+        return len(self._outline)
+
+    def __repr__(self):
+        return f"LazyClient({self.client_id!r}, loaded={sorted(self._sections)})"
+
+    def __deepcopy__(self, memo):
+        clone = LazyClient.__new__(LazyClient)
+        clone.storage = self.storage
+        clone.client_id = self.client_id
+        clone._outline = dict(self._outline)
+        # Shared sections are read-only, so only private ones need copying
+        clone._sections = {
+            section: copy.deepcopy(value, memo) if section in self._private else value
+            for section, value in self._sections.items()
+        }
+        clone._digests = dict(self._digests)
+        clone._deleted = set(self._deleted)
+        clone._private = set(self._private)
+        return clone
+
+    def _remember_loaded(self, section):
+        """Digest a shared section before it is replaced, so an unchanged save writes nothing"""
+        if section in self._sections and section not in self._private and section not in self._digests:
+            self._digests.update(section_digests({section: self._sections[section]}))
+
+    def edit(self, section):
+        """This session's own copy of a section, safe to modify in place"""
+        value = self[section]
+        if section not in self._private:
+            self._remember_loaded(section)
+            value = self._sections[section] = thaw(value)
+            self._private.add(section)
+        return value
+
+    def is_filled(self, section):
+        if section in self._sections:
+            return bool(self._sections[section])
+        return self._outline.get(section, False)
+
+    def loaded_sections(self):
+        """Names of the sections parsed so far"""
+        return list(self._sections)
+
+    def changes(self):
+        """(sections edited since they were loaded or saved, sections deleted)"""
+        # Shared sections are read-only, so only private ones can have changed
+        digests = section_digests({section: self._sections[section] for section in self._private})
+        changed = {
+            section: self._sections[section]
+            for section, digest in digests.items()
+            if self._digests.get(section) != digest
+        }
+        return changed, set(self._deleted)
+
+    def base_digests(self, changed, deleted=()):
+        """Digests of the given sections as loaded or last saved, before this session's edits"""
+        return {section: self._digests.get(section) for section in [*changed, *deleted]}
+
+    def mark_saved(self, changed, deleted, digests=None):
+        """Record sections as saved; digests are of the values as written, if they were taken before a later edit"""
+        self._digests.update(digests or section_digests(changed))
+        self._deleted.difference_update(deleted)
+
+    def to_dict(self):
+        """Load every section and return a plain dict"""
+        return {section: self[section] for section in self}
@@ -0,0 +1,143 @@
+import numpy as np
+from datetime import date
+from typing import Dict, Optional, Sequence
+from config.settings import MONTE_CARLO_SETTINGS
+from core.age_calculator import calculate_age
+from core.compute_cache import compute_cache
+from core.financial_summary import get_financial_summary
+
+# Balance histogram range in log10 dollars; balances at or below $1 count as depleted
+LOG_BALANCE_MIN = 0.0
+LOG_BALANCE_MAX = 12.0
+
+def simulation_inputs_from_client(client: Dict) -> Dict:
+    """Collect Monte Carlo inputs from the saved projection settings and client profile"""
+    projections = client.get('projections', {})
+    personal_info = client.get('personal_info', {})
+
+    current_age = calculate_age(personal_info.get('client_dob', ''))
+    if personal_info.get('is_retired'):
+        retirement_age = current_age
+    else:
+        retirement_age = int(personal_info.get('retirement_age') or 65)
+
+    nest_egg = get_financial_summary(client)['total_nest_egg']
+
+    return {
+        'starting_balance': nest_egg,
+        'current_age': current_age,
+        'retirement_age': retirement_age,
+        'life_expectancy': int(projections.get('life_expectancy', 90)),
+        'investment_return': float(projections.get('investment_return', 7.0)),
+        'return_volatility': float(projections.get('return_volatility', MONTE_CARLO_SETTINGS['return_volatility'])),
+        'inflation_rate': float(projections.get('inflation_rate', 3.0)),
+        'annual_spending': float(projections.get('retirement_expenses', 0)) * 12
+    }
+
+def _lognormal_params(mean_return: float, volatility: float):
+    """Log-space mean and sigma of gross returns with the given arithmetic mean and volatility"""
+    gross_mean = 1 + mean_return / 100
+    sigma_sq = np.log(1 + (volatility / 100) ** 2 / gross_mean ** 2)
+    return np.log(gross_mean) - sigma_sq / 2, np.sqrt(sigma_sq)
+
+def _simulate_chunk(rng, paths: int, inputs: Dict, withdrawals: np.ndarray) -> np.ndarray:
+    """Simulate one chunk of return paths and return the (paths x years + 1) balance matrix"""
+    years = withdrawals.size
+    mu, sigma = _lognormal_params(inputs['investment_return'], inputs['return_volatility'])
+
+    growth = np.exp(mu + sigma * rng.standard_normal((paths, years)))
+    cumulative_growth = np.cumprod(growth, axis=1)
+
+    # Balance after year k: G_k * (b0 - sum_{j<=k} w_j / G_j); once a path hits zero it stays there
+    balances = np.empty((paths, years + 1))
+    balances[:, 0] = inputs['starting_balance']
+    balances[:, 1:] = cumulative_growth * (
+        inputs['starting_balance'] - np.cumsum(withdrawals / cumulative_growth, axis=1)
+    )
+    solvent = np.logical_and.accumulate(balances > 0, axis=1)
+    balances[~solvent] = 0.0
+    return balances
+
+def _bin_index(balances: np.ndarray, bins: int) -> np.ndarray:
+    """Map balances to histogram bins: 0 is depleted, 1..bins are log-spaced"""
+    with np.errstate(divide='ignore'):
+        log_balance = np.log10(np.maximum(balances, 1e-300))
+    scaled = (log_balance - LOG_BALANCE_MIN) / (LOG_BALANCE_MAX - LOG_BALANCE_MIN) * bins
+    index = np.clip(np.floor(scaled).astype(np.int64) + 1, 1, bins)
+    index[balances <= 10 ** LOG_BALANCE_MIN] = 0
+    return index
+
+def _histogram_percentiles(counts: np.ndarray, percentiles: Sequence[float], bins: int) -> Dict:
+    """Read percentiles off per-year histograms, interpolating in log space within a bin"""
+    cumulative = np.cumsum(counts, axis=1)
+    total = cumulative[:, -1:]
+    bin_width = (LOG_BALANCE_MAX - LOG_BALANCE_MIN) / bins
+    result = {}
+    for p in percentiles:
+        target = total[:, 0] * p / 100
+        index = np.array([np.searchsorted(row, t) for row, t in zip(cumulative, target)])
+        index = np.minimum(index, bins)
+        rows = np.arange(len(index))
+        below = np.where(index > 0, cumulative[rows, np.maximum(index - 1, 0)], 0)
+        in_bin = np.maximum(counts[rows, index], 1)
+        fraction = np.clip((target - below) / in_bin, 0, 1)
+        log_value = LOG_BALANCE_MIN + (index - 1 + fraction) * bin_width
+        result[p] = np.where(index == 0, 0.0, 10 ** log_value).tolist()
+    return result
+
+def run_simulation(
+    inputs: Dict,
+    num_paths: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    seed: Optional[int] = None,
+    percentiles: Optional[Sequence[float]] = None
+) -> Dict:
+    """Simulate retirement outcomes and return percentile bands and probability of success.
+
+    Paths are generated chunk_size at a time and folded into per-year
+    histograms, so memory depends on the chunk size, not the path count.
+    The same seed and chunk size always reproduce the same result.
+    """
+    num_paths = num_paths or MONTE_CARLO_SETTINGS['num_simulations']
+    chunk_size = chunk_size or MONTE_CARLO_SETTINGS['chunk_size']
+    percentiles = percentiles or MONTE_CARLO_SETTINGS['percentiles']
+    bins = MONTE_CARLO_SETTINGS['histogram_bins']
+
+    years = max(inputs['life_expectancy'] - inputs['current_age'], 0)
+    offsets = np.arange(years)
+    withdrawals = np.where(
+        offsets >= inputs['retirement_age'] - inputs['current_age'],
+        inputs['annual_spending'] * (1 + inputs['inflation_rate'] / 100) ** offsets,
+        0.0
+    )
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((years + 1, bins + 1), dtype=np.int64)
+    row_offsets = (np.arange(years + 1) * (bins + 1))[None, :]
+    successes = 0
+
+    for start in range(0, num_paths, chunk_size):
+        paths = min(chunk_size, num_paths - start)
+        balances = _simulate_chunk(rng, paths, inputs, withdrawals)
+        successes += int(np.count_nonzero(balances[:, -1] > 0))
+        flat = (_bin_index(balances, bins) + row_offsets).ravel()
+        counts += np.bincount(flat, minlength=counts.size).reshape(counts.shape)
+
+    return {
+        'ages': list(range(inputs['current_age'], inputs['current_age'] + years + 1)),
+        'years': list(range(date.today().year, date.today().year + years + 1)),
+        'percentiles': _histogram_percentiles(counts, percentiles, bins),
+        'success_probability': successes / num_paths if num_paths else 0.0,
+        'num_paths': num_paths
+    }
+
+def cached_simulation(inputs: Dict, seed: Optional[int] = None) -> Dict:
+    """run_simulation with default path settings through the shared compute cache"""
+    key_inputs = {
+        **inputs,
+        'seed': seed,
+        'settings': MONTE_CARLO_SETTINGS,
+        # Result years are calendar years, so a new year is a new result
+        'year': date.today().year
+    }
+    return compute_cache.get_or_compute('monte_carlo', key_inputs, lambda: run_simulation(inputs, seed=seed))
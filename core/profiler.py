@@ -0,0 +1,143 @@
+import functools
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from config.settings import PROFILER_SETTINGS
+
+# The rerun being recorded on this script thread, or None
+_current_run = ContextVar('profiler_run', default=None)
+_log = None
+
+def profiling_enabled():
+    return PROFILER_SETTINGS['enabled'] or os.environ.get("EFIP_PROFILE") == "1"
+
+def _thread_io():
+    """Bytes read and written by the calling thread so far, or None where /proc is unavailable"""
+    try:
+        with open("/proc/thread-self/io", 'rb') as f:
+            counters = dict(line.split(b": ") for line in f.read().splitlines())
+        return int(counters[b'rchar']), int(counters[b'wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _profile_log():
+    """JSON-lines log of every recorded rerun, rotated by size"""
+    global _log
+    if _log is None:
+        # Only needed once profiling is on; logging.handlers alone costs ~10 ms of import time
+        import logging
+        from logging.handlers import RotatingFileHandler
+        path = Path(PROFILER_SETTINGS['log_path'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _log = logging.getLogger("efip.profiler")
+        _log.propagate = False
+        _log.setLevel(logging.INFO)
+        handler = RotatingFileHandler(
+            path, maxBytes=PROFILER_SETTINGS['log_max_bytes'], backupCount=PROFILER_SETTINGS['log_backups']
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _log.addHandler(handler)
+    return _log
+
+@contextmanager
+def span(name):
+    """Add the time spent in this block to the current rerun under name"""
+    run = _current_run.get()
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = run['spans'].setdefault(name, [0, 0.0])
+        stats[0] += 1
+        stats[1] += time.perf_counter() - start
+
+def timed(name):
+    """Decorator: record calls and time of a function while a rerun is being profiled.
+
+    With profiling off, a call costs one context variable lookup on top of
+    the function itself.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = _current_run.get()
+            if run is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats = run['spans'].setdefault(name, [0, 0.0])
+                stats[0] += 1
+                stats[1] += time.perf_counter() - start
+        return wrapper
+    return decorator
+
+@contextmanager
+def profile_rerun(entry, history=None):
+    """Record one rerun (a full script run or a fragment run) starting at entry.
+
+    Inside an already-recorded rerun this is just a span. The finished
+    record is appended to history (if given) and to the JSON-lines log.
+    Bytes read and written are those of the script thread; queued saves
+    are written later by the save-queue thread and are not included.
+    """
+    if _current_run.get() is not None:
+        with span(entry):
+            yield
+        return
+    if not profiling_enabled():
+        yield
+        return
+
+    run = {
+        'started': datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+        'entry': entry,
+        'spans': {}
+    }
+    io_before = _thread_io()
+    token = _current_run.set(run)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run['seconds'] = time.perf_counter() - start
+        _current_run.reset(token)
+        io_after = _thread_io()
+        if io_before and io_after:
+            run['bytes_read'] = io_after[0] - io_before[0]
+            run['bytes_written'] = io_after[1] - io_before[1]
+        run['spans'] = {
+            name: {'calls': calls, 'seconds': seconds}
+            for name, (calls, seconds) in sorted(run['spans'].items(), key=lambda item: -item[1][1])
+        }
+        if history is not None:
+            history.append(run)
+        _profile_log().info(json.dumps(run))
+
+def new_history():
+    """Per-session list of the most recent reruns"""
+    return deque(maxlen=PROFILER_SETTINGS['history'])
+
+def profiled_entry(name, history_of=None):
+    """Decorator for rerun entry points (app.main, fragments): profile the call as a rerun.
+
+    history_of is called at run time to get the session's rerun history.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_run.get() is None and not profiling_enabled():
+                return func(*args, **kwargs)
+            with profile_rerun(name, history_of() if history_of else None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
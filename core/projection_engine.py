@@ -0,0 +1,189 @@
+import numpy as np
+from typing import Dict, List, Sequence, Optional
+from core.compute_cache import compute_cache, input_key
+
+SCENARIO_FIELDS = (
+    'starting_balance',
+    'current_age',
+    'retirement_age',
+    'final_age',
+    'annual_contribution',
+    'growth_rate',
+    'inflation_rate',
+)
+
+def scenario_arrays(scenarios: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """Pack a batch of scenario dicts into one float array per input field"""
+    arrays = {
+        field: np.array([float(s.get(field, 0) or 0) for s in scenarios], dtype=float)
+        for field in SCENARIO_FIELDS
+    }
+    for field in ('current_age', 'retirement_age', 'final_age'):
+        arrays[field] = arrays[field].astype(int)
+    return arrays
+
+def cash_flow_matrix(arrays: Dict[str, np.ndarray], retirement_spending: np.ndarray):
+    """Build the (scenarios x steps) growth factor and cash flow inputs of the projection"""
+    steps = np.maximum(arrays['final_age'] - arrays['current_age'], 0)
+    max_steps = int(steps.max()) if steps.size else 0
+    step_idx = np.arange(max_steps)
+
+    growth = 1 + arrays['growth_rate'] / 100
+    inflation = 1 + arrays['inflation_rate'] / 100
+    working_years = (arrays['retirement_age'] - arrays['current_age'])[:, None]
+
+    # Same sign convention as the original loop: contribute before retirement,
+    # withdraw inflation-adjusted spending (indexed from the first projection year) after
+    spending = retirement_spending[:, None] * inflation[:, None] ** step_idx
+    cash_flows = np.where(
+        step_idx < working_years,
+        arrays['annual_contribution'][:, None],
+        -spending
+    )
+    cash_flows[step_idx >= steps[:, None]] = 0.0
+    return growth, cash_flows, steps
+
+def project_balances(scenarios: Sequence[Dict], retirement_spending: Optional[Sequence[float]] = None):
+    """Project every scenario at once and return (steps, balances).
+
+    balances is a (scenarios x max_years) array; entries past a scenario's
+    final age are NaN. Growth rates must be above -100%.
+    """
+    arrays = scenario_arrays(scenarios)
+    if retirement_spending is None:
+        retirement_spending = [s.get('retirement_spending', 0) for s in scenarios]
+    spending = np.asarray(retirement_spending, dtype=float).reshape(len(scenarios))
+
+    growth, cash_flows, steps = cash_flow_matrix(arrays, spending)
+    max_steps = cash_flows.shape[1]
+
+    # b[k] = g^k * (b0 + sum_{j<k} c[j] / g^(j+1)), evaluated with one cumsum per batch
+    exponents = np.arange(max_steps + 1)
+    growth_powers = growth[:, None] ** exponents
+    discounted = np.cumsum(cash_flows / growth_powers[:, 1:], axis=1)
+    balances = np.empty((len(scenarios), max_steps + 1))
+    balances[:, 0] = arrays['starting_balance']
+    balances[:, 1:] = growth_powers[:, 1:] * (arrays['starting_balance'][:, None] + discounted)
+    balances[exponents[None, :] > steps[:, None]] = np.nan
+    return steps, balances
+
+def project_scenarios(scenarios: Sequence[Dict], retirement_spending: Optional[Sequence[float]] = None) -> List[Dict]:
+    """Project a batch of scenarios, returning one years/balances/final_balance dict each"""
+    if not scenarios:
+        return []
+    steps, balances = project_balances(scenarios, retirement_spending)
+    results = []
+    for scenario, n, row in zip(scenarios, steps, balances):
+        path = row[:n + 1].tolist()
+        results.append({
+            'years': list(range(int(scenario['current_age']), int(scenario['current_age']) + n + 1)),
+            'balances': path,
+            'final_balance': path[-1]
+        })
+    return results
+
+def max_spending_closed_form(scenarios: Sequence[Dict]) -> np.ndarray:
+    """Solve final_balance == 0 for retirement spending as a growing annuity.
+
+    With no path-dependent cash flows the final balance is linear in spending,
+    F(s) = A - s * B, so the sustainable spending is A / B. Results are clipped
+    to [0, starting_balance], the search range of the original bisection.
+    Entries that cannot be evaluated in floating point come back as NaN.
+    """
+    arrays = scenario_arrays(scenarios)
+    n = np.maximum(arrays['final_age'] - arrays['current_age'], 0).astype(float)
+    contribution_years = np.clip(arrays['retirement_age'] - arrays['current_age'], 0, n)
+    growth = 1 + arrays['growth_rate'] / 100
+    inflation = 1 + arrays['inflation_rate'] / 100
+    balance = arrays['starting_balance']
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Future value of the starting balance plus the level contribution annuity
+        flat_growth = np.isclose(growth, 1.0)
+        contribution_fv = np.where(
+            flat_growth,
+            contribution_years,
+            growth ** (n - contribution_years) * (growth ** contribution_years - 1) / np.where(flat_growth, 1.0, growth - 1)
+        )
+        assets_fv = growth ** n * balance + arrays['annual_contribution'] * contribution_fv
+
+        # Future value of one dollar of spending, inflated from year 0 and withdrawn
+        # in every year from retirement to the final age (growing annuity)
+        ratio = inflation / growth
+        flat_ratio = np.isclose(ratio, 1.0)
+        spending_fv = growth ** (n - 1) * np.where(
+            flat_ratio,
+            n - contribution_years,
+            (ratio ** contribution_years - ratio ** n) / np.where(flat_ratio, 1.0, 1 - ratio)
+        )
+
+        max_spend = np.where(
+            spending_fv > 0,
+            assets_fv / np.where(spending_fv > 0, spending_fv, 1.0),
+            np.where(assets_fv > 0, balance, 0.0)
+        )
+    max_spend = np.clip(max_spend, 0.0, np.maximum(balance, 0.0))
+    max_spend[~np.isfinite(assets_fv) | ~np.isfinite(spending_fv)] = np.nan
+    return max_spend
+
+def max_spending_root_find(scenarios: Sequence[Dict], tolerance: float = 0.01, max_iterations: int = 200) -> np.ndarray:
+    """Bisect every scenario at once for the largest spending that keeps the final balance above $0"""
+    lower = np.zeros(len(scenarios))
+    upper = np.maximum(np.array([float(s['starting_balance']) for s in scenarios]), 0.0)
+    for _ in range(max_iterations):
+        active = (upper - lower) > tolerance
+        if not active.any():
+            break
+        mid = (upper + lower) / 2
+        steps, balances = project_balances(scenarios, mid)
+        final = balances[np.arange(len(scenarios)), steps]
+        solvent = final > 0
+        lower = np.where(active & solvent, mid, lower)
+        upper = np.where(active & ~solvent, mid, upper)
+    return lower
+
+def solve_max_spending(scenarios: Sequence[Dict]) -> np.ndarray:
+    """Maximum sustainable spending for a batch of scenarios.
+
+    Uses the closed form and falls back to the batched root finder only for
+    the scenarios the closed form could not evaluate.
+    """
+    if not scenarios:
+        return np.zeros(0)
+    result = max_spending_closed_form(scenarios)
+    fallback = np.flatnonzero(np.isnan(result))
+    if fallback.size:
+        result[fallback] = max_spending_root_find([scenarios[i] for i in fallback])
+    return result
+
+def projection_inputs(scenario: Dict, retirement_spending: Optional[float] = None) -> Dict:
+    """The numeric inputs a projection depends on, used as its cache key"""
+    inputs = {field: scenario.get(field, 0) or 0 for field in SCENARIO_FIELDS}
+    if retirement_spending is None:
+        retirement_spending = scenario.get('retirement_spending', 0) or 0
+    inputs['retirement_spending'] = retirement_spending
+    return inputs
+
+def cached_project_scenarios(scenarios: Sequence[Dict], retirement_spending: Optional[Sequence[float]] = None) -> List:
+    """project_scenarios through the shared compute cache; results are read-only.
+
+    Only the scenarios whose inputs were never seen before are projected,
+    together in one batch.
+    """
+    spending = retirement_spending if retirement_spending is not None else [None] * len(scenarios)
+    keys = [input_key('projection', projection_inputs(s, spend)) for s, spend in zip(scenarios, spending)]
+    results = [compute_cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        computed = project_scenarios(
+            [scenarios[i] for i in missing],
+            None if retirement_spending is None else [retirement_spending[i] for i in missing]
+        )
+        for i, result in zip(missing, computed):
+            results[i] = compute_cache.put(keys[i], result)
+    return results
+
+def cached_max_spending(scenario: Dict) -> float:
+    """solve_max_spending for one scenario through the shared compute cache"""
+    inputs = {field: scenario.get(field, 0) or 0 for field in SCENARIO_FIELDS}
+    return compute_cache.get_or_compute('max_spending', inputs, lambda: float(solve_max_spending([scenario])[0]))
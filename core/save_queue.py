@@ -0,0 +1,197 @@
+import atexit
+import copy
+import threading
+import time
+import weakref
+from datetime import datetime
+from core.conflicts import ConflictError
+
+# Saves for the same client arriving within this window are written once
+COALESCE_SECONDS = 0.5
+
+class SaveQueue:
+    """Process-wide write-behind queue that coalesces rapid saves per client.
+
+    Callers hand over a snapshot and return immediately; a single background
+    thread writes each client's latest snapshot once its window expires.
+    Saves are queued per ClientManager (that is, per session), since each
+    one is checked against the revision its own session last saw.
+    """
+
+    def __init__(self, coalesce_seconds=COALESCE_SECONDS):
+        self.coalesce_seconds = coalesce_seconds
+        self._pending = {}
+        # ClientManager -> {client_id: latest save state}; dropped with the session's manager
+        self._status = weakref.WeakKeyDictionary()
+        self._writing = set()
+        self._condition = threading.Condition()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def _key(self, client_manager, client_id):
+        return (id(client_manager), client_id)
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="client-save-queue", daemon=True)
+            self._thread.start()
+
+    def _enqueue(self, client_manager, client_id, sections, full, deleted=(), base=None, on_saved=None):
+        with self._condition:
+            key = self._key(client_manager, client_id)
+            item = self._pending.get(key)
+            if item is None:
+                item = self._pending[key] = {
+                    'manager': client_manager,
+                    'client_id': client_id,
+                    'sections': {},
+                    'deleted': set(),
+                    'full': False,
+                    'base': {},
+                    'on_saved': [],
+                    'deadline': time.monotonic() + self.coalesce_seconds
+                }
+            # Digests of what the stored sections were before the first of the coalesced saves
+            for section, digest in (base or {}).items():
+                item['base'].setdefault(section, digest)
+            if on_saved is not None:
+                item['on_saved'].append(on_saved)
+            if full:
+                item['sections'] = sections
+                item['deleted'] = set()
+                item['full'] = True
+            else:
+                item['sections'].update(sections)
+                item['deleted'].difference_update(sections)
+                for section in deleted:
+                    item['sections'].pop(section, None)
+                    if not item['full']:
+                        item['deleted'].add(section)
+            self._status.setdefault(client_manager, {})[client_id] = {'state': 'pending', 'updated': datetime.now(), 'error': None}
+            self._ensure_worker()
+            self._condition.notify()
+
+    def enqueue_save(self, client_manager, client_data):
+        """Queue a full-document save; the snapshot is copied so later edits don't leak in"""
+        self._enqueue(client_manager, client_data['client_id'], copy.deepcopy(client_data), full=True)
+
+    def enqueue_section(self, client_manager, client_id, section, data):
+        """Queue a single-section update"""
+        self._enqueue(client_manager, client_id, {section: copy.deepcopy(data)}, full=False)
+
+    def enqueue_sections(self, client_manager, client_id, sections, deleted=(), base=None, on_saved=None):
+        """Queue several section updates and deletions as one write; base holds digests of the sections
+        as loaded, and on_saved is called once they are written (not if the write fails)"""
+        self._enqueue(client_manager, client_id, copy.deepcopy(sections), full=False, deleted=deleted, base=base,
+                      on_saved=on_saved)
+
+    def _take_due(self, now, force=False):
+        # Never hand out a client that is still being written, so writes stay in order
+        due = [
+            key for key, item in self._pending.items()
+            if key not in self._writing and (force or item['deadline'] <= now)
+        ]
+        items = [self._pending.pop(key) for key in due]
+        self._writing.update(due)
+        return due, items
+
+    def _write(self, key, item):
+        client_manager, client_id = item['manager'], item['client_id']
+        try:
+            if item['full']:
+                client_manager.write_client(item['sections'])
+            elif not client_manager.update_client_sections(client_id, item['sections'], item['deleted'], item['base']):
+                # Nothing was written; the client was deleted, here or elsewhere
+                raise ValueError(f"Client {client_id} no longer exists")
+            for on_saved in item['on_saved']:
+                on_saved()
+            status = {'state': 'saved', 'updated': datetime.now(), 'error': None}
+        except ConflictError as e:
+            status = {'state': 'conflict', 'updated': datetime.now(), 'error': str(e), 'conflict': e}
+        except Exception as e:
+            status = {'state': 'error', 'updated': datetime.now(), 'error': str(e)}
+        with self._condition:
+            self._writing.discard(key)
+            pending = self._pending.get(key)
+            if status['state'] == 'conflict' and pending is not None and not item['full'] and not pending['full']:
+                # Carry the rejected sections into the newer save, so its conflict covers both
+                pending['deleted'] = (item['deleted'] - set(pending['sections'])) | pending['deleted']
+                pending['sections'] = {
+                    **{s: v for s, v in item['sections'].items() if s not in pending['deleted']},
+                    **pending['sections']
+                }
+                pending['base'] = {**pending['base'], **item['base']}
+                pending['on_saved'] = item['on_saved'] + pending['on_saved']
+            # A newer edit may have been queued while this one was being written
+            if key not in self._pending:
+                self._status.setdefault(client_manager, {})[client_id] = status
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                ready = [item for key, item in self._pending.items() if key not in self._writing]
+                if not ready:
+                    self._condition.wait()
+                    continue
+                delay = min(item['deadline'] for item in ready) - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                due, items = self._take_due(time.monotonic())
+            for key, item in zip(due, items):
+                self._write(key, item)
+
+    def flush(self, client_manager=None, client_id=None, timeout=10):
+        """Write pending saves now (all of them, or one client's) on the calling thread"""
+        with self._condition:
+            if client_id is None:
+                self._condition.wait_for(lambda: not self._writing, timeout)
+                due, items = self._take_due(0, force=True)
+            else:
+                key = self._key(client_manager, client_id)
+                self._condition.wait_for(lambda: key not in self._writing, timeout)
+                item = self._pending.pop(key, None)
+                due, items = ([key], [item]) if item else ([], [])
+                self._writing.update(due)
+        for key, item in zip(due, items):
+            self._write(key, item)
+
+    def discard(self, client_manager, client_id):
+        """Drop a client's pending save, e.g. because the client was deleted"""
+        with self._condition:
+            key = self._key(client_manager, client_id)
+            self._condition.wait_for(lambda: key not in self._writing, 10)
+            self._pending.pop(key, None)
+            self._status.get(client_manager, {}).pop(client_id, None)
+
+    def is_pending(self, client_manager, client_id):
+        with self._condition:
+            key = self._key(client_manager, client_id)
+            return key in self._pending or key in self._writing
+
+    def status(self, client_manager, client_id):
+        """Latest save state for a client: {'state': 'pending'|'saved'|'conflict'|'error', ...} or None"""
+        with self._condition:
+            return self._status.get(client_manager, {}).get(client_id)
+
+    def clear_status(self, client_manager, client_id):
+        with self._condition:
+            self._status.get(client_manager, {}).pop(client_id, None)
+
+    def session_guard(self):
+        """Object to keep in a session's state; pending saves are flushed when the session ends"""
+        guard = _SessionGuard()
+        weakref.finalize(guard, self._flush_in_background)
+        return guard
+
+    def _flush_in_background(self):
+        with self._condition:
+            for item in self._pending.values():
+                item['deadline'] = 0
+            self._condition.notify()
+
+class _SessionGuard:
+    pass
+
+save_queue = SaveQueue()
@@ -0,0 +1,620 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from core.client_files import (
+    append_sections, client_lock, compact, document_stats, journal_path, needs_compaction,
+    read_document, read_journal_sections, scan_document, write_document
+)
+from core.client_index import get_client_index, client_summary, SUMMARY_FIELDS
+from core.conflicts import ConflictError
+
+SQLITE_FILE = "clients.db"
+
+_storages = {}
+_storages_lock = threading.Lock()
+
+def get_storage(backend, clients_dir):
+    """Return the process-wide storage backend for a clients directory"""
+    key = (backend, str(Path(clients_dir).resolve()))
+    with _storages_lock:
+        if key not in _storages:
+            if backend == "json":
+                _storages[key] = JSONFileStorage(clients_dir)
+            elif backend == "sqlite":
+                _storages[key] = SQLiteStorage(Path(clients_dir) / SQLITE_FILE)
+            else:
+                raise ValueError(f"Unknown storage backend: {backend}")
+        return _storages[key]
+
+def _format_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+def serialize_section(value):
+    return json.dumps(value, separators=(',', ':'))
+
+def section_digests(client_data):
+    """Digest of each top-level section, used to find which sections a save changed"""
+    return {
+        section: hashlib.sha256(serialize_section(value).encode()).digest()
+        for section, value in client_data.items()
+    }
+
+def stored_revision(section):
+    """Revision held in a stored 'revision' section; documents from before revisions count as 0"""
+    return int(section or 0)
+
+def overtaken_sections(base, stored, digests):
+    """Sections stored at something other than the version they were edited from (base)
+    and other than the value being saved; a save of them would undo another writer's change"""
+    return [
+        section for section, digest in base.items()
+        if digest is not None and stored.get(section) not in (digest, digests.get(section))
+    ]
+
+def diff_sections(previous, current):
+    """Return (changed section names, deleted section names) between two digest maps"""
+    changed = [section for section, digest in current.items() if previous.get(section) != digest]
+    deleted = [section for section in previous if section not in current]
+    return changed, deleted
+
+class JSONFileStorage:
+    """One JSON file per client plus an append-only journal of section updates.
+
+    Saves only append the sections that differ from what this process last
+    read or wrote; the journal is compacted into the base file once it
+    outweighs it. Writers hold an exclusive lock on the client (shared for
+    readers), so other processes see a save whole or not at all, and a save
+    given an expected revision fails with ConflictError if it was overtaken.
+    """
+
+    def __init__(self, clients_dir):
+        self.clients_dir = Path(clients_dir)
+        self.clients_dir.mkdir(parents=True, exist_ok=True)
+        self.index = get_client_index(self.clients_dir)
+        # client_id -> (file stats, section digests) of the last version seen
+        self._persisted = {}
+        # client_id -> (file stats, revision) of the last version seen
+        self._revisions = {}
+        self._lock = threading.RLock()
+
+    def _path(self, client_id):
+        return self.clients_dir / f"{client_id}.json"
+
+    def _remember(self, client_id, digests):
+        self._persisted[client_id] = (document_stats(self._path(client_id)), digests)
+
+    def _known_digests(self, client_id):
+        """Digests of the persisted document, if nobody else changed it since we last saw it"""
+        cached = self._persisted.get(client_id)
+        if cached and cached[0] == document_stats(self._path(client_id)):
+            return cached[1]
+        return None
+
+    def list_clients(self):
+        self.index.refresh()
+        return self.index.summaries()
+
+    def get_summary(self, client_id):
+        self.index.refresh()
+        return self.index.get(client_id)
+
+    def _stored_revision(self, client_id):
+        """Revision of the stored document, or None if there is none; call with the client locked"""
+        file_path = self._path(client_id)
+        stats = document_stats(file_path)
+        cached = self._revisions.get(client_id)
+        if cached and cached[0] == stats:
+            return cached[1]
+        if not file_path.exists():
+            return None
+        revision = stored_revision(self._load_sections(client_id, ['revision']).get('revision'))
+        self._revisions[client_id] = (stats, revision)
+        return revision
+
+    def _check_revision(self, client_id, expected_revision):
+        if expected_revision is None:
+            return
+        current = self._stored_revision(client_id)
+        if current != expected_revision:
+            raise ConflictError(client_id, expected_revision, current)
+
+    def _remember_revision(self, client_id, revision):
+        self._revisions[client_id] = (document_stats(self._path(client_id)), stored_revision(revision))
+
+    def _check_base(self, client_id, base, digests, expected_revision):
+        """Raise ConflictError if a section was changed by another writer since it was edited from base"""
+        if not base:
+            return
+        stored = self._known_digests(client_id)
+        if stored is None:
+            stored = section_digests(self._load_sections(client_id, list(base)))
+        if overtaken_sections(base, stored, digests):
+            raise ConflictError(client_id, expected_revision, self._stored_revision(client_id))
+
+    def load(self, client_id):
+        file_path = self._path(client_id)
+        with self._lock, client_lock(file_path, shared=True):
+            client_data = read_document(file_path)
+            if client_data is not None:
+                self._remember(client_id, section_digests(client_data))
+            return client_data
+
+    def _read_sections(self, client_id):
+        """(base file handle, section spans, journaled sections) for lazy reads, or None"""
+        file_path = self._path(client_id)
+        try:
+            f = open(file_path, 'rb')
+        except FileNotFoundError:
+            return None
+        st = os.fstat(f.fileno())
+        base_stats = (st.st_mtime_ns, st.st_size)
+        outline = self.index.outline(client_id, base_stats)
+        if outline is None:
+            # Written outside the app or by an older version: scan it once
+            _, outline = scan_document(f.read())
+            self.index.set_outline(client_id, base_stats, outline)
+        return f, outline, read_journal_sections(file_path)
+
+    def outline(self, client_id):
+        """Ordered {section: has data} for a client without parsing its sections"""
+        with self._lock, client_lock(self._path(client_id), shared=True):
+            sections = self._read_sections(client_id)
+            if sections is None:
+                return None
+            f, outline, journaled = sections
+            f.close()
+            result = {section: span[2] for section, span in outline.items()}
+            for section, data in journaled.items():
+                if data is None:
+                    result.pop(section, None)
+                else:
+                    result[section] = bool(data)
+            return result
+
+    def load_sections(self, client_id, names):
+        """Parse just the named sections, reading each one's byte span from the base file"""
+        with self._lock, client_lock(self._path(client_id), shared=True):
+            return self._load_sections(client_id, names)
+
+    def _load_sections(self, client_id, names):
+        sections = self._read_sections(client_id)
+        if sections is None:
+            return {}
+        f, outline, journaled = sections
+        loaded = {}
+        with f:
+            for section in names:
+                if section in journaled:
+                    if journaled[section] is not None:
+                        loaded[section] = journaled[section]
+                elif section in outline:
+                    start, end, _ = outline[section]
+                    f.seek(start)
+                    loaded[section] = json.loads(f.read(end - start))
+        return loaded
+
+    def save(self, client_id, client_data, expected_revision=None):
+        file_path = self._path(client_id)
+        digests = section_digests(client_data)
+        outline = None
+        with self._lock, client_lock(file_path):
+            self._check_revision(client_id, expected_revision)
+            previous = self._known_digests(client_id)
+            if previous is None:
+                outline = write_document(file_path, client_data)
+            else:
+                changed, deleted = diff_sections(previous, digests)
+                if not changed and not deleted:
+                    return
+                append_sections(file_path, {section: client_data[section] for section in changed}, deleted)
+                if needs_compaction(file_path):
+                    outline = write_document(file_path, client_data)
+            self._remember(client_id, digests)
+            self._remember_revision(client_id, client_data.get('revision'))
+            self.index.update(client_id, file_path, client_summary(client_data), outline)
+
+    def save_sections(self, client_id, sections, deleted=(), expected_revision=None, base=None):
+        """Append the given sections (and deletions) to an existing client's journal.
+
+        base holds digests of the sections as the caller loaded them; the save
+        fails with ConflictError if another writer has changed one of them since.
+        """
+        file_path = self._path(client_id)
+        digests = section_digests(sections)
+        with self._lock, client_lock(file_path):
+            if not file_path.exists():
+                return False
+            self._check_revision(client_id, expected_revision)
+            self._check_base(client_id, base, digests, expected_revision)
+            previous = self._known_digests(client_id)
+            if previous is not None:
+                sections = {section: data for section, data in sections.items() if previous.get(section) != digests[section]}
+                deleted = [section for section in deleted if section in previous]
+                if not sections and not deleted:
+                    return True
+            append_sections(file_path, sections, deleted)
+            outline = compact(file_path) if needs_compaction(file_path) else None
+            if previous is not None:
+                remembered = {**previous, **digests}
+                for section in deleted:
+                    remembered.pop(section, None)
+                self._remember(client_id, remembered)
+            if 'revision' in sections:
+                self._remember_revision(client_id, sections['revision'])
+            else:
+                self._revisions.pop(client_id, None)
+            summary = client_summary(sections) if 'personal_info' in sections else None
+            self.index.update(client_id, file_path, summary, outline)
+            return True
+
+    def save_section(self, client_id, section, data, expected_revision=None):
+        return self.save_sections(client_id, {section: data}, expected_revision=expected_revision)
+
+    def delete(self, client_id):
+        file_path = self._path(client_id)
+        with self._lock, client_lock(file_path):
+            self._persisted.pop(client_id, None)
+            self._revisions.pop(client_id, None)
+            if file_path.exists():
+                file_path.unlink()
+                try:
+                    journal_path(file_path).unlink()
+                except FileNotFoundError:
+                    pass
+                self.index.remove(client_id)
+                return True
+            return False
+
+    def fingerprints(self):
+        """Content hash of every client, for skipping unchanged clients in batch jobs"""
+        fingerprints = {}
+        for path in sorted(self.clients_dir.glob("*.json")):
+            digest = hashlib.sha256(path.read_bytes())
+            if journal_path(path).exists():
+                digest.update(journal_path(path).read_bytes())
+            fingerprints[path.stem] = digest.hexdigest()
+        return fingerprints
+
+class SQLiteStorage:
+    """SQLite backend: one row per client plus one row per top-level section.
+
+    Saves only rewrite the section rows that changed, in one transaction.
+    Write transactions take the database's write lock up front, so the
+    revision check of a save given an expected revision and the write itself
+    cannot interleave with another process.
+
+    A single connection per database is shared by every session in the
+    process (WAL mode, serialized by a lock); the constant parameterized SQL
+    below is reused through sqlite3's prepared statement cache.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS clients (
+                    client_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    email TEXT NOT NULL DEFAULT '',
+                    phone TEXT NOT NULL DEFAULT '',
+                    content_hash TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_clients_name ON clients (name COLLATE NOCASE);
+                CREATE TABLE IF NOT EXISTS client_sections (
+                    client_id TEXT NOT NULL REFERENCES clients (client_id) ON DELETE CASCADE,
+                    section TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (client_id, section)
+                );
+            """)
+        self.index = self
+        self.summary_revision = 0
+        self._summaries = None
+        self._sorted = None
+        self._data_version = None
+        # client_id -> (content hash, section digests) of the last version seen
+        self._persisted = {}
+
+    # Summary listing (also the source for the search index)
+
+    def refresh(self):
+        """Reload summaries if another process committed since the last check"""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._summaries is None or data_version != self._data_version:
+                rows = self._conn.execute(
+                    "SELECT client_id, name, email, phone, updated_at FROM clients"
+                ).fetchall()
+                self._summaries = {
+                    row[0]: {
+                        'client_id': row[0],
+                        'name': row[1],
+                        'email': row[2],
+                        'phone': row[3],
+                        'last_modified': _format_timestamp(row[4])
+                    }
+                    for row in rows
+                }
+                self._sorted = None
+                self._data_version = data_version
+                self.summary_revision += 1
+
+    def summaries(self):
+        with self._lock:
+            if self._summaries is None:
+                self.refresh()
+            if self._sorted is None:
+                self._sorted = sorted(self._summaries.values(), key=lambda x: x['name'].lower())
+            return self._sorted
+
+    def list_clients(self):
+        self.refresh()
+        return self.summaries()
+
+    def get_summary(self, client_id):
+        self.refresh()
+        return self._summaries.get(client_id)
+
+    # Documents
+
+    def load(self, client_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT section, data FROM client_sections WHERE client_id = ? ORDER BY position",
+                (client_id,)
+            ).fetchall()
+            if not rows:
+                return None
+            client_data = {section: json.loads(data) for section, data in rows}
+            self._persisted[client_id] = (
+                self._content_hash(client_id),
+                {section: hashlib.sha256(data.encode()).digest() for section, data in rows}
+            )
+            return client_data
+
+    def _content_hash(self, client_id):
+        row = self._conn.execute("SELECT content_hash FROM clients WHERE client_id = ?", (client_id,)).fetchone()
+        return row[0] if row else None
+
+    def _known_digests(self, client_id):
+        """Digests of the stored document, if no other process changed it since we last saw it"""
+        cached = self._persisted.get(client_id)
+        if cached and cached[0] == self._content_hash(client_id):
+            return cached[1]
+        return None
+
+    def _stored_revision(self, client_id):
+        """Revision of the stored document, or None if there is none"""
+        row = self._conn.execute(
+            "SELECT data FROM client_sections WHERE client_id = ? AND section = 'revision'",
+            (client_id,)
+        ).fetchone()
+        if row is not None:
+            return stored_revision(json.loads(row[0]))
+        return 0 if self._content_hash(client_id) is not None else None
+
+    def _check_revision(self, client_id, expected_revision):
+        """Raise ConflictError unless the stored revision is the expected one; call in a write transaction"""
+        if expected_revision is None:
+            return
+        current = self._stored_revision(client_id)
+        if current != expected_revision:
+            raise ConflictError(client_id, expected_revision, current)
+
+    def _check_base(self, client_id, base, digests, expected_revision):
+        """Raise ConflictError if a section was changed by another writer since it was edited from base"""
+        if not base:
+            return
+        stored = self._known_digests(client_id)
+        if stored is None:
+            names = list(base)
+            stored = {
+                section: hashlib.sha256(data.encode()).digest()
+                for section, data in self._conn.execute(
+                    f"SELECT section, data FROM client_sections WHERE client_id = ? "
+                    f"AND section IN ({', '.join('?' * len(names))})",
+                    (client_id, *names)
+                )
+            }
+        if overtaken_sections(base, stored, digests):
+            raise ConflictError(client_id, expected_revision, self._stored_revision(client_id))
+
+    def _write(self, client_id, client_data, updated_at):
+        rows = [
+            (client_id, section, position, serialize_section(value))
+            for position, (section, value) in enumerate(client_data.items())
+        ]
+        content_hash = hashlib.sha256("\n".join(f"{row[1]}={row[3]}" for row in rows).encode()).hexdigest()
+        summary = client_summary(client_data)
+        self._conn.execute(
+            "INSERT INTO clients (client_id, name, email, phone, content_hash, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (client_id) DO UPDATE SET name = excluded.name, email = excluded.email, "
+            "phone = excluded.phone, content_hash = excluded.content_hash, updated_at = excluded.updated_at",
+            (client_id, summary['name'], summary['email'], summary['phone'], content_hash, updated_at)
+        )
+        self._conn.execute("DELETE FROM client_sections WHERE client_id = ?", (client_id,))
+        self._conn.executemany(
+            "INSERT INTO client_sections (client_id, section, position, data) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        return content_hash
+
+    def _write_sections(self, client_id, sections, deleted, updated_at, summary=None):
+        """Upsert only the given sections; the content hash is chained from the previous one"""
+        previous_hash = self._content_hash(client_id) or ""
+        serialized = [(section, position, serialize_section(value)) for section, (position, value) in sections.items()]
+        chain = previous_hash + "".join(f"\n{section}={data}" for section, _, data in serialized)
+        chain += "".join(f"\n-{section}" for section in deleted)
+        content_hash = hashlib.sha256(chain.encode()).hexdigest()
+
+        self._conn.executemany(
+            "INSERT INTO client_sections (client_id, section, position, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (client_id, section) DO UPDATE SET data = excluded.data",
+            [(client_id, section, position, data) for section, position, data in serialized]
+        )
+        self._conn.executemany(
+            "DELETE FROM client_sections WHERE client_id = ? AND section = ?",
+            [(client_id, section) for section in deleted]
+        )
+        if summary is None:
+            self._conn.execute(
+                "UPDATE clients SET content_hash = ?, updated_at = ? WHERE client_id = ?",
+                (content_hash, updated_at, client_id)
+            )
+        else:
+            self._conn.execute(
+                "UPDATE clients SET name = ?, email = ?, phone = ?, content_hash = ?, updated_at = ? "
+                "WHERE client_id = ?",
+                (summary['name'], summary['email'], summary['phone'], content_hash, updated_at, client_id)
+            )
+        return content_hash
+
+    def _remember_summary(self, client_id, summary, updated_at):
+        if self._summaries is None:
+            return
+        previous = self._summaries.get(client_id)
+        if summary is None:
+            summary = {k: previous[k] for k in SUMMARY_FIELDS} if previous else client_summary({})
+        if previous is None or any(previous[k] != summary[k] for k in SUMMARY_FIELDS):
+            self.summary_revision += 1
+            self._sorted = None
+        self._summaries[client_id] = {
+            'client_id': client_id,
+            **summary,
+            'last_modified': _format_timestamp(updated_at)
+        }
+
+    def save(self, client_id, client_data, expected_revision=None):
+        updated_at = time.time()
+        digests = section_digests(client_data)
+        summary = client_summary(client_data)
+        with self._lock:
+            with self._conn:
+                # Take the write lock before reading what the write depends on
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._check_revision(client_id, expected_revision)
+                previous = self._known_digests(client_id)
+                if previous is None:
+                    content_hash = self._write(client_id, client_data, updated_at)
+                else:
+                    changed, deleted = diff_sections(previous, digests)
+                    if not changed and not deleted:
+                        return
+                    positions = {section: position for position, section in enumerate(client_data)}
+                    content_hash = self._write_sections(
+                        client_id,
+                        {section: (positions[section], client_data[section]) for section in changed},
+                        deleted,
+                        updated_at,
+                        summary
+                    )
+            self._persisted[client_id] = (content_hash, digests)
+            self._remember_summary(client_id, summary, updated_at)
+
+    def save_sections(self, client_id, sections, deleted=(), expected_revision=None, base=None):
+        """Upsert the given sections (and drop deleted ones) of an existing client.
+
+        base holds digests of the sections as the caller loaded them; the save
+        fails with ConflictError if another writer has changed one of them since.
+        """
+        updated_at = time.time()
+        summary = client_summary(sections) if 'personal_info' in sections else None
+        digests = section_digests(sections)
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                if self._content_hash(client_id) is None:
+                    return False
+                self._check_revision(client_id, expected_revision)
+                self._check_base(client_id, base, digests, expected_revision)
+                previous = self._known_digests(client_id)
+                if previous is not None:
+                    sections = {section: data for section, data in sections.items() if previous.get(section) != digests[section]}
+                    deleted = [section for section in deleted if section in previous]
+                    if not sections and not deleted:
+                        return True
+                positions = dict(self._conn.execute(
+                    "SELECT section, position FROM client_sections WHERE client_id = ?",
+                    (client_id,)
+                ))
+                next_position = max(positions.values(), default=-1) + 1
+                rows = {}
+                for section, data in sections.items():
+                    if section not in positions:
+                        positions[section] = next_position
+                        next_position += 1
+                    rows[section] = (positions[section], data)
+                content_hash = self._write_sections(client_id, rows, deleted, updated_at, summary)
+            if previous is not None:
+                remembered = {**previous, **digests}
+                for section in deleted:
+                    remembered.pop(section, None)
+                self._persisted[client_id] = (content_hash, remembered)
+            self._remember_summary(client_id, summary, updated_at)
+            return True
+
+    def save_section(self, client_id, section, data, expected_revision=None):
+        return self.save_sections(client_id, {section: data}, expected_revision=expected_revision)
+
+    def outline(self, client_id):
+        """Ordered {section: has data} for a client without parsing its sections"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT section, data NOT IN ('{}', '[]', 'null', '\"\"', '0', '0.0', 'false') "
+                "FROM client_sections WHERE client_id = ? ORDER BY position",
+                (client_id,)
+            ).fetchall()
+        return {section: bool(filled) for section, filled in rows} or None
+
+    def load_sections(self, client_id, names):
+        """Parse just the named section rows"""
+        names = list(names)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT section, data FROM client_sections WHERE client_id = ? "
+                f"AND section IN ({', '.join('?' * len(names))})",
+                (client_id, *names)
+            ).fetchall()
+        return {section: json.loads(data) for section, data in rows}
+
+    def delete(self, client_id):
+        with self._lock:
+            self._persisted.pop(client_id, None)
+            with self._conn:
+                deleted = self._conn.execute("DELETE FROM clients WHERE client_id = ?", (client_id,)).rowcount
+            if deleted and self._summaries is not None:
+                self._summaries.pop(client_id, None)
+                self._sorted = None
+                self.summary_revision += 1
+        return bool(deleted)
+
+    def import_clients(self, clients):
+        """Bulk-import (client_id, client_data) pairs in a single transaction"""
+        updated_at = time.time()
+        count = 0
+        with self._lock:
+            with self._conn:
+                for client_id, client_data in clients:
+                    self._write(client_id, client_data, updated_at)
+                    count += 1
+            self._summaries = None
+            self._persisted.clear()
+        return count
+
+    def fingerprints(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT client_id, content_hash FROM clients ORDER BY client_id"))
@@ -0,0 +1,43 @@
+"""Bulk-import the JSON client files into the SQLite backend.
+
+Usage (from the repository root):
+    python migrate_clients.py [--clients-dir data/clients]
+
+All clients are imported in a single transaction, so a failed run leaves
+the database unchanged. Set STORAGE_BACKEND = "sqlite" in config/settings.py
+afterwards to switch the app over.
+"""
+import argparse
+import json
+import time
+
+from core.storage import JSONFileStorage, get_storage
+
+def iter_json_clients(source):
+    """Yield (client_id, client_data) for every readable client, with its journal replayed"""
+    for path in sorted(source.clients_dir.glob("*.json")):
+        try:
+            client_data = source.load(path.stem)
+        except json.JSONDecodeError as e:
+            print(f"Skipping {path.name}: {e}")
+            continue
+        if client_data is not None:
+            yield path.stem, client_data
+
+def migrate(clients_dir="data/clients"):
+    """Import every JSON client into the SQLite database and return the count"""
+    source = JSONFileStorage(clients_dir)
+    target = get_storage("sqlite", clients_dir)
+    return target.import_clients(iter_json_clients(source))
+
+def main():
+    parser = argparse.ArgumentParser(description="Import JSON client files into SQLite")
+    parser.add_argument("--clients-dir", default="data/clients")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = migrate(args.clients_dir)
+    print(f"Imported {count} clients in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
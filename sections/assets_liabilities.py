@@ -1,6 +1,15 @@
+import uuid
+import pandas as pd
 import streamlit as st
 from config.settings import DEFAULT_ASSET_CATEGORIES
+from core.financial_summary import get_financial_summary
+from core.lazy_client import edit_section
+from core.profiler import profiled_entry, timed
+from utils.components import profile_history
 
+ASSET_COLUMNS = ['name', 'value', 'is_managed', 'include_in_nest_egg']
+
+@timed("sections.assets_liabilities.render_assets_liabilities")
 def render_assets_liabilities(client, client_manager):
     st.header("Assets")
     
@@ -8,58 +17,38 @@ def render_assets_liabilities(client, client_manager):
     st.divider()
     render_asset_categories(client, client_manager)
 
+@timed("sections.assets_liabilities.render_summary_metrics")
 def render_summary_metrics(client):
-    total_assets, total_nest_egg, total_managed, total_unmanaged = calculate_totals(client)
+    summary = get_financial_summary(client)
     
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Total Assets", f"${total_assets:,.2f}")
+        st.metric("Total Assets", f"${summary['total_assets']:,.2f}")
         col1a, col1b = st.columns(2)
-        col1a.metric("Managed Assets", f"${total_managed:,.2f}")
-        col1b.metric("Unmanaged Assets", f"${total_unmanaged:,.2f}")
+        col1a.metric("Managed Assets", f"${summary['total_managed']:,.2f}")
+        col1b.metric("Unmanaged Assets", f"${summary['total_unmanaged']:,.2f}")
     
     with col2:
-        st.metric("Total Nest Egg", f"${total_nest_egg:,.2f}")
+        st.metric("Total Nest Egg", f"${summary['total_nest_egg']:,.2f}")
         col2a, col2b = st.columns(2)
-        col2a.metric("Managed Nest Egg", f"${total_managed:,.2f}")
-        col2b.metric("Unmanaged Nest Egg", f"${total_unmanaged:,.2f}")
-
-def calculate_totals(client):
-    total_assets = 0
-    total_nest_egg = 0
-    total_managed = 0
-    total_unmanaged = 0
-    
-    if 'assets' in client:
-        for category in client['assets'].values():
-            for asset in category:
-                value = float(asset.get('value', 0))
-                total_assets += value
-                
-                if asset.get('include_in_nest_egg', True):
-                    total_nest_egg += value
-                    
-                if asset.get('is_managed', False):
-                    total_managed += value
-                else:
-                    total_unmanaged += value
-    
-    return total_assets, total_nest_egg, total_managed, total_unmanaged
+        col2a.metric("Managed Nest Egg", f"${summary['managed_nest_egg']:,.2f}")
+        col2b.metric("Unmanaged Nest Egg", f"${summary['unmanaged_nest_egg']:,.2f}")
 
+@timed("sections.assets_liabilities.render_asset_categories")
 def render_asset_categories(client, client_manager):
     if 'asset_categories' not in client:
         client['asset_categories'] = list(DEFAULT_ASSET_CATEGORIES.keys())
         client['assets'] = {cat: [] for cat in client['asset_categories']}
-        client_manager.save_client(client)
+        client_manager.queue_save(client)
 
     # Add new category button
     col1, col2 = st.columns([3, 1])
     with col2:
         if st.button("➕ Add New Category"):
             new_category = f"category_{len(client['asset_categories'])}"
-            client['asset_categories'].append(new_category)
-            client['assets'][new_category] = []
-            client_manager.save_client(client)
+            edit_section(client, 'asset_categories').append(new_category)
+            edit_section(client, 'assets')[new_category] = []
+            client_manager.queue_save(client)
             st.rerun()
 
     # Render each category as a card
@@ -67,8 +56,61 @@ def render_asset_categories(client, client_manager):
         with st.expander(DEFAULT_ASSET_CATEGORIES.get(category, category.replace('_', ' ').title()), expanded=True):
             render_asset_category(category, client, client_manager)
 
+def ensure_asset_ids(assets):
+    """Give every asset a stable id so grid edits survive inserts and deletes"""
+    for asset in assets:
+        if not asset.get('id'):
+            asset['id'] = uuid.uuid4().hex[:12]
+
+def asset_frame(assets):
+    """One row per asset, in list order; grid row positions map back to asset ids"""
+    return pd.DataFrame(
+        {
+            'name': [asset.get('name', '') for asset in assets],
+            'value': [float(asset.get('value') or 0) for asset in assets],
+            'is_managed': [bool(asset.get('is_managed', False)) for asset in assets],
+            'include_in_nest_egg': [bool(asset.get('include_in_nest_egg', True)) for asset in assets]
+        },
+        columns=ASSET_COLUMNS
+    ).astype({'name': 'string', 'value': float, 'is_managed': bool, 'include_in_nest_egg': bool})
+
+def apply_asset_edits(assets, changes):
+    """Apply a data_editor diff (row positions refer to the rendered frame); returns the new list"""
+    ids = [asset['id'] for asset in assets]
+    by_id = {asset['id']: asset for asset in assets}
+    for position, edits in changes.get('edited_rows', {}).items():
+        asset = by_id[ids[int(position)]]
+        for column, value in edits.items():
+            if column in ASSET_COLUMNS:
+                asset[column] = _asset_field(column, value)
+    deleted = {ids[position] for position in changes.get('deleted_rows', [])}
+    updated = [asset for asset in assets if asset['id'] not in deleted]
+    for row in changes.get('added_rows', []):
+        asset = {
+            'id': uuid.uuid4().hex[:12],
+            'name': '',
+            'value': 0.0,
+            'is_managed': False,
+            'include_in_nest_egg': True
+        }
+        asset.update({column: _asset_field(column, value) for column, value in row.items() if column in ASSET_COLUMNS})
+        updated.append(asset)
+    return updated
+
+def _asset_field(column, value):
+    if column == 'value':
+        return float(value or 0)
+    if column in ('is_managed', 'include_in_nest_egg'):
+        return bool(value)
+    return value or ''
+
+@st.fragment
+@profiled_entry("sections.assets_liabilities.render_asset_category", profile_history)
 def render_asset_category(category, client, client_manager):
     assets = client['assets'].get(category, [])
+    if not all(asset.get('id') for asset in assets):
+        assets = edit_section(client, 'assets').get(category, [])
+        ensure_asset_ids(assets)
     
     # Category settings
     col1, col2, col3 = st.columns([2, 2, 1])
@@ -79,65 +121,35 @@ def render_asset_category(category, client, client_manager):
             key=f"cat_name_{category}"
         )
     
-    # Add new asset button
-    with col3:
-        if st.button("Add Asset", key=f"add_asset_{category}"):
-            assets.append({
-                "name": "",
-                "value": 0.0,
-                "is_managed": False,
-                "include_in_nest_egg": True
-            })
-            client['assets'][category] = assets
-            client_manager.save_client(client)
-            st.rerun()
-
-    # Render each asset in the category
-    for idx, asset in enumerate(assets):
-        with st.container():
-            col1, col2, col3, col4, col5 = st.columns([3, 2, 1, 1, 1])
-            
-            with col1:
-                asset['name'] = st.text_input(
-                    "Asset Name",
-                    value=asset.get('name', ''),
-                    key=f"asset_name_{category}_{idx}"
-                )
-            
-            with col2:
-                asset['value'] = st.number_input(
-                    "Value",
-                    value=float(asset.get('value', 0)),
-                    step=1000.0,
-                    format="%0.2f",
-                    key=f"asset_value_{category}_{idx}"
-                )
-            
-            with col3:
-                asset['is_managed'] = st.checkbox(
-                    "Managed",
-                    value=asset.get('is_managed', False),
-                    key=f"asset_managed_{category}_{idx}"
-                )
-            
-            with col4:
-                asset['include_in_nest_egg'] = st.checkbox(
-                    "In Nest Egg",
-                    value=asset.get('include_in_nest_egg', True),
-                    key=f"asset_nest_egg_{category}_{idx}"
-                )
-            
-            with col5:
-                if st.button("🗑️", key=f"delete_asset_{category}_{idx}"):
-                    assets.pop(idx)
-                    client['assets'][category] = assets
-                    client_manager.save_client(client)
-                    st.rerun()
-
-        st.divider()
+    # One grid per category: edits are held client-side until the form is saved,
+    # so a category with hundreds of assets is a single widget and a single write
+    version_key = f"asset_grid_version_{client['client_id']}_{category}"
+    version = st.session_state.get(version_key, 0)
+    editor_key = f"asset_grid_{client['client_id']}_{category}_{version}"
+    with st.form(f"asset_form_{category}", border=False):
+        st.data_editor(
+            asset_frame(assets),
+            key=editor_key,
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'name': st.column_config.TextColumn("Asset Name"),
+                'value': st.column_config.NumberColumn("Value", step=1000.0, format="$%.2f"),
+                'is_managed': st.column_config.CheckboxColumn("Managed", default=False),
+                'include_in_nest_egg': st.column_config.CheckboxColumn("In Nest Egg", default=True)
+            }
+        )
+        submitted = st.form_submit_button("Save Changes")
 
     # Save changes to category
-    if st.button("Save Changes", key=f"save_{category}"):
-        client['assets'][category] = assets
-        client_manager.save_client(client)
-        st.success("Changes saved successfully!")
\ No newline at end of file
+    if submitted:
+        changes = st.session_state.get(editor_key, {})
+        client_assets = edit_section(client, 'assets')
+        client_assets[category] = apply_asset_edits(client_assets.get(category, []), changes)
+        client_manager.queue_save(client)
+        # A fresh editor key drops the applied diff from the widget state
+        st.session_state.pop(editor_key, None)
+        st.session_state[version_key] = version + 1
+        st.toast("Changes saved successfully!")
+        st.rerun()
@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
+from core.financial_summary import get_financial_summary
+from core.profiler import timed
 
+@timed("sections.balance_sheet.render_balance_sheet")
 def render_balance_sheet(client, client_manager):
     st.header("Balance Sheet")
     
@@ -15,48 +18,39 @@ def render_balance_sheet(client, client_manager):
     st.divider()
     render_net_worth_analysis(client)
 
+@timed("sections.balance_sheet.render_assets_summary")
 def render_assets_summary(client):
     st.subheader("Assets")
     
-    assets_data = []
-    total_assets = 0
-    
-    if 'assets' in client:
-        for category, assets in client['assets'].items():
-            category_total = sum(float(asset.get('value', 0)) for asset in assets)
-            total_assets += category_total
-            assets_data.append({
-                'Category': category.replace('_', ' ').title(),
-                'Value': f"${category_total:,.2f}"
-            })
+    summary = get_financial_summary(client)
+    assets_data = [
+        {
+            'Category': category.replace('_', ' ').title(),
+            'Value': f"${totals['total']:,.2f}"
+        }
+        for category, totals in summary['categories'].items()
+    ]
     
     if assets_data:
         df = pd.DataFrame(assets_data)
         st.dataframe(df, hide_index=True)
     
-    st.metric("Total Assets", f"${total_assets:,.2f}")
+    st.metric("Total Assets", f"${summary['total_assets']:,.2f}")
 
+@timed("sections.balance_sheet.render_liabilities_summary")
 def render_liabilities_summary(client):
     st.subheader("Liabilities")
     
     # Placeholder for liabilities - to be implemented
     st.info("Liabilities section coming soon...")
 
+@timed("sections.balance_sheet.render_net_worth_analysis")
 def render_net_worth_analysis(client):
     st.subheader("Net Worth Analysis")
     
-    total_assets = 0
-    if 'assets' in client:
-        for category in client['assets'].values():
-            for asset in category:
-                total_assets += float(asset.get('value', 0))
-    
-    # Placeholder for liabilities calculation
-    total_liabilities = 0
-    
-    net_worth = total_assets - total_liabilities
+    summary = get_financial_summary(client)
     
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Assets", f"${total_assets:,.2f}")
-    col2.metric("Total Liabilities", f"${total_liabilities:,.2f}")
-    col3.metric("Net Worth", f"${net_worth:,.2f}") 
\ No newline at end of file
+    col1.metric("Total Assets", f"${summary['total_assets']:,.2f}")
+    col2.metric("Total Liabilities", f"${summary['total_liabilities']:,.2f}")
+    col3.metric("Net Worth", f"${summary['net_worth']:,.2f}") 
\ No newline at end of file
@@ -1,6 +1,7 @@
 import streamlit as st
-from utils.components import card
+from core.profiler import timed
 
+@timed("sections.cash_flow.render_cash_flow")
 def render_cash_flow(client, client_manager):
     st.header("Cash Flow Analysis")
     
@@ -12,8 +13,9 @@ def render_cash_flow(client, client_manager):
     with col2:
         render_expenses_section(client, client_manager)
 
+@timed("sections.cash_flow.render_income_section")
 def render_income_section(client, client_manager):
-    with card("Monthly Income", lambda: None):
+    with st.expander("Monthly Income", expanded=True):
         with st.form("income_form"):
             income_data = client.get('income', {})
             updated_income = {}
@@ -64,11 +66,12 @@ def render_income_section(client, client_manager):
             
             if st.form_submit_button("Update Income"):
                 client['income'] = updated_income
-                client_manager.save_client(client)
+                client_manager.queue_save(client)
                 st.success("Income updated successfully!")
 
+@timed("sections.cash_flow.render_expenses_section")
 def render_expenses_section(client, client_manager):
-    with card("Monthly Expenses", lambda: None):
+    with st.expander("Monthly Expenses", expanded=True):
         with st.form("expenses_form"):
             expenses_data = client.get('expenses', {})
             updated_expenses = {}
@@ -123,5 +126,5 @@ def render_expenses_section(client, client_manager):
             
             if st.form_submit_button("Update Expenses"):
                 client['expenses'] = updated_expenses
-                client_manager.save_client(client)
+                client_manager.queue_save(client)
                 st.success("Expenses updated successfully!") 
\ No newline at end of file
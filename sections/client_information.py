@@ -1,8 +1,11 @@
 import streamlit as st
 from datetime import datetime
-from utils.age_calculator import calculate_age
+from core.age_calculator import calculate_age
+from core.lazy_client import edit_section
 from utils.validators import validate_name, validate_date
+from core.profiler import timed
 
+@timed("sections.client_information.render_client_information")
 def render_client_information(client, client_manager):
     st.header("Client Information")
     
@@ -14,6 +17,7 @@ def render_client_information(client, client_manager):
     with col2:
         render_spouse_information(client, client_manager)
 
+@timed("sections.client_information.render_primary_client")
 def render_primary_client(client, client_manager):
     st.subheader("Client Information")
     with st.form("client_info_form"):
@@ -52,10 +56,11 @@ def render_primary_client(client, client_manager):
                 'is_retired': is_retired,
                 'retirement_age': retirement_age if not is_retired else None
             }
-            client['personal_info'].update(updated_info)
-            client_manager.save_client(client)
+            edit_section(client, 'personal_info').update(updated_info)
+            client_manager.queue_save(client)
             st.success("Client information updated!")
 
+@timed("sections.client_information.render_spouse_information")
 def render_spouse_information(client, client_manager):
     st.subheader("Spouse Information")
     with st.form("spouse_info_form"):
@@ -104,6 +109,6 @@ def render_spouse_information(client, client_manager):
                 'spouse_is_retired': spouse_is_retired,
                 'spouse_retirement_age': spouse_retirement_age if not spouse_is_retired else None
             }
-            client['personal_info'].update(updated_info)
-            client_manager.save_client(client)
+            edit_section(client, 'personal_info').update(updated_info)
+            client_manager.queue_save(client)
             st.success("Spouse information updated!")
\ No newline at end of file
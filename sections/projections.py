@@ -1,8 +1,14 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime, date
+from config.settings import MONTE_CARLO_SETTINGS
+from core.lazy_client import edit_section
+from core.monte_carlo import simulation_inputs_from_client, cached_simulation
+from utils.charts import cached_figure, fan_chart
+from core.profiler import profiled_entry, span, timed
+from utils.components import profile_history
 
+@timed("sections.projections.render_projections")
 def render_projections(client, client_manager):
     st.header("Retirement Projections")
     
@@ -14,7 +20,9 @@ def render_projections(client, client_manager):
     st.divider()
     render_projection_results(client)
 
+@timed("sections.projections.render_projection_inputs")
 def render_projection_inputs(client, client_manager):
+    settings = client.get('projections', {})
     with st.form("projection_settings"):
         col1, col2 = st.columns(2)
         
@@ -24,14 +32,14 @@ def render_projection_inputs(client, client_manager):
                 "Inflation Rate (%)",
                 min_value=0.0,
                 max_value=10.0,
-                value=3.0,
+                value=float(settings.get('inflation_rate', 3.0)),
                 step=0.1
             )
             investment_return = st.slider(
                 "Expected Investment Return (%)",
                 min_value=0.0,
                 max_value=15.0,
-                value=7.0,
+                value=float(settings.get('investment_return', 7.0)),
                 step=0.1
             )
         
@@ -40,14 +48,14 @@ def render_projection_inputs(client, client_manager):
             retirement_expenses = st.number_input(
                 "Expected Monthly Expenses in Retirement",
                 min_value=0.0,
-                value=5000.0,
+                value=float(settings.get('retirement_expenses', 5000.0)),
                 step=100.0
             )
             life_expectancy = st.slider(
                 "Life Expectancy",
                 min_value=70,
                 max_value=100,
-                value=90
+                value=int(settings.get('life_expectancy', 90))
             )
         
         if st.form_submit_button("Update Projections"):
@@ -55,55 +63,52 @@ def render_projection_inputs(client, client_manager):
             if 'projections' not in client:
                 client['projections'] = {}
             
-            client['projections'].update({
+            edit_section(client, 'projections').update({
                 'inflation_rate': inflation_rate,
                 'investment_return': investment_return,
                 'retirement_expenses': retirement_expenses,
                 'life_expectancy': life_expectancy
             })
             
-            client_manager.save_client(client)
+            client_manager.queue_save(client)
             st.success("Projection settings updated!")
 
+@st.fragment
+@profiled_entry("sections.projections.render_projection_results", profile_history)
 def render_projection_results(client):
     st.subheader("Projection Results")
     
-    # Placeholder chart for preview
-    years = list(range(2024, 2054))
-    conservative = [1000000 * (1.05 ** i) for i in range(len(years))]
-    moderate = [1000000 * (1.07 ** i) for i in range(len(years))]
-    aggressive = [1000000 * (1.09 ** i) for i in range(len(years))]
-    
-    fig = go.Figure()
+    if not client.get('projections'):
+        st.info("Save your projection settings above to run the simulation")
+        return
     
-    fig.add_trace(go.Scatter(
-        x=years,
-        y=conservative,
-        name="Conservative",
-        line=dict(color="blue")
-    ))
+    inputs = simulation_inputs_from_client(client)
+    if inputs['life_expectancy'] <= inputs['current_age']:
+        st.warning("Life expectancy must be greater than the client's current age")
+        return
     
-    fig.add_trace(go.Scatter(
-        x=years,
-        y=moderate,
-        name="Moderate",
-        line=dict(color="green")
-    ))
+    with st.spinner("Running Monte Carlo simulation..."):
+        results = cached_simulation(inputs, seed=MONTE_CARLO_SETTINGS['seed'])
     
-    fig.add_trace(go.Scatter(
-        x=years,
-        y=aggressive,
-        name="Aggressive",
-        line=dict(color="red")
-    ))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Probability of Success", f"{results['success_probability']:.0%}")
+    col2.metric("Median Balance at Life Expectancy", f"${results['percentiles'][50][-1]:,.0f}")
+    col3.metric("Simulated Paths", f"{results['num_paths']:,}")
     
-    fig.update_layout(
-        title="Portfolio Value Projection",
-        xaxis_title="Year",
-        yaxis_title="Portfolio Value ($)",
-        showlegend=True
+    bands = results['percentiles']
+    ages = results['ages']
+    fig = cached_figure(
+        'fan',
+        {'ages': ages, 'bands': bands, 'retirement_age': inputs['retirement_age']},
+        lambda: fan_chart(ages, bands, inputs['retirement_age'])
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    with span("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
     
-    st.info("Detailed Monte Carlo simulations and additional analysis coming soon!") 
\ No newline at end of file
+    st.caption(
+        f"Based on {results['num_paths']:,} simulated return paths with "
+        f"{inputs['investment_return']:.1f}% expected return, "
+        f"{inputs['return_volatility']:.1f}% volatility and "
+        f"{inputs['inflation_rate']:.1f}% inflation."
+    )
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import core.backups as backups
+from core.backups import BackupStore
+
+SETTINGS = {'max_delta_chain': 10, 'retention': {'keep_last': 3}}
+
+def test_prune_from_another_session_keeps_concurrent_backups(tmp_path, monkeypatch):
+    # Widen prune's read-modify-write window so an unlocked manifest loses entries
+    apply_retention = backups.apply_retention
+    def slow_retention(*args):
+        time.sleep(0.003)
+        return apply_retention(*args)
+    monkeypatch.setattr(backups, 'apply_retention', slow_retention)
+
+    session_a, session_b = BackupStore(tmp_path, SETTINGS), BackupStore(tmp_path, SETTINGS)
+    done = threading.Event()
+    def prune_repeatedly():
+        while not done.is_set():
+            session_b.prune('client_1')
+    pruner = threading.Thread(target=prune_repeatedly)
+    pruner.start()
+    written = [session_a.backup('client_1', {'client_id': 'client_1', 'n': n})[0]['hash'] for n in range(40)]
+    done.set()
+    pruner.join()
+
+    assert [entry['hash'] for entry in session_a.history('client_1')] == written[-3:]
+
+def test_garbage_collection_never_removes_an_object_a_backup_reuses(tmp_path, monkeypatch):
+    # Every unreferenced object is old enough to collect
+    monkeypatch.setattr(backups, 'GC_GRACE_SECONDS', -60)
+    read_object = BackupStore._read_object
+    def slow_read(self, digest):
+        time.sleep(0.001)
+        return read_object(self, digest)
+    monkeypatch.setattr(BackupStore, '_read_object', slow_read)
+
+    settings = {'max_delta_chain': 0, 'retention': {'keep_last': 1}}
+    session_a, session_b = BackupStore(tmp_path, settings), BackupStore(tmp_path, settings)
+    done = threading.Event()
+    def collect_repeatedly():
+        while not done.is_set():
+            session_b.collect_garbage()
+    collector = threading.Thread(target=collect_repeatedly)
+    collector.start()
+    # Alternating versions reuse an object that pruning has just left unreferenced
+    for n in range(40):
+        session_a.backup('client_1', {'client_id': 'client_1', 'n': n % 2})
+        session_a.prune('client_1')
+        latest = session_a.history('client_1')[-1]
+        assert session_a.load_version(latest['hash']) == {'client_id': 'client_1', 'n': n % 2}
+    done.set()
+    collector.join()
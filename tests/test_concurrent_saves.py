@@ -0,0 +1,73 @@
+import pytest
+
+from core.client_manager import ClientManager
+from core.conflicts import ConflictError
+from core.lazy_client import edit_section
+
+CLIENT = {
+    'client_id': 'client_1',
+    'personal_info': {'client_first_name': 'Ada', 'client_last_name': 'Lovelace'},
+    'income': {'salary': 1},
+    'expenses': {'rent': 1}
+}
+
+@pytest.fixture(params=["json", "sqlite"])
+def clients_dir(request, tmp_path):
+    ClientManager(tmp_path, backend=request.param).save_client(dict(CLIENT))
+    return tmp_path, request.param
+
+def test_edits_to_different_sections_are_merged(clients_dir):
+    path, backend = clients_dir
+    session_a, session_b = ClientManager(path, backend), ClientManager(path, backend)
+    client_a = session_a.open_client('client_1')
+    client_b = session_b.open_client('client_1')
+
+    edit_section(client_a, 'income')['salary'] = 2
+    session_a.save_client(client_a)
+    edit_section(client_b, 'expenses')['rent'] = 2
+    session_b.save_client(client_b)
+
+    stored = ClientManager(path, backend).get_client('client_1')
+    assert stored['income'] == {'salary': 2}
+    assert stored['expenses'] == {'rent': 2}
+
+def test_stale_section_after_rebase_conflicts(clients_dir):
+    path, backend = clients_dir
+    session_a, session_b = ClientManager(path, backend), ClientManager(path, backend)
+    client_b = session_b.open_client('client_1')
+    client_b['income'], client_b['expenses']
+
+    client_a = session_a.open_client('client_1')
+    edit_section(client_a, 'income')['salary'] = 2
+    session_a.save_client(client_a)
+
+    # Rebased onto A's save, which moves B's expected revision past it
+    edit_section(client_b, 'expenses')['rent'] = 2
+    session_b.save_client(client_b)
+
+    # B's income was loaded before A's save, so writing it back would undo A's edit
+    edit_section(client_b, 'income')['bonus'] = 5
+    with pytest.raises(ConflictError) as conflict:
+        session_b.save_client(client_b)
+    assert conflict.value.conflicting == ['income']
+    assert conflict.value.theirs == {'income': {'salary': 2}}
+
+    stored = ClientManager(path, backend).get_client('client_1')
+    assert stored['income'] == {'salary': 2}
+    assert stored['expenses'] == {'rent': 2}
+
+def test_same_section_conflicts(clients_dir):
+    path, backend = clients_dir
+    session_a, session_b = ClientManager(path, backend), ClientManager(path, backend)
+    client_a = session_a.open_client('client_1')
+    client_b = session_b.open_client('client_1')
+    client_b['income']
+
+    edit_section(client_a, 'income')['salary'] = 2
+    session_a.save_client(client_a)
+    edit_section(client_b, 'income')['salary'] = 3
+    with pytest.raises(ConflictError) as conflict:
+        session_b.save_client(client_b)
+
+    session_b.resolve_conflict(conflict.value, keep_mine=['income'])
+    assert ClientManager(path, backend).get_client('client_1')['income'] == {'salary': 3}
@@ -0,0 +1,12 @@
+from core.client_files import journal_path
+from core.storage import JSONFileStorage, get_storage
+from migrate_clients import migrate
+
+def test_migration_replays_the_journal(tmp_path):
+    source = JSONFileStorage(tmp_path)
+    source.save('client_1', {'client_id': 'client_1', 'assets': {'taxable': [{'value': 1}]}})
+    source.save_sections('client_1', {'assets': {'taxable': [{'value': 2}]}})
+    assert journal_path(tmp_path / 'client_1.json').exists()
+
+    assert migrate(tmp_path) == 1
+    assert get_storage("sqlite", tmp_path).load('client_1')['assets'] == {'taxable': [{'value': 2}]}
@@ -0,0 +1,76 @@
+import threading
+
+from core.client_manager import ClientManager
+from core.lazy_client import edit_section
+from core.save_queue import SaveQueue
+
+class RecordingManager:
+    """Stands in for a ClientManager and records the writes the queue makes"""
+
+    def __init__(self, block_first=False):
+        self.writes = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block_first:
+            self.release.set()
+
+    def write_client(self, client_data):
+        self.writes.append(('full', client_data))
+
+    def update_client_sections(self, client_id, sections, deleted=(), base=None):
+        self.started.set()
+        self.release.wait(5)
+        self.writes.append(('sections', dict(sections), set(deleted)))
+        return True
+
+def test_rapid_saves_are_coalesced_into_the_latest_snapshot():
+    queue = SaveQueue(coalesce_seconds=60)
+    manager = RecordingManager()
+    saved = []
+    income = {'salary': 1}
+    queue.enqueue_sections(manager, 'client_1', {'income': income, 'notes': 'a'}, on_saved=lambda: saved.append(1))
+    income['salary'] = 99  # Snapshots are copied on enqueue
+    queue.enqueue_sections(manager, 'client_1', {'income': {'salary': 2}}, deleted=['notes'],
+                           on_saved=lambda: saved.append(2))
+    assert queue.is_pending(manager, 'client_1')
+
+    queue.flush(manager, 'client_1')
+    assert manager.writes == [('sections', {'income': {'salary': 2}}, {'notes'})]
+    assert saved == [1, 2]
+    assert queue.status(manager, 'client_1')['state'] == 'saved'
+
+def test_section_update_after_full_save_is_folded_into_it():
+    queue = SaveQueue(coalesce_seconds=60)
+    manager = RecordingManager()
+    queue.enqueue_save(manager, {'client_id': 'client_1', 'income': {'salary': 1}, 'notes': 'a'})
+    queue.enqueue_section(manager, 'client_1', 'income', {'salary': 2})
+
+    queue.flush(manager, 'client_1')
+    assert manager.writes == [('full', {'client_id': 'client_1', 'income': {'salary': 2}, 'notes': 'a'})]
+
+def test_newer_save_waits_for_the_write_in_progress():
+    queue = SaveQueue(coalesce_seconds=60)
+    manager = RecordingManager(block_first=True)
+    queue.enqueue_sections(manager, 'client_1', {'income': {'salary': 1}})
+    first = threading.Thread(target=queue.flush, args=(manager, 'client_1'))
+    first.start()
+    assert manager.started.wait(5)
+
+    queue.enqueue_sections(manager, 'client_1', {'income': {'salary': 2}})
+    second = threading.Thread(target=queue.flush, args=(manager, 'client_1'))
+    second.start()
+    manager.release.set()
+    first.join(5)
+    second.join(5)
+    assert [write[1] for write in manager.writes] == [{'income': {'salary': 1}}, {'income': {'salary': 2}}]
+
+def test_queued_saves_are_read_back_before_they_are_written(tmp_path):
+    manager = ClientManager(tmp_path)
+    manager.save_client({'client_id': 'client_1', 'personal_info': {}, 'income': {'salary': 1}})
+    for salary in (2, 3):
+        client = manager.open_client('client_1')
+        edit_section(client, 'income')['salary'] = salary
+        manager.queue_save(client)
+
+    assert manager.get_client('client_1')['income'] == {'salary': 3}
+    assert manager.save_status('client_1')['state'] == 'saved'
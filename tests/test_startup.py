@@ -0,0 +1,13 @@
+from benchmarks.bench_startup import CORE_IMPORT_SCRIPT, IMPORT_SCRIPT, _run_fresh
+
+# Each check runs in a fresh interpreter, since the test session itself has these modules loaded
+
+def test_app_import_defers_heavy_modules():
+    assert _run_fresh(IMPORT_SCRIPT)['loaded'] == []
+
+def test_deferred_modules_are_detected():
+    script = IMPORT_SCRIPT.replace("import app\n", "import app\nimport numpy, utils.reports\n")
+    assert {'numpy', 'utils.reports'} <= set(_run_fresh(script)['loaded'])
+
+def test_core_does_not_import_streamlit():
+    assert not _run_fresh(CORE_IMPORT_SCRIPT)['streamlit']
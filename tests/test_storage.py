@@ -0,0 +1,56 @@
+import core.client_files as client_files
+from core.client_files import journal_path, read_document
+from core.storage import JSONFileStorage
+
+CLIENT = {
+    'client_id': 'client_1',
+    'personal_info': {'client_first_name': 'Ada', 'client_last_name': 'Lovelace'},
+    'income': {'salary': 1},
+    'expenses': {'rent': 1}
+}
+
+def test_section_saves_are_journaled_and_replayed(tmp_path):
+    storage = JSONFileStorage(tmp_path)
+    storage.save('client_1', dict(CLIENT))
+    storage.save_sections('client_1', {'income': {'salary': 2}, 'notes': 'new'}, deleted=['expenses'])
+    storage.save_sections('client_1', {'income': {'salary': 3}})
+
+    path = tmp_path / 'client_1.json'
+    assert journal_path(path).exists()
+    expected = {'client_id': 'client_1', 'personal_info': CLIENT['personal_info'],
+                'income': {'salary': 3}, 'notes': 'new'}
+    assert read_document(path) == expected
+    # A storage that has never seen the client (another process) reads the same document
+    fresh = JSONFileStorage(tmp_path)
+    assert fresh.load('client_1') == expected
+    assert list(fresh.outline('client_1')) == ['client_id', 'personal_info', 'income', 'notes']
+    assert fresh.load_sections('client_1', ['income', 'expenses']) == {'income': {'salary': 3}}
+
+def test_torn_journal_append_is_ignored(tmp_path):
+    storage = JSONFileStorage(tmp_path)
+    storage.save('client_1', dict(CLIENT))
+    storage.save_sections('client_1', {'income': {'salary': 2}})
+    with open(journal_path(tmp_path / 'client_1.json'), 'ab') as f:
+        f.write(b'{"section":"income","data":{"sal')
+
+    assert JSONFileStorage(tmp_path).load_sections('client_1', ['income']) == {'income': {'salary': 2}}
+    assert read_document(tmp_path / 'client_1.json')['income'] == {'salary': 2}
+
+def test_journal_is_compacted_into_the_base_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(client_files, 'COMPACT_MIN_BYTES', 1024)
+    storage = JSONFileStorage(tmp_path)
+    storage.save('client_1', dict(CLIENT))
+    path = tmp_path / 'client_1.json'
+
+    storage.save_sections('client_1', {'income': {'salary': 2}})
+    assert journal_path(path).exists()
+    # A journal past the minimum size that outweighs the base file is folded into it
+    storage.save_sections('client_1', {'income': {'salary': 3, 'history': list(range(500))}})
+    assert not journal_path(path).exists()
+
+    expected = {**CLIENT, 'income': {'salary': 3, 'history': list(range(500))}}
+    assert read_document(path) == expected
+    fresh = JSONFileStorage(tmp_path)
+    assert fresh.load_sections('client_1', ['income', 'expenses']) == {
+        'income': expected['income'], 'expenses': CLIENT['expenses']
+    }
@@ -0,0 +1,120 @@
+import numpy as np
+import plotly.graph_objects as go
+from config.settings import CHART_SETTINGS
+from core.compute_cache import compute_cache
+from core.profiler import timed
+
+# Monte Carlo bands drawn as filled ranges, outermost first
+FAN_BANDS = [
+    (5, 95, "5th - 95th Percentile", "rgba(0, 102, 204, 0.15)"),
+    (25, 75, "25th - 75th Percentile", "rgba(0, 102, 204, 0.3)")
+]
+
+def decimate(x, y, max_points=None):
+    """Thin a series to about max_points, keeping each bucket's min and max so peaks survive"""
+    max_points = max_points or CHART_SETTINGS['max_points']
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    if len(y) <= max_points:
+        return x, y
+    buckets = max(1, (max_points - 2) // 2)
+    edges = np.linspace(1, len(y) - 1, buckets + 1).astype(int)
+    keep = [0, len(y) - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            segment = y[start:end]
+            keep.append(start + int(segment.argmin()))
+            keep.append(start + int(segment.argmax()))
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+def decimate_bands(x, bands, max_points=None):
+    """Thin percentile bands on shared x positions, so band edges stay aligned"""
+    max_points = max_points or CHART_SETTINGS['max_points']
+    x = np.asarray(x)
+    if len(x) <= max_points:
+        return x, {p: np.asarray(values, dtype=float) for p, values in bands.items()}
+    keep = np.unique(np.linspace(0, len(x) - 1, max_points).round().astype(int))
+    return x[keep], {p: np.asarray(values, dtype=float)[keep] for p, values in bands.items()}
+
+def _trace_type(total_points):
+    return go.Scattergl if total_points > CHART_SETTINGS['webgl_threshold'] else go.Scatter
+
+def payload_size(fig):
+    """Bytes of figure JSON sent to the browser"""
+    return len(fig.to_json())
+
+@timed("charts.cached_figure")
+def cached_figure(kind, key_inputs, build):
+    """Build a figure once per distinct inputs; callers must not modify the returned figure"""
+    return compute_cache.get_or_compute(f"figure:{kind}", key_inputs, build, size_of=payload_size)
+
+def fan_chart(ages, bands, retirement_age=None, title="Portfolio Value Projection"):
+    """Monte Carlo percentile bands and the median as a compact Plotly figure"""
+    x, bands = decimate_bands(ages, bands)
+    trace = _trace_type(len(x) * (2 * len(FAN_BANDS) + 1))
+    fig = go.Figure()
+    for low, high, name, fillcolor in FAN_BANDS:
+        fig.add_trace(trace(
+            x=x, y=bands[high],
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo="skip"
+        ))
+        fig.add_trace(trace(
+            x=x, y=bands[low],
+            name=name,
+            fill="tonexty",
+            fillcolor=fillcolor,
+            line=dict(width=0)
+        ))
+    fig.add_trace(trace(
+        x=x, y=bands[50],
+        name="Median",
+        line=dict(color="#0066cc")
+    ))
+    if retirement_age is not None:
+        fig.add_vline(
+            x=retirement_age,
+            line_dash="dash",
+            line_color="red",
+            annotation_text="Retirement Age"
+        )
+    fig.update_layout(
+        title=title,
+        xaxis_title="Age",
+        yaxis_title="Portfolio Value ($)",
+        yaxis_tickformat="$,.0f",
+        hovermode="x unified",
+        showlegend=True
+    )
+    return fig
+
+def scenario_chart(scenarios, projections, retirement_age=None):
+    """Balance path of each scenario as one decimated line per scenario"""
+    series = [decimate(p['years'], p['balances']) for p in projections]
+    trace = _trace_type(sum(len(x) for x, _ in series))
+    fig = go.Figure()
+    for scenario, (x, y) in zip(scenarios, series):
+        fig.add_trace(trace(
+            x=x, y=y,
+            name=f"{scenario['name']} ({scenario['growth_rate']}%)",
+            line=dict(color=scenario['color']),
+            hovertemplate="Age: %{x}<br>Balance: $%{y:,.0f}"
+        ))
+    if retirement_age is not None:
+        fig.add_vline(
+            x=retirement_age,
+            line_dash="dash",
+            line_color="red",
+            annotation_text="Retirement Age"
+        )
+    fig.update_layout(
+        height=600,
+        xaxis_title="Age",
+        yaxis_title="Portfolio Balance ($)",
+        yaxis_tickformat="$,.0f",
+        hovermode="x unified",
+        showlegend=True
+    )
+    return fig
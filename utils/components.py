@@ -1,6 +1,10 @@
 import streamlit as st
 from typing import Callable, Any
 from datetime import datetime
+from core.client_cache import client_cache
+from core.compute_cache import compute_cache
+from core.financial_summary import get_financial_summary
+from core.profiler import new_history
 
 def card(title: str, content: Callable, key: str = None, expanded: bool = True):
     """Render a collapsible card with consistent styling"""
@@ -50,15 +54,9 @@ def unsaved_changes_warning():
 
 def profile_completion_status(client):
     """Show profile completion status"""
-    sections = {
-        'Basic Info': bool(client.get('personal_info')),
-        'Assets': bool(client.get('assets')),
-        'Income': bool(client.get('income')),
-        'Expenses': bool(client.get('expenses')),
-        'Projections': bool(client.get('projections'))
-    }
-    
-    completion = sum(sections.values()) / len(sections)
+    summary = get_financial_summary(client)
+    sections = summary['completion']
+    completion = summary['completion_ratio']
     
     st.sidebar.progress(completion)
     st.sidebar.caption(f"Profile Completion: {int(completion * 100)}%")
@@ -77,4 +75,51 @@ def error_boundary(func):
             if st.button("Reset Page"):
                 st.rerun()
     return wrapper
-  
\ No newline at end of file
+  
+def profile_history():
+    """This session's recently profiled reruns"""
+    if 'profile_history' not in st.session_state:
+        st.session_state.profile_history = new_history()
+    return st.session_state.profile_history
+
+def render_profiler_panel():
+    """Debug panel: timing, call counts and I/O of the session's last reruns"""
+    import pandas as pd
+    history = list(profile_history())
+    with st.sidebar.expander("⏱️ Profiler"):
+        if not history:
+            st.caption("No reruns recorded yet")
+            return
+        st.dataframe(
+            pd.DataFrame([{
+                'started': run['started'][11:],
+                'entry': run['entry'],
+                'ms': run['seconds'] * 1000,
+                'read KiB': run.get('bytes_read', 0) / 1024,
+                'written KiB': run.get('bytes_written', 0) / 1024,
+                'slowest': next(iter(run['spans']), '')
+            } for run in reversed(history)]),
+            hide_index=True,
+            column_config={
+                'ms': st.column_config.NumberColumn(format="%.1f"),
+                'read KiB': st.column_config.NumberColumn(format="%.1f"),
+                'written KiB': st.column_config.NumberColumn(
+                    format="%.1f", help="Written by the rerun itself; queued saves land afterwards and aren't counted"
+                )
+            }
+        )
+        latest = history[-1]
+        st.caption(f"Last rerun ({latest['entry']}, {latest['seconds'] * 1000:.1f} ms)")
+        st.dataframe(
+            pd.DataFrame([
+                {'span': name, 'calls': stats['calls'], 'ms': stats['seconds'] * 1000}
+                for name, stats in latest['spans'].items()
+            ], columns=['span', 'calls', 'ms']),
+            hide_index=True,
+            column_config={'ms': st.column_config.NumberColumn(format="%.1f")}
+        )
+        for name, stats in (("Client cache", client_cache.stats()), ("Compute cache", compute_cache.stats())):
+            st.caption(
+                f"{name}: {stats['bytes'] / 2**20:.1f} of {stats['max_bytes'] / 2**20:.0f} MiB, "
+                f"hit rate {stats['hit_rate']:.0%} ({stats['hits']:,} hits, {stats['evictions']:,} evictions)"
+            )
@@ -0,0 +1,94 @@
+from html import escape
+from pathlib import Path
+from core.client_files import write_atomic
+from core.compute_cache import compute_cache, input_key
+
+# Charts are plain SVG so reports render the same in the browser and in the
+# PDF engine, and need no plotting backend
+CHART_WIDTH = 720
+CHART_HEIGHT = 300
+MARGIN = {'left': 80, 'right': 20, 'top': 20, 'bottom': 40}
+
+def _money(value):
+    if abs(value) >= 1e6:
+        return f"${value / 1e6:,.1f}M"
+    if abs(value) >= 1e3:
+        return f"${value / 1e3:,.0f}K"
+    return f"${value:,.0f}"
+
+def _scale(lo, hi, out_lo, out_hi):
+    span = (hi - lo) or 1
+    return lambda v: out_lo + (v - lo) / span * (out_hi - out_lo)
+
+def _frame(y_max, x_labels, x_of, y_of):
+    """Axes, horizontal grid lines with money labels and x tick labels"""
+    parts = []
+    for i in range(5):
+        value = y_max * i / 4
+        y = y_of(value)
+        parts.append(f'<line x1="{MARGIN["left"]}" x2="{CHART_WIDTH - MARGIN["right"]}" y1="{y:.1f}" y2="{y:.1f}" class="grid"/>')
+        parts.append(f'<text x="{MARGIN["left"] - 8}" y="{y + 4:.1f}" text-anchor="end">{_money(value)}</text>')
+    for x_value, label in x_labels:
+        parts.append(f'<text x="{x_of(x_value):.1f}" y="{CHART_HEIGHT - 15}" text-anchor="middle">{escape(str(label))}</text>')
+    return parts
+
+def _svg(parts):
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" class="chart">'
+        '<style>text{font:11px sans-serif;fill:#555}.grid{stroke:#e5e5e5}</style>'
+        + "".join(parts) + '</svg>'
+    )
+
+def _points(xs, ys, x_of, y_of):
+    return " ".join(f"{x_of(x):.1f},{y_of(y):.1f}" for x, y in zip(xs, ys))
+
+def fan_chart_svg(ages, bands, retirement_age=None):
+    """Monte Carlo percentile bands (5-95, 25-75) and the median, as SVG"""
+    y_max = max(max(bands[95]), 1)
+    x_of = _scale(ages[0], ages[-1], MARGIN['left'], CHART_WIDTH - MARGIN['right'])
+    y_of = _scale(0, y_max, CHART_HEIGHT - MARGIN['bottom'], MARGIN['top'])
+    step = max(1, len(ages) // 8)
+    parts = _frame(y_max, [(age, age) for age in ages[::step]], x_of, y_of)
+    for low, high, opacity in ((5, 95, 0.15), (25, 75, 0.3)):
+        outline = _points(ages, bands[high], x_of, y_of) + " " + _points(ages[::-1], bands[low][::-1], x_of, y_of)
+        parts.append(f'<polygon points="{outline}" fill="#0066cc" fill-opacity="{opacity}"/>')
+    parts.append(f'<polyline points="{_points(ages, bands[50], x_of, y_of)}" fill="none" stroke="#0066cc" stroke-width="2"/>')
+    if retirement_age is not None and ages[0] <= retirement_age <= ages[-1]:
+        x = x_of(retirement_age)
+        parts.append(f'<line x1="{x:.1f}" x2="{x:.1f}" y1="{MARGIN["top"]}" y2="{CHART_HEIGHT - MARGIN["bottom"]}" stroke="red" stroke-dasharray="4"/>')
+    return _svg(parts)
+
+def bar_chart_svg(labels, values):
+    """Horizontal-axis bar chart of money values, as SVG"""
+    y_max = max(max(values, default=0), 1)
+    slot = (CHART_WIDTH - MARGIN['left'] - MARGIN['right']) / max(len(values), 1)
+    x_of = lambda i: MARGIN['left'] + slot * (i + 0.5)
+    y_of = _scale(0, y_max, CHART_HEIGHT - MARGIN['bottom'], MARGIN['top'])
+    parts = _frame(y_max, list(enumerate(labels)), x_of, y_of)
+    for i, value in enumerate(values):
+        top = y_of(max(value, 0))
+        parts.append(
+            f'<rect x="{x_of(i) - slot * 0.3:.1f}" y="{top:.1f}" width="{slot * 0.6:.1f}" '
+            f'height="{CHART_HEIGHT - MARGIN["bottom"] - top:.1f}" fill="#0066cc"/>'
+        )
+    return _svg(parts)
+
+def cached_chart(kind, data, render, asset_dir=None):
+    """Render a chart once per distinct data, in memory and (if given) as a file under asset_dir.
+
+    The file cache lets separate processes, such as bulk report workers,
+    share charts for identical inputs.
+    """
+    key = input_key(f"chart:{kind}", data)
+    path = Path(asset_dir) / f"{key}.svg" if asset_dir else None
+
+    def build():
+        if path is not None and path.exists():
+            return path.read_text()
+        svg = render()
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, svg.encode())
+        return svg
+
+    return compute_cache.get_or_compute(f"chart:{kind}", data, build)
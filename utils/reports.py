@@ -0,0 +1,202 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from config.settings import DEFAULT_ASSET_CATEGORIES, MONTE_CARLO_SETTINGS, REPORT_SETTINGS
+from core.age_calculator import calculate_age
+from core.client_files import write_atomic
+from core.compute_cache import input_key
+from core.financial_summary import get_financial_summary
+from core.monte_carlo import cached_simulation, simulation_inputs_from_client
+from utils.report_charts import bar_chart_svg, cached_chart, fan_chart_svg
+
+try:
+    # Optional: without WeasyPrint reports are written as print-ready HTML
+    from weasyprint import HTML
+except ImportError:
+    HTML = None
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+REPORT_TEMPLATE = "report_template.html"
+MILESTONE_STEP_YEARS = 5
+
+@lru_cache(maxsize=None)
+def get_report_template(name=REPORT_TEMPLATE):
+    """Compiled report template; the environment is built once per process"""
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(['html']),
+        auto_reload=False
+    )
+    environment.filters['money'] = lambda value: f"${float(value or 0):,.2f}"
+    environment.filters['label'] = lambda key: DEFAULT_ASSET_CATEGORIES.get(key, key.replace('_', ' ').title())
+    return environment.get_template(name)
+
+def report_format():
+    return "pdf" if HTML is not None else "html"
+
+def report_path(output_dir, client_id):
+    return Path(output_dir) / f"{client_id}_report.{report_format()}"
+
+def _simulation_section(client, asset_dir):
+    if not client.get('projections'):
+        return None
+    inputs = simulation_inputs_from_client(client)
+    if inputs['life_expectancy'] <= inputs['current_age']:
+        return None
+    results = cached_simulation(inputs, seed=MONTE_CARLO_SETTINGS['seed'])
+    ages = list(results['ages'])
+    bands = {p: list(values) for p, values in results['percentiles'].items()}
+    milestones = [
+        {'age': age, 'low': bands[5][i], 'median': bands[50][i], 'high': bands[95][i]}
+        for i, age in enumerate(ages)
+        if i % MILESTONE_STEP_YEARS == 0 or i == len(ages) - 1
+    ]
+    chart = cached_chart(
+        'fan', {'ages': ages, 'bands': bands, 'retirement_age': inputs['retirement_age']},
+        lambda: fan_chart_svg(ages, bands, inputs['retirement_age']),
+        asset_dir
+    )
+    return {
+        'inputs': inputs,
+        'success_probability': results['success_probability'],
+        'num_paths': results['num_paths'],
+        'milestones': milestones,
+        'chart': chart
+    }
+
+def build_report_context(client, asset_dir=None, progress=None):
+    """Everything the report template shows, with charts rendered (or reused) as SVG"""
+    progress = progress or (lambda stage, fraction: None)
+    summary = get_financial_summary(client)
+    personal_info = client.get('personal_info', {})
+
+    progress("Summarizing assets", 0.2)
+    categories = list(summary['categories'].items())
+    asset_chart = cached_chart(
+        'assets', [[category, totals['total']] for category, totals in categories],
+        lambda: bar_chart_svg(
+            [DEFAULT_ASSET_CATEGORIES.get(c, c.replace('_', ' ').title()) for c, _ in categories],
+            [totals['total'] for _, totals in categories]
+        ),
+        asset_dir
+    )
+
+    progress("Running projections", 0.4)
+    simulation = _simulation_section(client, asset_dir)
+
+    return {
+        'client_id': client.get('client_id'),
+        'client_name': f"{personal_info.get('client_first_name', '')} {personal_info.get('client_last_name', '')}".strip(),
+        'personal_info': personal_info,
+        'client_age': calculate_age(personal_info.get('client_dob', '')),
+        'spouse_age': calculate_age(personal_info.get('spouse_dob', '')),
+        'summary': summary,
+        'assets': client.get('assets', {}),
+        'asset_chart': asset_chart,
+        'income': client.get('income', {}),
+        'expenses': client.get('expenses', {}),
+        'simulation': simulation,
+        'generated_at': datetime.now().strftime("%B %d, %Y")
+    }
+
+def render_report(client, output_dir=None, asset_dir=None, progress=None):
+    """Render one client's report to output_dir and return its path"""
+    progress = progress or (lambda stage, fraction: None)
+    output_dir = Path(output_dir or REPORT_SETTINGS['output_dir'])
+    asset_dir = asset_dir or REPORT_SETTINGS['asset_dir']
+    context = build_report_context(client, asset_dir, progress)
+
+    progress("Rendering template", 0.6)
+    html = get_report_template().render(**context)
+
+    path = report_path(output_dir, client['client_id'])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if HTML is not None:
+        progress("Writing PDF", 0.8)
+        write_atomic(path, HTML(string=html, base_url=str(TEMPLATES_DIR)).write_pdf())
+    else:
+        write_atomic(path, html.encode())
+    progress("Done", 1.0)
+    return path
+
+class ReportJobs:
+    """Background report rendering, so the Streamlit script thread never waits on it.
+
+    Sessions submit a job and poll its id. A report for the same client
+    content is only rendered once; repeat requests return the existing file.
+    Finished jobs are forgotten after REPORT_SETTINGS['job_ttl_seconds'].
+    """
+
+    def __init__(self, workers=None, job_ttl_seconds=None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or REPORT_SETTINGS['workers'],
+            thread_name_prefix="report"
+        )
+        self._jobs = {}
+        self.job_ttl_seconds = job_ttl_seconds or REPORT_SETTINGS['job_ttl_seconds']
+        # content key -> report path of the last render
+        self._rendered = {}
+        self._lock = threading.Lock()
+
+    def submit(self, client_manager, client_id):
+        """Queue a report for a client and return its job id"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'client_id': client_id,
+                'state': 'queued',
+                'stage': "Waiting for a worker",
+                'progress': 0.0,
+                'path': None,
+                'error': None,
+                'finished': None
+            }
+        self._executor.submit(self._run, job_id, client_manager, client_id)
+        return job_id
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _finish(self, job_id, **fields):
+        self._update(job_id, finished=time.monotonic(), **fields)
+
+    def _prune(self):
+        """Drop jobs that finished more than job_ttl_seconds ago; call with the lock held"""
+        cutoff = time.monotonic() - self.job_ttl_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items() if job['finished'] and job['finished'] < cutoff]:
+            del self._jobs[job_id]
+
+    def _run(self, job_id, client_manager, client_id):
+        self._update(job_id, state='running', stage="Loading client", progress=0.05)
+        try:
+            client = client_manager.get_client(client_id)
+            if client is None:
+                raise ValueError(f"Client {client_id} not found")
+            key = input_key('report', {'client': client, 'format': report_format()})
+            path = self._rendered.get(key)
+            if path is None or not path.exists():
+                path = render_report(
+                    client,
+                    progress=lambda stage, fraction: self._update(job_id, stage=stage, progress=fraction)
+                )
+                self._rendered[key] = path
+            self._finish(job_id, state='done', stage="Done", progress=1.0, path=str(path))
+        except Exception as e:
+            self._finish(job_id, state='error', stage="Failed", error=f"{type(e).__name__}: {e}")
+
+    def status(self, job_id):
+        """Snapshot of a job: state ('queued'|'running'|'done'|'error'), stage, progress, path, error"""
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+report_jobs = ReportJobs()
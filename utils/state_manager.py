@@ -7,7 +7,7 @@ class StateManager:
     def init_session_state():
         """Initialize all session state variables"""
         if 'client_manager' not in st.session_state:
-            from utils.client_manager import ClientManager
+            from core.client_manager import ClientManager
             st.session_state.client_manager = ClientManager()
         
         defaults = {
@@ -67,7 +67,7 @@ class StateManager:
             last_save = st.session_state.get('last_save_time')
             
             if not last_save or (current_time - last_save).seconds >= 30:
-                with st.spinner("Auto-saving..."):
-                    client_manager.save_client(client)
-                    st.session_state.last_save_time = current_time
-                    st.session_state.unsaved_changes = False 
\ No newline at end of file
+                # Written in the background; no need to block the rerun on it
+                client_manager.queue_save(client)
+                st.session_state.last_save_time = current_time
+                st.session_state.unsaved_changes = False 
\ No newline at end of file